@@ -31,14 +31,16 @@ from django.utils.crypto import get_random_string
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 
+from asgiref.sync import sync_to_async
+
 from allauth import app_settings as allauth_app_settings
 from allauth.account import app_settings, signals
 from allauth.core import context
 from allauth.core.internal import ratelimit
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.core.internal.cryptokit import generate_user_code
 from allauth.core.internal.httpkit import headed_redirect_response, is_headless_request
-from allauth.utils import generate_unique_username, import_attribute
+from allauth.utils import generate_unique_username
 
 
 class DefaultAccountAdapter(BaseAdapter):
@@ -164,8 +166,11 @@ class DefaultAccountAdapter(BaseAdapter):
         Renders an email to `email`.  `template_prefix` identifies the
         email that is to be sent, e.g. "account/email/email_confirmation"
         """
+        from allauth.account.internal import mailkit
+
         to = [email] if isinstance(email, str) else email
-        subject = render_to_string("{0}_subject.txt".format(template_prefix), context)
+        mail_templates = mailkit.get_mail_templates(template_prefix)
+        subject = mail_templates.subject.render(context)
         # remove superfluous line breaks
         subject = " ".join(subject.splitlines()).strip()
         subject = self.format_email_subject(subject)
@@ -174,18 +179,11 @@ class DefaultAccountAdapter(BaseAdapter):
 
         bodies = {}
         html_ext = app_settings.TEMPLATE_EXTENSION
-        for ext in [html_ext, "txt"]:
-            try:
-                template_name = "{0}_message.{1}".format(template_prefix, ext)
-                bodies[ext] = render_to_string(
-                    template_name,
-                    context,
-                    globals()["context"].request,
-                ).strip()
-            except TemplateDoesNotExist:
-                if ext == "txt" and not bodies:
-                    # We need at least one body
-                    raise
+        for ext, template in mail_templates.bodies.items():
+            bodies[ext] = template.render(
+                context,
+                globals()["context"].request,
+            ).strip()
         if "txt" in bodies:
             msg = EmailMultiAlternatives(
                 subject, bodies["txt"], from_email, to, headers=headers
@@ -208,7 +206,15 @@ class DefaultAccountAdapter(BaseAdapter):
         }
         ctx.update(context)
         msg = self.render_mail(template_prefix, email, ctx)
-        msg.send()
+        self.send_message(msg)
+
+    def send_message(self, msg) -> None:
+        """
+        Sends the rendered mail, using the configured ``ACCOUNT_MAIL_BACKEND``.
+        """
+        from allauth.account.internal import mailkit
+
+        mailkit.send(msg)
 
     def get_signup_redirect_url(self, request):
         """
@@ -687,7 +693,7 @@ class DefaultAccountAdapter(BaseAdapter):
         # on itself (e.g. sending of email etc.).
         ratelimit.clear(
             request,
-            config=app_settings.RATE_LIMITS,
+            config=ratelimit.get_config(app_settings),
             action="login_failed",
             key=cache_key,
         )
@@ -701,7 +707,7 @@ class DefaultAccountAdapter(BaseAdapter):
         cache_key = self._get_login_attempts_cache_key(request, **credentials)
         self._login_failed_rl_usage = ratelimit.consume(
             request,
-            config=app_settings.RATE_LIMITS,
+            config=ratelimit.get_config(app_settings),
             action="login_failed",
             key=cache_key,
         )
@@ -728,6 +734,35 @@ class DefaultAccountAdapter(BaseAdapter):
             self.authentication_failed(request, **credentials)
         return user
 
+    async def aauthenticate(self, request, **credentials):
+        """
+        The async counterpart of ``authenticate()``. Authentication backends
+        implementing ``aauthenticate()`` (such as allauth's) do not block the
+        event loop while checking the password. If ``authenticate()`` is
+        overridden, that override is used instead, run in a thread.
+        """
+        from allauth.account.auth_backends import AuthenticationBackend
+
+        if type(self).authenticate is not DefaultAccountAdapter.authenticate:
+            return await sync_to_async(self.authenticate)(request, **credentials)
+
+        try:
+            from django.contrib.auth import aauthenticate
+        except ImportError:  # Django < 5.0
+            aauthenticate = sync_to_async(authenticate)
+
+        await sync_to_async(self.pre_authenticate)(request, **credentials)
+        AuthenticationBackend.unstash_authenticated_user()
+        user = await aauthenticate(request, **credentials)
+        alt_user = AuthenticationBackend.unstash_authenticated_user()
+        user = user or alt_user
+        if user:
+            # See `authenticate()`.
+            await sync_to_async(self._rollback_login_failed_rl_usage)()
+        else:
+            await sync_to_async(self.authentication_failed)(request, **credentials)
+        return user
+
     def authentication_failed(self, request, **credentials):
         pass
 
@@ -959,4 +994,4 @@ class DefaultAccountAdapter(BaseAdapter):
 
 
 def get_adapter(request=None) -> DefaultAccountAdapter:
-    return import_attribute(app_settings.ADAPTER)(request)
+    return resolve_adapter(app_settings.ADAPTER, request)
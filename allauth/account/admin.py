@@ -3,7 +3,8 @@ from django.utils.translation import gettext_lazy as _
 
 from allauth.account import app_settings, signals
 from allauth.account.adapter import get_adapter
-from allauth.account.models import EmailAddress, EmailConfirmation
+from allauth.account.internal import mailkit
+from allauth.account.models import EmailAddress, EmailConfirmation, OutgoingEmail
 
 
 class EmailAddressAdmin(admin.ModelAdmin):
@@ -48,6 +49,23 @@ class EmailConfirmationAdmin(admin.ModelAdmin):
     raw_id_fields = ("email_address",)
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "created_at", "send_at", "attempts")
+    list_filter = ("attempts",)
+    # The message is left out, as it may contain password reset links, login
+    # codes and the like.
+    fields = ("created_at", "send_at", "attempts", "last_error")
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 if not app_settings.EMAIL_CONFIRMATION_HMAC:
     admin.site.register(EmailConfirmation, EmailConfirmationAdmin)
 admin.site.register(EmailAddress, EmailAddressAdmin)
+if issubclass(mailkit.get_backend_class(), mailkit.OutboxMailBackend):
+    admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -2,6 +2,8 @@ import warnings
 from enum import Enum
 from typing import FrozenSet, Set, Union
 
+from allauth.core.internal.settingskit import SettingsSnapshot
+
 
 class AppSettings:
     class AuthenticationMethod(str, Enum):
@@ -390,6 +392,12 @@ class AppSettings:
     def ADAPTER(self):
         return self._setting("ADAPTER", "allauth.account.adapter.DefaultAccountAdapter")
 
+    @property
+    def MAIL_BACKEND(self):
+        return self._setting(
+            "MAIL_BACKEND", "allauth.account.internal.mailkit.ImmediateMailBackend"
+        )
+
     @property
     def CONFIRM_EMAIL_ON_GET(self):
         return self._setting("CONFIRM_EMAIL_ON_GET", False)
@@ -578,8 +586,9 @@ class AppSettings:
 
 
 _app_settings = AppSettings("ACCOUNT_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
@@ -1,16 +1,56 @@
-from threading import local
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.hashers import check_password
+
+from asgiref.local import Local
+from asgiref.sync import sync_to_async
 
 from allauth.account.adapter import get_adapter
 from allauth.account.app_settings import LoginMethod
 
 from . import app_settings
-from .utils import filter_users_by_email, filter_users_by_username
+from .utils import (
+    afilter_users_by_email,
+    filter_users_by_email,
+    filter_users_by_username,
+)
+
+
+# Context aware, as concurrent (async) logins share the same thread.
+_stash = Local()
+
+# Password hashing is CPU bound. When authenticating async, the hashing is done
+# by this pool, instead of blocking the event loop or occupying the thread that
+# runs the sync code. Hashers release the GIL, so it is sized to the CPUs.
+_hasher_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="allauth-hasher"
+)
+
+
+async def _run_hasher(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hasher_executor, functools.partial(func, *args))
+
+
+def _verify_password(password: str, encoded: str) -> Tuple[bool, bool]:
+    """
+    Returns whether or not the password is correct, and whether or not the
+    encoded password needs to be upgraded.
+    """
+    must_update = False
 
+    def setter(raw_password):
+        nonlocal must_update
+        must_update = True
 
-_stash = local()
+    return check_password(password, encoded, setter), must_update
 
 
 class AuthenticationBackend(ModelBackend):
@@ -54,6 +94,42 @@ class AuthenticationBackend(ModelBackend):
                 return user
         return None
 
+    async def aauthenticate(self, request, **credentials):
+        password = credentials.get("password")
+        if not password:
+            return None
+        self._did_check_password = False
+        user = await self._aauthenticate(request, **credentials)
+        if not self._did_check_password:
+            await self._amitigate_timing_attack(password)
+        return user
+
+    async def _aauthenticate(self, request, **credentials):
+        password = credentials.get("password")
+        username = credentials.get("username")
+        if username:
+            if LoginMethod.EMAIL in app_settings.LOGIN_METHODS:
+                # See `_authenticate()`.
+                user = await self._aauthenticate_by_email(username, password)
+                if user:
+                    return user
+            user = await self._aauthenticate_by_username(username, password)
+            if user:
+                return user
+
+        email = credentials.get("email")
+        if email:
+            user = await self._aauthenticate_by_email(email, password)
+            if user:
+                return user
+
+        phone = credentials.get("phone")
+        if phone:
+            user = await self._aauthenticate_by_phone(phone, password)
+            if user:
+                return user
+        return None
+
     def _authenticate_by_phone(self, phone: str, password: str):
         if not phone or LoginMethod.PHONE not in app_settings.LOGIN_METHODS:
             return None
@@ -61,6 +137,13 @@ class AuthenticationBackend(ModelBackend):
         user = adapter.get_user_by_phone(phone)
         return self._check_password(user, password)
 
+    async def _aauthenticate_by_phone(self, phone: str, password: str):
+        if not phone or LoginMethod.PHONE not in app_settings.LOGIN_METHODS:
+            return None
+        adapter = get_adapter()
+        user = await sync_to_async(adapter.get_user_by_phone)(phone)
+        return await self._acheck_password(user, password)
+
     def _authenticate_by_username(self, username: str, password: str):
         if (
             (LoginMethod.USERNAME not in app_settings.LOGIN_METHODS)
@@ -71,6 +154,16 @@ class AuthenticationBackend(ModelBackend):
         user = filter_users_by_username(username).first()
         return self._check_password(user, password)
 
+    async def _aauthenticate_by_username(self, username: str, password: str):
+        if (
+            (LoginMethod.USERNAME not in app_settings.LOGIN_METHODS)
+            or (not app_settings.USER_MODEL_USERNAME_FIELD)
+            or not username
+        ):
+            return None
+        user = await filter_users_by_username(username).afirst()
+        return await self._acheck_password(user, password)
+
     def _authenticate_by_email(
         self,
         email: str,
@@ -84,9 +177,21 @@ class AuthenticationBackend(ModelBackend):
                 return user
         return None
 
+    async def _aauthenticate_by_email(self, email: str, password: str):
+        if not email or LoginMethod.EMAIL not in app_settings.LOGIN_METHODS:
+            return None
+        users = await afilter_users_by_email(email, prefer_verified=True)
+        for user in users:
+            if await self._acheck_password(user, password):
+                return user
+        return None
+
     def _mitigate_timing_attack(self, password):
         get_user_model()().set_password(password)
 
+    async def _amitigate_timing_attack(self, password):
+        await _run_hasher(get_user_model()().set_password, password)
+
     def _check_password(self, user, password):
         if not user:
             return None
@@ -98,6 +203,28 @@ class AuthenticationBackend(ModelBackend):
                 self._stash_user(user)
         return user if ok else None
 
+    async def _acheck_password(self, user, password):
+        if not user:
+            return None
+        self._did_check_password = True
+        if type(user).check_password is not AbstractBaseUser.check_password:
+            # Custom password checks may access the database.
+            ok = await sync_to_async(user.check_password)(password)
+        else:
+            ok, must_update = await _run_hasher(
+                _verify_password, password, user.password
+            )
+            if ok and must_update:
+                await _run_hasher(user.set_password, password)
+                # Password hash upgrades shouldn't be considered password changes.
+                user._password = None
+                await user.asave(update_fields=["password"])
+        if ok:
+            ok = self.user_can_authenticate(user)
+            if not ok:
+                self._stash_user(user)
+        return user if ok else None
+
     @classmethod
     def _stash_user(cls, user):
         """Now, be aware, the following is quite ugly, let me explain:
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from urllib.parse import quote
 
 from django.contrib import messages
@@ -9,6 +9,7 @@ from django.urls import reverse
 from allauth.account import app_settings, signals
 from allauth.account.adapter import get_adapter
 from allauth.account.app_settings import LoginMethod
+from allauth.account.internal import mailkit
 from allauth.account.internal.flows.login import perform_login, record_authentication
 from allauth.account.internal.flows.signup import send_unknown_account_mail
 from allauth.account.models import EmailAddress, Login
@@ -87,33 +88,43 @@ def get_reset_password_from_key_url(request: HttpRequest, key: str) -> str:
     return url
 
 
-def request_password_reset(request, email, users, token_generator):
+def _get_password_reset_mail_context(
+    request: HttpRequest, user: AbstractBaseUser, token_generator, with_username: bool
+) -> Dict[str, Any]:
     from allauth.account.utils import user_pk_to_url_str, user_username
 
+    temp_key = token_generator.make_token(user)
+    uid = user_pk_to_url_str(user)
+    # We intentionally pass an opaque `key` on the interface here, and
+    # not implementation details such as a separate `uidb36` and
+    # `key. Ideally, this should have done on `urls` level as well.
+    key = f"{uid}-{temp_key}"
+    url = get_adapter().get_reset_password_from_key_url(key)
+    context = {
+        "user": user,
+        "password_reset_url": url,
+        "uid": uid,
+        "key": temp_key,
+        "request": request,
+    }
+    if with_username:
+        context["username"] = user_username(user)
+    return context
+
+
+def request_password_reset(request, email, users, token_generator):
     if not users:
         send_unknown_account_mail(request, email)
         return
     adapter = get_adapter()
-    for user in users:
-        temp_key = (
-            token_generator or app_settings.PASSWORD_RESET_TOKEN_GENERATOR()
-        ).make_token(user)
-
-        # send the password reset email
-        uid = user_pk_to_url_str(user)
-        # We intentionally pass an opaque `key` on the interface here, and
-        # not implementation details such as a separate `uidb36` and
-        # `key. Ideally, this should have done on `urls` level as well.
-        key = f"{uid}-{temp_key}"
-        url = adapter.get_reset_password_from_key_url(key)
-        context = {
-            "user": user,
-            "password_reset_url": url,
-            "uid": uid,
-            "key": temp_key,
-            "request": request,
-        }
-
-        if LoginMethod.USERNAME in app_settings.LOGIN_METHODS:
-            context["username"] = user_username(user)
-        adapter.send_password_reset_mail(user, email, context)
+    if token_generator is None:
+        token_generator = app_settings.PASSWORD_RESET_TOKEN_GENERATOR()
+    with_username = LoginMethod.USERNAME in app_settings.LOGIN_METHODS
+    # Multiple users can share the same email address, their mails are sent
+    # over a single connection.
+    with mailkit.batch():
+        for user in users:
+            context = _get_password_reset_mail_context(
+                request, user, token_generator, with_username
+            )
+            adapter.send_password_reset_mail(user, email, context)
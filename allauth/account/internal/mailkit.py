@@ -0,0 +1,342 @@
+"""
+Mails rendered by the account adapter are handed over to the mail backend
+configured by ``ACCOUNT_MAIL_BACKEND``:
+
+- ``ImmediateMailBackend`` (default) sends the mail right away, as part of the
+  request.
+
+- ``OutboxMailBackend`` stores the mail in the outbox (``OutgoingEmail``),
+  using the current transaction. Hence, the mail is only sent if the
+  transaction (e.g. the signup) is committed. The outbox is drained by a
+  worker (``account_sendmail``), which sends the mails in batches over a
+  single connection, retrying failed mails with an exponential back-off. A
+  worker claims a batch before sending it, and extends its claim while the
+  batch is being sent, so that concurrent workers never send the same mail.
+  Mails are removed from the outbox once sent. Mails that could not be sent
+  are kept for inspection, until purged.
+
+Mails sent within a ``batch()`` are collected, and handed over to the backend
+at once when the batch ends, so that they can be sent over one connection.
+
+The templates of a mail (subject, and the HTML and/or text body) are looked up
+on each render. Their caching is left up to the template loaders, as these may
+resolve templates per site, tenant or language. Note that Django's cached
+template loader caches missing templates (bodies) as well.
+"""
+
+import base64
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils import timezone
+
+from allauth.account import app_settings
+from allauth.account.models import OutgoingEmail
+from allauth.utils import import_attribute
+
+
+logger = logging.getLogger(__name__)
+
+# Mails that failed this many times are no longer retried.
+MAX_ATTEMPTS = 5
+# The delay before the first retry, doubled for each subsequent retry.
+RETRY_DELAY = 60
+# Claimed mails are left alone by other workers for this number of seconds.
+# The claim is extended once half of it has passed.
+CLAIM_TIMEOUT = 5 * 60
+
+_batch: ContextVar[Optional[List[EmailMessage]]] = ContextVar(
+    "allauth_mail_batch", default=None
+)
+
+
+@dataclass
+class MailTemplates:
+    subject: Any
+    # The available bodies, keyed by extension, HTML first.
+    bodies: Dict[str, Any] = field(default_factory=dict)
+
+
+def get_mail_templates(template_prefix: str) -> MailTemplates:
+    """
+    Returns the templates of the mail identified by ``template_prefix``. Raises
+    ``TemplateDoesNotExist`` in case the subject, or both bodies are missing.
+    """
+    mail_templates = MailTemplates(
+        subject=get_template("{0}_subject.txt".format(template_prefix))
+    )
+    for ext in [app_settings.TEMPLATE_EXTENSION, "txt"]:
+        try:
+            template_name = "{0}_message.{1}".format(template_prefix, ext)
+            mail_templates.bodies[ext] = get_template(template_name)
+        except TemplateDoesNotExist:
+            if ext == "txt" and not mail_templates.bodies:
+                # We need at least one body
+                raise
+    return mail_templates
+
+
+@dataclass
+class SendResult:
+    sent: int = 0
+    failed: int = 0
+
+
+def serialize_message(msg: EmailMessage) -> Dict[str, Any]:
+    attachments = []
+    for attachment in msg.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError("MIME attachments cannot be stored in the outbox")
+        filename, content, mimetype = attachment
+        if isinstance(content, bytes):
+            attachments.append(
+                [filename, base64.b64encode(content).decode("ascii"), mimetype, True]
+            )
+        else:
+            attachments.append([filename, content, mimetype, False])
+    return {
+        "subject": msg.subject,
+        "body": msg.body,
+        "from_email": msg.from_email,
+        "to": list(msg.to),
+        "cc": list(msg.cc),
+        "bcc": list(msg.bcc),
+        "reply_to": list(msg.reply_to),
+        "headers": dict(msg.extra_headers),
+        "content_subtype": msg.content_subtype,
+        "alternatives": [
+            [content, mimetype]
+            for content, mimetype in getattr(msg, "alternatives", [])
+        ],
+        "attachments": attachments,
+    }
+
+
+def deserialize_message(data: Dict[str, Any]) -> EmailMessage:
+    msg = EmailMultiAlternatives(
+        subject=data["subject"],
+        body=data["body"],
+        from_email=data["from_email"],
+        to=data["to"],
+        cc=data["cc"],
+        bcc=data["bcc"],
+        reply_to=data["reply_to"],
+        headers=data["headers"],
+    )
+    msg.content_subtype = data["content_subtype"]
+    for content, mimetype in data["alternatives"]:
+        msg.attach_alternative(content, mimetype)
+    for filename, content, mimetype, is_binary in data["attachments"]:
+        if is_binary:
+            content = base64.b64decode(content)
+        msg.attach(filename, content, mimetype)
+    return msg
+
+
+class MailBackend:
+    def send(self, msg: EmailMessage) -> None:
+        raise NotImplementedError
+
+    def send_messages(self, msgs: List[EmailMessage]) -> None:
+        for msg in msgs:
+            self.send(msg)
+
+
+class ImmediateMailBackend(MailBackend):
+    def send(self, msg: EmailMessage) -> None:
+        msg.send()
+
+    def send_messages(self, msgs: List[EmailMessage]) -> None:
+        get_connection().send_messages(msgs)
+
+
+class OutboxMailBackend(MailBackend):
+    def send(self, msg: EmailMessage) -> None:
+        outgoing_email = OutgoingEmail.objects.create(message=serialize_message(msg))
+        transaction.on_commit(
+            lambda: self.on_commit(outgoing_email), using=OutgoingEmail.objects.db
+        )
+
+    def on_commit(self, outgoing_email: OutgoingEmail) -> None:
+        """
+        Called once the mail is committed to the outbox. Override this to
+        trigger a worker (e.g. a task calling ``send_outbox()``), instead of
+        waiting for the next time the outbox is drained.
+        """
+        pass
+
+
+def get_backend_class() -> Type[MailBackend]:
+    return import_attribute(app_settings.MAIL_BACKEND)
+
+
+def get_backend() -> MailBackend:
+    return get_backend_class()()
+
+
+def send(msg: EmailMessage) -> None:
+    msgs = _batch.get()
+    if msgs is not None:
+        msgs.append(msg)
+    else:
+        get_backend().send(msg)
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    if _batch.get() is not None:
+        # Nested, the outer batch sends the mails.
+        yield
+        return
+    msgs: List[EmailMessage] = []
+    token = _batch.set(msgs)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    if msgs:
+        get_backend().send_messages(msgs)
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def _get_claimed_until() -> datetime:
+    return timezone.now() + timedelta(seconds=CLAIM_TIMEOUT)
+
+
+def _get_due_pks(now: datetime, batch_size: int) -> List[int]:
+    qs = OutgoingEmail.objects.filter(send_at__lte=now, attempts__lt=MAX_ATTEMPTS)
+    if connection.features.has_select_for_update_skip_locked:
+        qs = qs.select_for_update(skip_locked=True)
+    return list(qs.order_by("send_at", "pk").values_list("pk", flat=True)[:batch_size])
+
+
+def claim_batch(batch_size: int) -> List[OutgoingEmail]:
+    """
+    Claims the mails that are due, by postponing them for ``CLAIM_TIMEOUT``
+    seconds. Mails of a worker that crashes are picked up again after that.
+
+    The claim is a conditional update that only succeeds for mails that are
+    still due, so that two workers never claim the same mail, even on
+    databases that do not support ``SELECT ... FOR UPDATE``.
+    """
+    now = timezone.now()
+    claimed_until = _get_claimed_until()
+    with transaction.atomic():
+        pks = _get_due_pks(now, batch_size)
+        OutgoingEmail.objects.filter(
+            pk__in=pks, send_at__lte=now, attempts__lt=MAX_ATTEMPTS
+        ).update(send_at=claimed_until)
+    return list(
+        OutgoingEmail.objects.filter(pk__in=pks, send_at=claimed_until).order_by("pk")
+    )
+
+
+def extend_claim(batch: List[OutgoingEmail]) -> List[OutgoingEmail]:
+    """
+    Extends the claim on the given (claimed) mails. Returns the mails that are
+    still claimed, leaving out the mails whose claim expired and that were
+    claimed by another worker meanwhile.
+    """
+    if not batch:
+        return []
+    claimed_until = _get_claimed_until()
+    pks = [e.pk for e in batch]
+    OutgoingEmail.objects.filter(pk__in=pks, send_at=batch[0].send_at).update(
+        send_at=claimed_until
+    )
+    claimed_pks = set(
+        OutgoingEmail.objects.filter(pk__in=pks, send_at=claimed_until).values_list(
+            "pk", flat=True
+        )
+    )
+    claimed = []
+    for outgoing_email in batch:
+        if outgoing_email.pk in claimed_pks:
+            outgoing_email.send_at = claimed_until
+            claimed.append(outgoing_email)
+    return claimed
+
+
+def purge_outbox(older_than: timedelta) -> int:
+    """
+    Deletes the mails that could not be sent, and that were queued more than
+    ``older_than`` ago. Returns the number of mails deleted.
+    """
+    deleted, _ = OutgoingEmail.objects.filter(
+        attempts__gte=MAX_ATTEMPTS, created_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def _fail(outgoing_email: OutgoingEmail, error: Exception) -> None:
+    """
+    Records the failed attempt, unless the claim on the mail expired and
+    another worker claimed it meanwhile.
+    """
+    attempts = outgoing_email.attempts + 1
+    last_error = repr(error)
+    send_at = timezone.now() + get_retry_delay(attempts)
+    OutgoingEmail.objects.filter(
+        pk=outgoing_email.pk, send_at=outgoing_email.send_at
+    ).update(attempts=attempts, last_error=last_error, send_at=send_at)
+    outgoing_email.attempts = attempts
+    outgoing_email.last_error = last_error
+    outgoing_email.send_at = send_at
+
+
+def _send_batch(batch: List[OutgoingEmail], result: SendResult) -> None:
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as e:
+        logger.exception("Unable to open a mail connection")
+        for outgoing_email in batch:
+            _fail(outgoing_email, e)
+        result.failed += len(batch)
+        return
+    try:
+        pending = list(batch)
+        while pending:
+            claimed_until = pending[0].send_at
+            if timezone.now() >= claimed_until - timedelta(seconds=CLAIM_TIMEOUT / 2):
+                pending = extend_claim(pending)
+                if not pending:
+                    break
+            outgoing_email = pending.pop(0)
+            try:
+                msg = deserialize_message(outgoing_email.message)
+                mail_connection.send_messages([msg])
+            except Exception as e:
+                logger.exception("Unable to send mail %s", outgoing_email.pk)
+                _fail(outgoing_email, e)
+                result.failed += 1
+            else:
+                outgoing_email.delete()
+                result.sent += 1
+    finally:
+        mail_connection.close()
+
+
+def send_outbox(batch_size: int = 100) -> SendResult:
+    """
+    Sends all mails in the outbox that are due, in batches. Each batch is sent
+    over a single connection.
+    """
+    result = SendResult()
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        _send_batch(batch, result)
+    return result
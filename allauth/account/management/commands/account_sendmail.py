@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from allauth.account.internal import mailkit
+
+
+class Command(BaseCommand):
+    help = "Sends the mails in the outbox that are due."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--purge-failed-after",
+            type=int,
+            default=7,
+            help="Delete mails that could not be sent after this number of days.",
+        )
+
+    def handle(self, *args, **options):
+        result = mailkit.send_outbox(batch_size=options["batch_size"])
+        purged = mailkit.purge_outbox(
+            older_than=timedelta(days=options["purge_failed_after"])
+        )
+        self.stdout.write(
+            f"Sent: {result.sent}, failed: {result.failed}, purged: {purged}"
+        )
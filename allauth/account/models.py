@@ -189,6 +189,29 @@ class EmailConfirmation(EmailConfirmationMixin, models.Model):
         self.save()
 
 
+class OutgoingEmail(models.Model):
+    """
+    A mail that is waiting to be sent, see ``OutboxMailBackend``.
+    """
+
+    message = models.JSONField(verbose_name=_("message"))
+    created_at = models.DateTimeField(
+        verbose_name=_("created at"), default=timezone.now
+    )
+    send_at = models.DateTimeField(
+        verbose_name=_("send at"), default=timezone.now, db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(verbose_name=_("attempts"), default=0)
+    last_error = models.TextField(verbose_name=_("last error"), blank=True)
+
+    class Meta:
+        verbose_name = _("outgoing email")
+        verbose_name_plural = _("outgoing emails")
+
+    def __str__(self):
+        return ", ".join(self.message.get("to", []))
+
+
 class EmailConfirmationHMAC(EmailConfirmationMixin):
     def __init__(self, email_address):
         self.email_address = email_address
@@ -4,7 +4,7 @@ from typing import List, Optional
 
 from django.contrib.auth import REDIRECT_FIELD_NAME, get_user_model
 from django.db import models
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q, Subquery
 from django.utils.http import base36_to_int, int_to_base36
 
 from allauth.account import app_settings
@@ -262,14 +262,24 @@ def filter_users_by_username(*username):
     return ret
 
 
+def _email_matches(value: Optional[str], email: str) -> bool:
+    if not value:
+        return False
+    # Addresses are stored in lower case, so usually the value is an exact
+    # match. Otherwise, the database (collation) matched the address in a way
+    # that needs to be verified, e.g. "ß" versus "ss".
+    return value == email or _unicode_ci_compare(value, email)
+
+
 def filter_users_by_email(
     email: str, is_active: Optional[bool] = None, prefer_verified: bool = False
 ) -> List:
     """Return list of users by email address
 
-    Typically one, at most just a few in length.  First we look through
-    EmailAddress table, than customisable User model table. Add results
-    together avoiding SQL joins and deduplicate.
+    Typically one, at most just a few in length. The users having the email
+    address in the EmailAddress table, and the users having the email address
+    on the customisable User model are fetched using a single (UNION) query,
+    each part of which can use the email index of its table.
 
     `prefer_verified`: When looking up users by email, there can be cases where
     users with verified email addresses are preferable above users who did not
@@ -277,31 +287,66 @@ def filter_users_by_email(
     there is a user with a verified email than that user should be returned, not
     one of the other users.
     """
+    email = email.lower()
+    users = list(_get_users_by_email_queryset(email))
+    return _select_users_by_email(users, email, is_active, prefer_verified)
+
+
+async def afilter_users_by_email(
+    email: str, is_active: Optional[bool] = None, prefer_verified: bool = False
+) -> List:
+    """
+    See ``filter_users_by_email()``.
+    """
+    email = email.lower()
+    users = [user async for user in _get_users_by_email_queryset(email)]
+    return _select_users_by_email(users, email, is_active, prefer_verified)
+
+
+def _get_users_by_email_queryset(email: str):
     from .models import EmailAddress
 
     User = get_user_model()
-    email = email.lower()
-    mails = list(EmailAddress.objects.filter(email=email).select_related("user"))
-    is_verified = False
-    if prefer_verified:
-        verified_mails = list(filter(lambda e: e.verified, mails))
-        if verified_mails:
-            mails = verified_mails
-            is_verified = True
-    users = []
-    for e in mails:
-        if _unicode_ci_compare(e.email, email):
-            users.append(e.user)
-    if app_settings.USER_MODEL_EMAIL_FIELD and not is_verified:
-        q_dict = {app_settings.USER_MODEL_EMAIL_FIELD: email}
-        user_qs = User.objects.filter(**q_dict)
-        for user in user_qs.iterator(2000):
-            user_email = getattr(user, app_settings.USER_MODEL_EMAIL_FIELD)
-            if _unicode_ci_compare(user_email, email):
-                users.append(user)
+    addresses = EmailAddress.objects.filter(email=email)
+    user_addresses = addresses.filter(user=OuterRef("pk"))
+    annotations = {
+        "allauth_address_email": Subquery(user_addresses.values("email")[:1]),
+        "allauth_address_verified": Exists(user_addresses.filter(verified=True)),
+    }
+    qs = User.objects.filter(pk__in=addresses.values("user_id")).annotate(**annotations)
+    email_field = app_settings.USER_MODEL_EMAIL_FIELD
+    if email_field:
+        # UNION ALL, as not all databases can compare all column types. Not all
+        # databases allow for ordering the parts of a compound query, hence, the
+        # (default) ordering of the user model is cleared.
+        qs = qs.order_by().union(
+            User.objects.filter(**{email_field: email})
+            .annotate(**annotations)
+            .order_by(),
+            all=True,
+        )
+    return qs
+
+
+def _select_users_by_email(
+    users: List, email: str, is_active: Optional[bool], prefer_verified: bool
+) -> List:
+    email_field = app_settings.USER_MODEL_EMAIL_FIELD
+    matches = {}
+    verified_matches = {}
+    for user in users:
+        if _email_matches(user.allauth_address_email, email):
+            matches[user.pk] = user
+            if user.allauth_address_verified:
+                verified_matches[user.pk] = user
+        elif email_field and _email_matches(getattr(user, email_field), email):
+            matches[user.pk] = user
+    if prefer_verified and verified_matches:
+        matches = verified_matches
+    ret = list(matches.values())
     if is_active is not None:
-        users = [u for u in set(users) if u.is_active == is_active]
-    return list(set(users))
+        ret = [u for u in ret if u.is_active == is_active]
+    return ret
 
 
 def passthrough_next_redirect_url(request, url, redirect_field_name):
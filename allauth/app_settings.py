@@ -1,5 +1,7 @@
 from django.apps import apps
 
+from allauth.core.internal.settingskit import SettingsSnapshot
+
 
 class AppSettings:
     def __init__(self, prefix):
@@ -42,14 +44,21 @@ class AppSettings:
 
         return get_setting("HEADLESS_ONLY", False)
 
+    @property
+    def RATE_LIMIT_ENGINE(self):
+        return self._setting(
+            "RATE_LIMIT_ENGINE", "allauth.core.ratelimit.SlidingWindowCounterEngine"
+        )
+
     @property
     def DEFAULT_AUTO_FIELD(self):
         return self._setting("DEFAULT_AUTO_FIELD", None)
 
 
 _app_settings = AppSettings("ALLAUTH_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
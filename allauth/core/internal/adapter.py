@@ -1,9 +1,21 @@
+from typing import Any, Dict
+
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 from allauth.core import context
 
 
+_adapter_classes: Dict[str, type] = {}
+
+
 class BaseAdapter:
+    # Set to `True` in case the adapter does not keep any state in between
+    # calls, in which case a single adapter instance is shared for the whole
+    # duration of a request.
+    per_request = False
+
     def __init__(self, request=None):
         # Explicitly passing `request` is deprecated, just use:
         # `allauth.core.context.request`.
@@ -15,3 +27,42 @@ class BaseAdapter:
             message = message % args
         exc = ValidationError(message, code=code)
         return exc
+
+
+def get_adapter_class(path: str) -> type:
+    from allauth.utils import import_attribute
+
+    adapter_class = _adapter_classes.get(path)
+    if adapter_class is None:
+        adapter_class = import_attribute(path)
+        _adapter_classes[path] = adapter_class
+    return adapter_class
+
+
+def resolve_adapter(path: str, *args) -> Any:
+    """
+    Instantiates the adapter class at `path`, passing along `args`. Adapters
+    marked as `per_request` are instantiated once per request, and stored on
+    `request.allauth`.
+    """
+    adapter_class = get_adapter_class(path)
+    request = context.request
+    if (
+        not getattr(adapter_class, "per_request", False)
+        or request is None
+        or not hasattr(request, "allauth")
+        or any(arg is not None and arg is not request for arg in args)
+    ):
+        return adapter_class(*args)
+    adapters = getattr(request.allauth, "adapters", None)
+    if adapters is None:
+        adapters = request.allauth.adapters = {}
+    adapter = adapters.get(adapter_class)
+    if adapter is None:
+        adapter = adapters[adapter_class] = adapter_class(*args)
+    return adapter
+
+
+@receiver(setting_changed)
+def _clear_adapter_classes(**kwargs):
+    _adapter_classes.clear()
@@ -1,42 +1,355 @@
 """
-Rate limiting in this implementation relies on a cache and uses non-atomic
-operations, making it vulnerable to race conditions. As a result, users may
-occasionally bypass the intended rate limit due to concurrent access. However,
-such race conditions are rare in practice. For example, if the limit is set to
-10 requests per minute and a large number of parallel processes attempt to test
-that limit, you may occasionally observe slight overruns—such as 11 or 12
-requests slipping through. Nevertheless, exceeding the limit by a large margin
-is highly unlikely due to the low probability of many processes entering the
-critical non-atomic code section simultaneously.
+Rate limiting in this implementation relies on a cache. The default engine uses
+a sliding window counter: per rate and key, the number of hits in the current
+and the previous fixed window are tracked in integer counters that are updated
+atomically using ``cache.add()`` and ``cache.incr()``. The number of hits within
+the sliding window is then estimated by weighing the count of the previous
+window by the portion of it that still overlaps with the sliding window. As a
+result, the amount of data stored per key is constant regardless of the rate
+configured, and concurrent processes cannot overwrite each other's hits.
+
+The estimate errs on the side of caution: right after a window boundary, hits
+from the previous window still (partially) count against the limit.
+
+All rates configured for an action are processed in one go: the counters of all
+rates are fetched using a single ``cache.get_many()`` call. The rate limit
+configuration (``RATE_LIMITS``) of each app is parsed once, and kept in a table
+that is invalidated whenever settings change.
+
+The ``a*`` variants (``aconsume()``, ``aclear()``, ...) use the async cache API,
+and operate on the same cache keys as their synchronous counterparts.
+
+For each rate involved, a ``rate_limit_event`` signal is sent, reporting whether
+the hit was allowed, denied or rolled back. ``RateLimitStats`` aggregates those
+events in-process.
 """
 
 import hashlib
+import math
+import threading
 import time
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from types import MappingProxyType, ModuleType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
+from asgiref.sync import sync_to_async
+
+from allauth.core import signals
 from allauth.core.exceptions import RateLimited
+from allauth.core.internal import settingskit
 
 
 Rate = namedtuple("Rate", "amount duration per")
 
+CompiledConfig = Mapping[str, Tuple[Rate, ...]]
+
+_compiled_configs: Dict[str, CompiledConfig] = {}
+
+
+class RateLimitEngine:
+    """
+    Keeps track of the hits of rates, per cache key.
+    """
+
+    def consume(self, cache_key: str, rate: Rate, *, dry_run: bool = False) -> Any:
+        """
+        Consumes one hit. Returns `None` in case the rate limit is exceeded.
+        Otherwise, an engine specific (not `None`) value identifying the hit
+        is returned, which is passed to `rollback()` later on.
+        """
+        raise NotImplementedError
+
+    async def aconsume(
+        self, cache_key: str, rate: Rate, *, dry_run: bool = False
+    ) -> Any:
+        return await sync_to_async(self.consume)(cache_key, rate, dry_run=dry_run)
+
+    def consume_many(
+        self, entries: List[Tuple[str, Rate]], *, dry_run: bool = False
+    ) -> Optional[List[Any]]:
+        """
+        Consumes one hit for all of the given `(cache_key, rate)` pairs, in an
+        all or nothing fashion. Returns `None` if any of the rate limits is
+        exceeded, or, the list of hits otherwise.
+        """
+        hits: List[Any] = []
+        for cache_key, rate in entries:
+            hit = self.consume(cache_key, rate, dry_run=dry_run)
+            if hit is None:
+                if not dry_run:
+                    for (hit_cache_key, hit_rate), hit in zip(entries, hits):
+                        self.rollback(hit_cache_key, hit_rate, hit)
+                return None
+            hits.append(hit)
+        return hits
+
+    async def aconsume_many(
+        self, entries: List[Tuple[str, Rate]], *, dry_run: bool = False
+    ) -> Optional[List[Any]]:
+        return await sync_to_async(self.consume_many)(entries, dry_run=dry_run)
+
+    def rollback(self, cache_key: str, rate: Rate, hit: Any) -> None:
+        """
+        Undoes a hit previously returned by `consume()`.
+        """
+        raise NotImplementedError
+
+    async def arollback(self, cache_key: str, rate: Rate, hit: Any) -> None:
+        await sync_to_async(self.rollback)(cache_key, rate, hit)
+
+    def clear(self, cache_key: str, rate: Rate) -> None:
+        raise NotImplementedError
+
+    def clear_many(self, entries: List[Tuple[str, Rate]]) -> None:
+        for cache_key, rate in entries:
+            self.clear(cache_key, rate)
+
+    async def aclear_many(self, entries: List[Tuple[str, Rate]]) -> None:
+        await sync_to_async(self.clear_many)(entries)
+
+
+class SlidingWindowCounterEngine(RateLimitEngine):
+    def _get_window(self, rate: Rate, now: float) -> Tuple[int, float]:
+        window = int(now // rate.duration)
+        elapsed = (now - window * rate.duration) / rate.duration
+        return window, elapsed
+
+    def _get_window_key(self, cache_key: str, window: int) -> str:
+        return f"{cache_key}:{window}"
+
+    def _get_timeout(self, rate: Rate) -> int:
+        # The counter of a window is weighed into the next window as well, so
+        # it needs to outlive its own window.
+        return math.ceil(2 * rate.duration)
+
+    def _get_windows(
+        self, entries: List[Tuple[str, Rate]]
+    ) -> List[Tuple[Rate, str, str, float]]:
+        now = time.time()
+        windows = []
+        for cache_key, rate in entries:
+            window, elapsed = self._get_window(rate, now)
+            windows.append(
+                (
+                    rate,
+                    self._get_window_key(cache_key, window - 1),
+                    self._get_window_key(cache_key, window),
+                    elapsed,
+                )
+            )
+        return windows
+
+    def _is_allowed(
+        self,
+        counts: Dict[str, int],
+        rate: Rate,
+        previous_key: str,
+        current: int,
+        elapsed: float,
+    ) -> bool:
+        previous = counts.get(previous_key, 0)
+        return previous * (1 - elapsed) + current <= rate.amount
+
+    def _is_exhausted(
+        self, counts: Dict[str, int], windows: List[Tuple[Rate, str, str, float]]
+    ) -> bool:
+        for rate, previous_key, window_key, elapsed in windows:
+            current = counts.get(window_key, 0) + 1
+            if not self._is_allowed(counts, rate, previous_key, current, elapsed):
+                return True
+        return False
+
+    def _get_clear_keys(self, entries: List[Tuple[str, Rate]]) -> List[str]:
+        keys = []
+        for _, previous_key, window_key, _ in self._get_windows(entries):
+            keys.extend([previous_key, window_key])
+        return keys
+
+    def _incr(self, window_key: str, rate: Rate, exists: bool) -> int:
+        if exists:
+            try:
+                return cache.incr(window_key)
+            except ValueError:
+                pass
+        if cache.add(window_key, 1, timeout=self._get_timeout(rate)):
+            return 1
+        # Another process created the counter in the meantime.
+        try:
+            return cache.incr(window_key)
+        except ValueError:
+            # Expired right away, or, the cache is not storing anything at all
+            # (e.g. `DummyCache`).
+            return 1
+
+    async def _aincr(self, window_key: str, rate: Rate, exists: bool) -> int:
+        if exists:
+            try:
+                return await cache.aincr(window_key)
+            except ValueError:
+                pass
+        if await cache.aadd(window_key, 1, timeout=self._get_timeout(rate)):
+            return 1
+        try:
+            return await cache.aincr(window_key)
+        except ValueError:
+            return 1
+
+    def _decr(self, window_key: str) -> None:
+        try:
+            cache.decr(window_key)
+        except ValueError:
+            # Expired or cleared, nothing left to undo.
+            pass
+
+    async def _adecr(self, window_key: str) -> None:
+        try:
+            await cache.adecr(window_key)
+        except ValueError:
+            pass
+
+    def consume(self, cache_key: str, rate: Rate, *, dry_run: bool = False) -> Any:
+        hits = self.consume_many([(cache_key, rate)], dry_run=dry_run)
+        return hits[0] if hits else None
+
+    async def aconsume(
+        self, cache_key: str, rate: Rate, *, dry_run: bool = False
+    ) -> Any:
+        hits = await self.aconsume_many([(cache_key, rate)], dry_run=dry_run)
+        return hits[0] if hits else None
+
+    def consume_many(
+        self, entries: List[Tuple[str, Rate]], *, dry_run: bool = False
+    ) -> Optional[List[Any]]:
+        windows = self._get_windows(entries)
+        counts = cache.get_many([key for w in windows for key in w[1:3]])
+        # Bail out without writing anything if any of the rates is exhausted.
+        if self._is_exhausted(counts, windows):
+            return None
+        hits = [window_key for _, _, window_key, _ in windows]
+        if dry_run:
+            return hits
+        # Other processes may have consumed in the meantime, so the limits are
+        # verified once more against the atomically incremented counters.
+        for idx, (rate, previous_key, window_key, elapsed) in enumerate(windows):
+            current = self._incr(window_key, rate, exists=window_key in counts)
+            if not self._is_allowed(counts, rate, previous_key, current, elapsed):
+                for hit in hits[: idx + 1]:
+                    self._decr(hit)
+                return None
+        return hits
+
+    async def aconsume_many(
+        self, entries: List[Tuple[str, Rate]], *, dry_run: bool = False
+    ) -> Optional[List[Any]]:
+        windows = self._get_windows(entries)
+        counts = await cache.aget_many([key for w in windows for key in w[1:3]])
+        if self._is_exhausted(counts, windows):
+            return None
+        hits = [window_key for _, _, window_key, _ in windows]
+        if dry_run:
+            return hits
+        for idx, (rate, previous_key, window_key, elapsed) in enumerate(windows):
+            current = await self._aincr(window_key, rate, exists=window_key in counts)
+            if not self._is_allowed(counts, rate, previous_key, current, elapsed):
+                for hit in hits[: idx + 1]:
+                    await self._adecr(hit)
+                return None
+        return hits
+
+    def rollback(self, cache_key: str, rate: Rate, hit: Any) -> None:
+        self._decr(hit)
+
+    async def arollback(self, cache_key: str, rate: Rate, hit: Any) -> None:
+        await self._adecr(hit)
+
+    def clear(self, cache_key: str, rate: Rate) -> None:
+        self.clear_many([(cache_key, rate)])
+
+    def clear_many(self, entries: List[Tuple[str, Rate]]) -> None:
+        cache.delete_many(self._get_clear_keys(entries))
+
+    async def aclear_many(self, entries: List[Tuple[str, Rate]]) -> None:
+        await cache.adelete_many(self._get_clear_keys(entries))
+
+
+def get_engine() -> RateLimitEngine:
+    from allauth import app_settings
+    from allauth.utils import import_attribute
+
+    return import_attribute(app_settings.RATE_LIMIT_ENGINE)()
+
+
+def format_rate(rate: Rate) -> str:
+    return f"{rate.amount}/{rate.duration:g}s/{rate.per}"
+
+
+def _send_events(request, action: str, rates, outcome: str) -> None:
+    if not signals.rate_limit_event.has_listeners(Rate):
+        return
+    for rate in rates:
+        signals.rate_limit_event.send(
+            sender=Rate, request=request, action=action, rate=rate, outcome=outcome
+        )
+
+
+class RateLimitStats:
+    """
+    Counts the rate limit events per action, rate and outcome, in-process. Use
+    `connect()` to start collecting, and `snapshot()` to scrape the counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def connect(self) -> None:
+        signals.rate_limit_event.connect(
+            self._on_event, sender=Rate, dispatch_uid=id(self)
+        )
+
+    def disconnect(self) -> None:
+        signals.rate_limit_event.disconnect(sender=Rate, dispatch_uid=id(self))
+
+    def _on_event(self, sender, action: str, rate: Rate, outcome: str, **kwargs):
+        with self._lock:
+            self._counts[(action, format_rate(rate), outcome)] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], int]:
+        """
+        Returns the counters, keyed by `(action, rate, outcome)`, where rate is
+        formatted like `"5/300s/key"`.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
 
 @dataclass
 class SingleRateLimitUsage:
     cache_key: str
-    cache_duration: Union[float, int]
-    timestamp: float
+    rate: Rate
+    engine: RateLimitEngine
+    hit: Any
+    action: str
 
     def rollback(self) -> None:
-        history = cache.get(self.cache_key, [])
-        history = [ts for ts in history if ts != self.timestamp]
-        cache.set(self.cache_key, history, self.cache_duration)
+        self.engine.rollback(self.cache_key, self.rate, self.hit)
+        _send_events(None, self.action, [self.rate], "rolled_back")
+
+    async def arollback(self) -> None:
+        await self.engine.arollback(self.cache_key, self.rate, self.hit)
+        _send_events(None, self.action, [self.rate], "rolled_back")
 
 
 @dataclass
@@ -47,6 +360,10 @@ class RateLimitUsage:
         for usage in self.usage:
             usage.rollback()
 
+    async def arollback(self) -> None:
+        for usage in self.usage:
+            await usage.arollback()
+
 
 def parse_duration(duration) -> Union[int, float]:
     if len(duration) == 0:
@@ -88,6 +405,42 @@ def parse_rates(rates: Optional[str]) -> List[Rate]:
     return ret
 
 
+def compile_config(config: Mapping[str, Optional[str]]) -> CompiledConfig:
+    return MappingProxyType(
+        {action: tuple(parse_rates(rates)) for action, rates in config.items()}
+    )
+
+
+def get_config(app_settings: ModuleType) -> CompiledConfig:
+    """
+    Returns the compiled ``RATE_LIMITS`` of the given app settings module.
+    """
+    if not settingskit.is_snapshot_enabled():
+        return compile_config(app_settings.RATE_LIMITS)
+    config = _compiled_configs.get(app_settings.__name__)
+    if config is None:
+        config = compile_config(app_settings.RATE_LIMITS)
+        _compiled_configs[app_settings.__name__] = config
+    return config
+
+
+@receiver(setting_changed)
+def _clear_compiled_configs(**kwargs):
+    _compiled_configs.clear()
+
+
+def _get_rates(config: Mapping[str, Any], action: str) -> Tuple[Rate, ...]:
+    rates = config.get(action)
+    if isinstance(rates, tuple):
+        return rates
+    return tuple(parse_rates(rates))
+
+
+def _check_user(user) -> None:
+    if not user.is_authenticated:
+        raise ImproperlyConfigured("ratelimit configured per user but used anonymously")
+
+
 def get_cache_key(request, *, action: str, rate: Rate, key=None, user=None):
     from allauth.account.adapter import get_adapter
 
@@ -96,10 +449,7 @@ def get_cache_key(request, *, action: str, rate: Rate, key=None, user=None):
         source = ("ip", get_adapter().get_client_ip(request))
     elif rate.per == "user":
         if user is None:
-            if not request.user.is_authenticated:
-                raise ImproperlyConfigured(
-                    "ratelimit configured per user but used anonymously"
-                )
+            _check_user(request.user)
             user = request.user
         source = ("user", str(user.pk))
     elif rate.per == "key":
@@ -115,41 +465,100 @@ def get_cache_key(request, *, action: str, rate: Rate, key=None, user=None):
     return ":".join(keys)
 
 
-def _consume_single_rate(
-    request,
+def _get_entries(
+    request, *, action: str, rates: Tuple[Rate, ...], key=None, user=None
+) -> List[Tuple[str, Rate]]:
+    return [
+        (get_cache_key(request, action=action, rate=rate, key=key, user=user), rate)
+        for rate in rates
+    ]
+
+
+@sync_to_async
+def _async_get_user(request):
+    return request.user
+
+
+def _get_exceeded(
+    engine: RateLimitEngine, entries: List[Tuple[str, Rate]]
+) -> List[Rate]:
+    exceeded = [
+        rate
+        for cache_key, rate in entries
+        if engine.consume(cache_key, rate, dry_run=True) is None
+    ]
+    # Concurrent hits may have pushed the combination over the edge, while
+    # the rates individually are not (or no longer) exceeded.
+    return exceeded or [rate for _, rate in entries]
+
+
+async def _aget_exceeded(
+    engine: RateLimitEngine, entries: List[Tuple[str, Rate]]
+) -> List[Rate]:
+    exceeded = [
+        rate
+        for cache_key, rate in entries
+        if await engine.aconsume(cache_key, rate, dry_run=True) is None
+    ]
+    return exceeded or [rate for _, rate in entries]
+
+
+async def _aget_entries(
+    request, *, action: str, rates: Tuple[Rate, ...], key=None, user=None
+) -> List[Tuple[str, Rate]]:
+    if user is None and any(rate.per == "user" for rate in rates):
+        if hasattr(request, "auser"):
+            user = await request.auser()
+        else:
+            # Django <5
+            user = await _async_get_user(request)
+        _check_user(user)
+    return _get_entries(request, action=action, rates=rates, key=key, user=user)
+
+
+def consume(
+    request: HttpRequest,
     *,
     action: str,
-    rate: Rate,
+    config: Mapping[str, Any],
     key=None,
     user=None,
     dry_run: bool = False,
+    limit_get: bool = False,
     raise_exception: bool = False,
-) -> Optional[SingleRateLimitUsage]:
-    cache_key = get_cache_key(request, action=action, rate=rate, key=key, user=user)
-    history = cache.get(cache_key, [])
-    now = time.time()
-    while history and history[-1] <= now - rate.duration:
-        history.pop()
-    allowed = len(history) < rate.amount
-    if allowed:
-        usage = SingleRateLimitUsage(
-            cache_key=cache_key, timestamp=now, cache_duration=rate.duration
+) -> Optional[RateLimitUsage]:
+    usage = RateLimitUsage(usage=[])
+    if (not limit_get) and request.method == "GET":
+        return usage
+    rates = _get_rates(config, action)
+    if not rates:
+        return usage
+    engine = get_engine()
+    entries = _get_entries(request, action=action, rates=rates, key=key, user=user)
+    hits = engine.consume_many(entries, dry_run=dry_run)
+    if not dry_run and signals.rate_limit_event.has_listeners(Rate):
+        if hits is None:
+            _send_events(request, action, _get_exceeded(engine, entries), "denied")
+        else:
+            _send_events(request, action, rates, "allowed")
+    if hits is None:
+        if raise_exception:
+            raise RateLimited
+        return None
+    for (cache_key, rate), hit in zip(entries, hits):
+        usage.usage.append(
+            SingleRateLimitUsage(
+                cache_key=cache_key, rate=rate, engine=engine, hit=hit, action=action
+            )
         )
-    else:
-        usage = None
-    if allowed and not dry_run:
-        history.insert(0, now)
-        cache.set(cache_key, history, rate.duration)
-    if not allowed and raise_exception:
-        raise RateLimited
     return usage
 
 
-def consume(
+async def aconsume(
     request: HttpRequest,
     *,
     action: str,
-    config: Dict[str, str],
+    config: Mapping[str, Any],
     key=None,
     user=None,
     dry_run: bool = False,
@@ -159,25 +568,31 @@ def consume(
     usage = RateLimitUsage(usage=[])
     if (not limit_get) and request.method == "GET":
         return usage
-    rates = parse_rates(config.get(action))
+    rates = _get_rates(config, action)
     if not rates:
         return usage
-    allowed = True
-    for rate in rates:
-        single_usage = _consume_single_rate(
-            request,
-            action=action,
-            rate=rate,
-            key=key,
-            user=user,
-            dry_run=dry_run,
-            raise_exception=raise_exception,
+    engine = get_engine()
+    entries = await _aget_entries(
+        request, action=action, rates=rates, key=key, user=user
+    )
+    hits = await engine.aconsume_many(entries, dry_run=dry_run)
+    if not dry_run and signals.rate_limit_event.has_listeners(Rate):
+        if hits is None:
+            exceeded = await _aget_exceeded(engine, entries)
+            _send_events(request, action, exceeded, "denied")
+        else:
+            _send_events(request, action, rates, "allowed")
+    if hits is None:
+        if raise_exception:
+            raise RateLimited
+        return None
+    for (cache_key, rate), hit in zip(entries, hits):
+        usage.usage.append(
+            SingleRateLimitUsage(
+                cache_key=cache_key, rate=rate, engine=engine, hit=hit, action=action
+            )
         )
-        if not single_usage:
-            allowed = False
-            break
-        usage.usage.append(single_usage)
-    return usage if allowed else None
+    return usage
 
 
 def handler429(request) -> HttpResponse:
@@ -186,8 +601,21 @@ def handler429(request) -> HttpResponse:
     return render(request, "429." + app_settings.TEMPLATE_EXTENSION, status=429)
 
 
-def clear(request, *, config: dict, action: str, key=None, user=None):
-    rates = parse_rates(config.get(action))
-    for rate in rates:
-        cache_key = get_cache_key(request, action=action, rate=rate, key=key, user=user)
-        cache.delete(cache_key)
+def clear(request, *, config: Mapping[str, Any], action: str, key=None, user=None):
+    rates = _get_rates(config, action)
+    if not rates:
+        return
+    entries = _get_entries(request, action=action, rates=rates, key=key, user=user)
+    get_engine().clear_many(entries)
+
+
+async def aclear(
+    request, *, config: Mapping[str, Any], action: str, key=None, user=None
+):
+    rates = _get_rates(config, action)
+    if not rates:
+        return
+    entries = await _aget_entries(
+        request, action=action, rates=rates, key=key, user=user
+    )
+    await get_engine().aclear_many(entries)
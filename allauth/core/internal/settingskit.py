@@ -0,0 +1,107 @@
+"""
+Resolving a setting involves quite some work: ``ALLAUTH_SETTING_GETTER`` is
+resolved, properties combine and validate multiple settings, apps are checked
+for being installed, and so on. As settings are accessed dozens of times per
+request, the app settings modules serve their values from a snapshot instead.
+
+The snapshot is filled lazily. Immutable values are served as is. Plain data
+structures (dictionaries, lists and sets of immutable values, such as
+``SIGNUP_FIELDS`` and ``RATE_LIMITS``) are copied on access, so that callers
+cannot (accidentally) alter the snapshot. Other values, such as classes and
+validator instances, are computed on each access. The snapshot is invalidated
+whenever settings change (``setting_changed``). As a custom
+``ALLAUTH_SETTING_GETTER`` may return different values depending on, for
+example, the current request, the snapshot is disabled by default in that case.
+
+See ``tests/benchmarks/settings_access.py`` for a benchmark.
+"""
+
+from datetime import timedelta
+from enum import Enum
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    tuple,
+    frozenset,
+    timedelta,
+    Enum,
+)
+
+_PLAIN_CONTAINER_TYPES = (dict, list, set)
+
+_snapshots: List["SettingsSnapshot"] = []
+
+
+def is_snapshot_enabled() -> bool:
+    return getattr(
+        settings,
+        "ALLAUTH_CACHE_SETTINGS",
+        not hasattr(settings, "ALLAUTH_SETTING_GETTER"),
+    )
+
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+def _is_plain(value: Any) -> bool:
+    if type(value) is dict:
+        return all(_is_immutable(k) and _is_plain(v) for k, v in value.items())
+    if type(value) is list:
+        return all(_is_plain(v) for v in value)
+    if type(value) is set:
+        return all(_is_immutable(v) for v in value)
+    return _is_immutable(value)
+
+
+def _copy(value: Any) -> Any:
+    if type(value) is dict:
+        return {k: _copy(v) for k, v in value.items()}
+    if type(value) is list:
+        return [_copy(v) for v in value]
+    if type(value) is set:
+        return set(value)
+    return value
+
+
+class SettingsSnapshot:
+    def __init__(self, app_settings):
+        self.app_settings = app_settings
+        self.values: Dict[str, Any] = {}
+        _snapshots.append(self)
+
+    def get(self, name: str) -> Any:
+        try:
+            value = self.values[name]
+        except KeyError:
+            pass
+        else:
+            if type(value) in _PLAIN_CONTAINER_TYPES:
+                return _copy(value)
+            return value
+        value = getattr(self.app_settings, name)
+        if is_snapshot_enabled() and _is_plain(value):
+            self.values[name] = _copy(value)
+        return value
+
+    def clear(self) -> None:
+        self.values.clear()
+
+
+@receiver(setting_changed)
+def _clear_snapshots(**kwargs):
+    for snapshot in _snapshots:
+        snapshot.clear()
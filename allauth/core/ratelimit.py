@@ -6,7 +6,12 @@ from django.http import HttpResponse
 from allauth import app_settings
 from allauth.core.exceptions import RateLimited  # noqa
 from allauth.core.internal import ratelimit as _impl
-from allauth.core.internal.ratelimit import Rate  # noqa
+from allauth.core.internal.ratelimit import (  # noqa
+    Rate,
+    RateLimitEngine,
+    RateLimitStats,
+    SlidingWindowCounterEngine,
+)
 from allauth.utils import import_callable
 
 
@@ -15,7 +20,19 @@ def clear(request, *, action, key=None, user=None):
 
     _impl.clear(
         request=request,
-        config=app_settings.RATE_LIMITS,
+        config=_impl.get_config(app_settings),
+        action=action,
+        key=key,
+        user=user,
+    )
+
+
+async def aclear(request, *, action, key=None, user=None):
+    from allauth.account import app_settings
+
+    await _impl.aclear(
+        request=request,
+        config=_impl.get_config(app_settings),
         action=action,
         key=key,
         user=user,
@@ -35,7 +52,32 @@ def consume(
 
     usage = _impl.consume(
         request=request,
-        config=app_settings.RATE_LIMITS,
+        config=_impl.get_config(app_settings),
+        action=action,
+        key=key,
+        user=user,
+        dry_run=dry_run,
+        raise_exception=raise_exception,
+    )
+    if not usage:
+        return False
+    return True
+
+
+async def aconsume(
+    request,
+    *,
+    action,
+    key=None,
+    user=None,
+    dry_run: bool = False,
+    raise_exception: bool = False,
+) -> bool:
+    from allauth.account import app_settings
+
+    usage = await _impl.aconsume(
+        request=request,
+        config=_impl.get_config(app_settings),
         action=action,
         key=key,
         user=user,
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+
+# Sent for each rate of an action that is rate limited. The outcome is one of
+# "allowed" (a hit was recorded), "denied" (the rate was exceeded) or
+# "rolled_back" (a previously recorded hit was undone, in which case "request"
+# is `None`).
+# Provides the arguments "request", "action", "rate", "outcome"
+rate_limit_event = Signal()
@@ -48,6 +48,11 @@ class LoginInput(inputs.Input):
     password = inputs.CharField()
 
     def __init__(self, *args, **kwargs):
+        # When deferred, only the credentials are validated. Authenticating
+        # them is up to the caller, see `set_authenticated_user()`, which
+        # raises a `ValidationError` in case the login is rate limited.
+        self.defer_authentication = kwargs.pop("defer_authentication", False)
+        self.credentials = None
         super().__init__(*args, **kwargs)
         for field in ["username", "email", "phone"]:
             if field not in account_settings.LOGIN_METHODS:
@@ -68,22 +73,29 @@ class LoginInput(inputs.Input):
             raise get_account_adapter().validation_error("invalid_login")
         password = cleaned_data.get("password")
         if password:
-            auth_method = next(iter(credentials.keys()))
             credentials["password"] = password
-            user = get_account_adapter().authenticate(context.request, **credentials)
-            if user:
-                self.login = Login(user=user, email=credentials.get("email"))
-                if flows.login.is_login_rate_limited(context.request, self.login):
-                    raise get_account_adapter().validation_error(
-                        "too_many_login_attempts"
-                    )
-            else:
-                error_code = "%s_password_mismatch" % auth_method.value
-                self.add_error(
-                    "password", get_account_adapter().validation_error(error_code)
+            self.credentials = credentials
+            if not self.defer_authentication:
+                user = get_account_adapter().authenticate(
+                    context.request, **credentials
                 )
+                self.set_authenticated_user(user)
         return cleaned_data
 
+    def set_authenticated_user(self, user) -> None:
+        if user:
+            self.login = Login(user=user, email=self.credentials.get("email"))
+            if flows.login.is_login_rate_limited(context.request, self.login):
+                raise get_account_adapter().validation_error(
+                    "too_many_login_attempts"
+                )
+        else:
+            auth_method = next(iter(self.credentials.keys()))
+            error_code = "%s_password_mismatch" % auth_method.value
+            self.add_error(
+                "password", get_account_adapter().validation_error(error_code)
+            )
+
 
 class VerifyEmailInput(inputs.Input):
     key = inputs.CharField()
@@ -2,6 +2,7 @@ from django.urls import include, path
 
 from allauth import app_settings as allauth_settings
 from allauth.account import app_settings as account_settings
+from allauth.headless import app_settings as headless_settings
 from allauth.headless.account import views
 
 
@@ -67,7 +68,11 @@ def build_urlpatterns(client):
                 ),
                 path(
                     "login",
-                    views.LoginView.as_api_view(client=client),
+                    (
+                        views.AsyncLoginView
+                        if headless_settings.ASYNC_LOGIN
+                        else views.LoginView
+                    ).as_api_view(client=client),
                     name="login",
                 ),
                 path(
@@ -1,7 +1,11 @@
+import inspect
 from http import HTTPStatus
 
+from django.core.exceptions import ValidationError
 from django.utils.decorators import method_decorator
 
+from asgiref.sync import sync_to_async
+
 from allauth.account import app_settings as account_settings
 from allauth.account.adapter import get_adapter as get_account_adapter
 from allauth.account.internal import flows
@@ -25,7 +29,11 @@ from allauth.account.stages import (
 )
 from allauth.account.utils import send_email_confirmation
 from allauth.core import ratelimit
-from allauth.core.exceptions import ImmediateHttpResponse, RateLimited
+from allauth.core.exceptions import (
+    ImmediateHttpResponse,
+    RateLimited,
+    ReauthenticationRequired,
+)
 from allauth.decorators import rate_limit
 from allauth.headless.account import response
 from allauth.headless.account.inputs import (
@@ -53,6 +61,7 @@ from allauth.headless.base.response import (
     ConflictResponse,
     ForbiddenResponse,
     RateLimitResponse,
+    ReauthenticationResponse,
 )
 from allauth.headless.base.views import APIView, AuthenticatedAPIView
 from allauth.headless.internal import authkit
@@ -115,6 +124,60 @@ class LoginView(APIView):
         return AuthenticationResponse.from_response(request, response)
 
 
+class AsyncLoginView(LoginView):
+    """
+    The async counterpart of ``LoginView``. The credentials are authenticated
+    using ``aauthenticate()``, so that checking the password does not block the
+    event loop, nor the thread running the sync code. The remainder of the
+    request is handled in that thread, as usual.
+    """
+
+    def get_input_kwargs(self):
+        kwargs = super().get_input_kwargs()
+        kwargs["defer_authentication"] = True
+        return kwargs
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            response = await sync_to_async(super().dispatch)(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                # The handler (e.g. `post()`), which is async.
+                response = await response
+        except ReauthenticationRequired:
+            response = ReauthenticationResponse(request)
+        return response
+
+    async def post(self, request, *args, **kwargs):
+        response = await sync_to_async(self.get_conflict_response)(request)
+        if response:
+            return response
+        error = user = None
+        try:
+            user = await get_account_adapter(request).aauthenticate(
+                request, **self.input.credentials
+            )
+        except ValidationError as e:
+            error = e
+        return await sync_to_async(self.complete_login)(request, user, error)
+
+    def get_conflict_response(self, request):
+        if request.user.is_authenticated:
+            return ConflictResponse(request)
+        return None
+
+    def complete_login(self, request, user, error):
+        if not error:
+            try:
+                self.input.set_authenticated_user(user)
+            except ValidationError as e:
+                error = e
+        if error:
+            self.input.add_error(None, error)
+        if self.input.errors:
+            return self.handle_invalid_input(self.input)
+        return super().post(request)
+
+
 @method_decorator(rate_limit(action="signup"), name="handle")
 class SignupView(APIView):
     input_class = {"POST": SignupInput}
@@ -9,10 +9,9 @@ from django.forms.fields import Field
 from allauth.account import app_settings as account_settings
 from allauth.account.models import EmailAddress
 from allauth.account.utils import user_display, user_username
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.core.internal.httpkit import default_get_frontend_url
 from allauth.headless import app_settings
-from allauth.utils import import_attribute
 
 
 class DefaultHeadlessAdapter(BaseAdapter):
@@ -144,4 +143,4 @@ class DefaultHeadlessAdapter(BaseAdapter):
 
 
 def get_adapter():
-    return import_attribute(app_settings.ADAPTER)()
+    return resolve_adapter(app_settings.ADAPTER)
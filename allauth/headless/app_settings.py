@@ -1,5 +1,7 @@
 from typing import Optional, Tuple
 
+from allauth.core.internal.settingskit import SettingsSnapshot
+
 
 class AppSettings:
     def __init__(self, prefix):
@@ -44,10 +46,15 @@ class AppSettings:
     def FRONTEND_URLS(self):
         return self._setting("FRONTEND_URLS", {})
 
+    @property
+    def ASYNC_LOGIN(self) -> bool:
+        return self._setting("ASYNC_LOGIN", False)
+
 
 _app_settings = AppSettings("HEADLESS_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
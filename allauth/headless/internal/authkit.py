@@ -1,8 +1,11 @@
-from contextlib import contextmanager
+import sys
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, Dict, Optional
 
 from django.utils.functional import SimpleLazyObject, empty
 
+from asgiref.sync import sync_to_async
+
 from allauth import app_settings as allauth_settings
 from allauth.account.internal.stagekit import get_pending_stage
 from allauth.core.exceptions import ImmediateHttpResponse
@@ -70,6 +73,24 @@ def authentication_context(request):
         request.META["CSRF_COOKIE_NEEDS_UPDATE"] = False
 
 
+@asynccontextmanager
+async def aauthentication_context(request):
+    """
+    The async counterpart of ``authentication_context()``. The context is
+    entered and exited in the thread running the sync code, as it involves
+    the session.
+    """
+    ctx = authentication_context(request)
+    await sync_to_async(ctx.__enter__)()
+    try:
+        yield
+    except BaseException:
+        if not await sync_to_async(ctx.__exit__)(*sys.exc_info()):
+            raise
+    else:
+        await sync_to_async(ctx.__exit__)(None, None, None)
+
+
 def expose_access_token(request) -> Optional[Dict[str, Any]]:
     """
     Determines if a new access token needs to be exposed.
@@ -4,6 +4,8 @@ from types import SimpleNamespace
 from django.middleware.csrf import get_token
 from django.views.decorators.csrf import csrf_exempt
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
 from allauth.account.internal.decorators import login_not_required
 from allauth.headless.constants import Client
 from allauth.headless.internal import authkit
@@ -14,10 +16,29 @@ def mark_request_as_headless(request, client):
     request.allauth.headless.client = client
 
 
+def _csrf_exempt(view_func):
+    if iscoroutinefunction(view_func):
+        # Django < 5.0 does not support async views, see `csrf_exempt()`.
+        view_func.csrf_exempt = True
+        return view_func
+    return csrf_exempt(view_func)
+
+
 def app_view(
     function=None,
 ):
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @login_not_required
+            @wraps(view_func)
+            async def _async_wrapper_view(request, *args, **kwargs):
+                mark_request_as_headless(request, Client.APP)
+                async with authkit.aauthentication_context(request):
+                    return await view_func(request, *args, **kwargs)
+
+            return _async_wrapper_view
+
         @login_not_required
         @wraps(view_func)
         def _wrapper_view(request, *args, **kwargs):
@@ -30,13 +51,25 @@ def app_view(
     ret = decorator
     if function:
         ret = decorator(function)
-    return csrf_exempt(ret)
+    return _csrf_exempt(ret)
 
 
 def browser_view(
     function=None,
 ):
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @login_not_required
+            @wraps(view_func)
+            async def _async_wrapper_view(request, *args, **kwargs):
+                mark_request_as_headless(request, Client.BROWSER)
+                # See below.
+                await sync_to_async(get_token)(request)
+                return await view_func(request, *args, **kwargs)
+
+            return _async_wrapper_view
+
         @login_not_required
         @wraps(view_func)
         def _wrapper_view(request, *args, **kwargs):
@@ -12,10 +12,9 @@ from allauth.account.internal.userkit import (
     user_username,
 )
 from allauth.account.models import EmailAddress
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.core.internal.cryptokit import generate_user_code
 from allauth.idp.oidc import app_settings
-from allauth.utils import import_attribute
 
 
 class DefaultOIDCAdapter(BaseAdapter):
@@ -134,4 +133,4 @@ class DefaultOIDCAdapter(BaseAdapter):
 
 
 def get_adapter() -> DefaultOIDCAdapter:
-    return import_attribute(app_settings.ADAPTER)()
+    return resolve_adapter(app_settings.ADAPTER)
@@ -59,7 +59,7 @@ class ConfirmCodeForm(forms.Form):
         if not ratelimit.consume(
             context.request,
             action="device_user_code",
-            config=app_settings.RATE_LIMITS,
+            config=ratelimit.get_config(app_settings),
             limit_get=True,
         ):
             raise get_account_adapter().validation_error("rate_limited")
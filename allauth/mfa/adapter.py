@@ -14,10 +14,9 @@ from allauth.account.utils import (
     user_username,
 )
 from allauth.core import context
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.mfa import app_settings
 from allauth.mfa.models import Authenticator
-from allauth.utils import import_attribute
 
 
 class DefaultMFAAdapter(BaseAdapter):
@@ -159,4 +158,4 @@ class DefaultMFAAdapter(BaseAdapter):
 
 
 def get_adapter() -> DefaultMFAAdapter:
-    return import_attribute(app_settings.ADAPTER)()
+    return resolve_adapter(app_settings.ADAPTER)
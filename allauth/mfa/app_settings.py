@@ -1,6 +1,8 @@
 from datetime import timedelta
 from typing import Optional
 
+from allauth.core.internal.settingskit import SettingsSnapshot
+
 
 class AppSettings:
     def __init__(self, prefix):
@@ -144,8 +146,9 @@ class AppSettings:
 
 
 _app_settings = AppSettings("MFA_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
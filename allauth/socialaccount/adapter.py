@@ -1,17 +1,15 @@
-import functools
 import warnings
 
 from django.core.exceptions import ImproperlyConfigured, MultipleObjectsReturned
-from django.db.models import Q
 from django.urls import reverse
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
 
 from allauth.account.adapter import get_adapter as get_account_adapter
 from allauth.account.utils import user_email, user_field, user_username
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.core.internal.modelkit import deserialize_instance, serialize_instance
-from allauth.utils import import_attribute, valid_email_or_none
+from allauth.utils import valid_email_or_none
 
 from . import app_settings
 
@@ -184,17 +182,17 @@ class DefaultSocialAccountAdapter(BaseAdapter):
         from allauth.socialaccount.providers import registry
 
         ret = []
-        provider_classes = registry.get_class_list()
         apps = self.list_apps(request)
         apps_map = {}
         for app in apps:
             apps_map.setdefault(app.provider, []).append(app)
-        for provider_class in provider_classes:
-            provider_apps = apps_map.get(provider_class.id, [])
+        for spec in registry.get_spec_list():
+            provider_apps = apps_map.get(spec.id, [])
             if not provider_apps:
-                if provider_class.uses_apps:
+                if spec.uses_apps:
                     continue
                 provider_apps = [None]
+            provider_class = registry.get_class(spec.id)
             for app in provider_apps:
                 provider = provider_class(request=request, app=app)
                 ret.append(provider)
@@ -229,64 +227,9 @@ class DefaultSocialAccountAdapter(BaseAdapter):
         (db/settings) sources of data.
         """
         # NOTE: Avoid loading models at top due to registry boot...
-        from allauth.socialaccount.models import SocialApp
+        from allauth.socialaccount.internal import appkit
 
-        # Map provider to the list of apps.
-        provider_to_apps = {}
-
-        # First, populate it with the DB backed apps.
-        if request:
-            db_apps = SocialApp.objects.on_site(request)
-        else:
-            db_apps = SocialApp.objects.all()
-        if provider:
-            db_apps = db_apps.filter(Q(provider=provider) | Q(provider_id=provider))
-        if client_id:
-            db_apps = db_apps.filter(client_id=client_id)
-        for app in db_apps:
-            apps = provider_to_apps.setdefault(app.provider, [])
-            apps.append(app)
-
-        # Then, extend it with the settings backed apps.
-        for p, pcfg in app_settings.PROVIDERS.items():
-            app_configs = pcfg.get("APPS")
-            if app_configs is None:
-                app_config = pcfg.get("APP")
-                if app_config is None:
-                    continue
-                app_configs = [app_config]
-
-            apps = provider_to_apps.setdefault(p, [])
-            for config in app_configs:
-                app = SocialApp(provider=p)
-                for field in [
-                    "name",
-                    "provider_id",
-                    "client_id",
-                    "secret",
-                    "key",
-                    "settings",
-                ]:
-                    if field in config:
-                        setattr(app, field, config[field])
-                if "certificate_key" in config:
-                    warnings.warn("'certificate_key' should be moved into app.settings")
-                    app.settings["certificate_key"] = config["certificate_key"]
-                if client_id and app.client_id != client_id:
-                    continue
-                if (
-                    provider
-                    and app.provider_id != provider
-                    and app.provider != provider
-                ):
-                    continue
-                apps.append(app)
-
-        # Flatten the list of apps.
-        apps = []
-        for provider_apps in provider_to_apps.values():
-            apps.extend(provider_apps)
-        return apps
+        return appkit.list_apps(request, provider=provider, client_id=client_id)
 
     def get_app(self, request, provider, client_id=None):
         from allauth.socialaccount.models import SocialApp
@@ -305,13 +248,14 @@ class DefaultSocialAccountAdapter(BaseAdapter):
         return get_account_adapter().send_notification_mail(*args, **kwargs)
 
     def get_requests_session(self):
-        import requests
+        """
+        Returns the ``requests`` session used to perform upstream requests.
+        Note that the session is shared, so do not alter its state (headers,
+        authentication, ...) -- pass these per request instead.
+        """
+        from allauth.socialaccount.internal import requestskit
 
-        session = requests.Session()
-        session.request = functools.partial(
-            session.request, timeout=app_settings.REQUESTS_TIMEOUT
-        )
-        return session
+        return requestskit.get_session()
 
     def is_email_verified(self, provider, email):
         """
@@ -372,4 +316,4 @@ class DefaultSocialAccountAdapter(BaseAdapter):
 
 
 def get_adapter(request=None):
-    return import_attribute(app_settings.ADAPTER)(request)
+    return resolve_adapter(app_settings.ADAPTER, request)
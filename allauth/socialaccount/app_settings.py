@@ -1,3 +1,6 @@
+from allauth.core.internal.settingskit import SettingsSnapshot
+
+
 class AppSettings:
     def __init__(self, prefix):
         self.prefix = prefix
@@ -150,14 +153,42 @@ class AppSettings:
     def REQUESTS_TIMEOUT(self):
         return self._setting("REQUESTS_TIMEOUT", 5)
 
+    @property
+    def REQUESTS_POOL_MAXSIZE(self):
+        return self._setting("REQUESTS_POOL_MAXSIZE", 10)
+
+    @property
+    def REQUESTS_MAX_RETRIES(self):
+        return self._setting("REQUESTS_MAX_RETRIES", 0)
+
     @property
     def OPENID_CONNECT_URL_PREFIX(self):
         return self._setting("OPENID_CONNECT_URL_PREFIX", "oidc")
 
+    @property
+    def LAZY_PROVIDERS(self):
+        return self._setting("LAZY_PROVIDERS", False)
+
+    @property
+    def ASYNC_CALLBACKS(self):
+        return self._setting("ASYNC_CALLBACKS", False)
+
+    @property
+    def OPENID_CONNECT_DISCOVERY_MAX_AGE(self):
+        return self._setting("OPENID_CONNECT_DISCOVERY_MAX_AGE", 60 * 60)
+
+    @property
+    def STATE_BACKEND(self):
+        return self._setting(
+            "STATE_BACKEND",
+            "allauth.socialaccount.internal.statekit.SessionStateBackend",
+        )
+
 
 _app_settings = AppSettings("SOCIALACCOUNT_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
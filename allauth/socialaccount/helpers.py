@@ -2,6 +2,8 @@ from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 
+from asgiref.sync import sync_to_async
+
 from allauth import app_settings as allauth_settings
 from allauth.account import app_settings as account_settings
 from allauth.account.utils import user_display
@@ -67,6 +69,16 @@ def complete_social_login(request, sociallogin):
     return flows.login.complete_login(request, sociallogin)
 
 
+async def acomplete_social_login(request, sociallogin):
+    """
+    Async counterpart of ``complete_social_login()``. Only the account lookup
+    is performed natively async, the remainder of the login flow (session,
+    messages, signup) is run in a thread.
+    """
+    await sociallogin.alookup()
+    return await sync_to_async(complete_social_login)(request, sociallogin)
+
+
 def socialaccount_user_display(socialaccount):
     func = app_settings.SOCIALACCOUNT_STR
     if not func:
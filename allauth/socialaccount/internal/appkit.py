@@ -0,0 +1,190 @@
+"""
+Apps are looked up multiple times per request (resolving providers, rendering
+the list of providers, and so on). Instead of querying the database each time,
+the apps are loaded into a registry per site, indexed by provider and client ID.
+The registry is invalidated whenever an app is saved, deleted, or its sites
+change. As these signals are only received by the process that made the change,
+registries are also refreshed after ``MAX_AGE`` seconds.
+
+Registries hold plain row values rather than model instances, so that each
+lookup hands out fresh instances that callers are free to alter.
+"""
+
+import copy
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from allauth import app_settings as allauth_settings
+from allauth.core.internal import settingskit
+from allauth.socialaccount import app_settings
+from allauth.socialaccount.models import SocialApp
+
+
+MAX_AGE = 60
+
+_registries: Dict[Optional[int], "AppRegistry"] = {}
+_settings_apps: Optional[List[Tuple[str, dict]]] = None
+_generation = 0
+_lock = threading.Lock()
+
+
+@dataclass
+class AppRegistry:
+    db: str
+    field_names: List[str]
+    rows: List[tuple]
+    by_provider: Dict[str, List[int]] = field(default_factory=dict)
+    by_client_id: Dict[str, List[int]] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def load(cls, request) -> "AppRegistry":
+        if request:
+            qs = SocialApp.objects.on_site(request)
+        else:
+            qs = SocialApp.objects.all()
+        field_names = [f.attname for f in SocialApp._meta.concrete_fields]
+        registry = cls(db=qs.db, field_names=field_names, rows=[])
+        provider_idx = field_names.index("provider")
+        provider_id_idx = field_names.index("provider_id")
+        client_id_idx = field_names.index("client_id")
+        for idx, row in enumerate(qs.values_list(*field_names)):
+            registry.rows.append(row)
+            for provider in {row[provider_idx], row[provider_id_idx]}:
+                registry.by_provider.setdefault(provider, []).append(idx)
+            registry.by_client_id.setdefault(row[client_id_idx], []).append(idx)
+        return registry
+
+    def is_expired(self) -> bool:
+        return time.time() >= self.created_at + MAX_AGE
+
+    def list_apps(
+        self, provider: Optional[str] = None, client_id: Optional[str] = None
+    ) -> List[SocialApp]:
+        indices = range(len(self.rows))
+        if provider:
+            indices = self.by_provider.get(provider, [])
+        if client_id:
+            client_id_indices = self.by_client_id.get(client_id, [])
+            indices = [idx for idx in indices if idx in client_id_indices]
+        return [
+            SocialApp.from_db(self.db, self.field_names, copy.deepcopy(self.rows[idx]))
+            for idx in indices
+        ]
+
+
+def _get_site_id(request) -> Optional[int]:
+    if request and allauth_settings.SITES_ENABLED:
+        return get_current_site(request).id
+    # Without a request, all apps are listed. The same goes when sites are
+    # disabled, in which case `on_site()` returns all apps as well.
+    return None
+
+
+def get_registry(request) -> AppRegistry:
+    site_id = _get_site_id(request)
+    registry = _registries.get(site_id)
+    if registry is None or registry.is_expired():
+        generation = _generation
+        registry = AppRegistry.load(request)
+        with _lock:
+            # Do not store the registry if apps changed while loading.
+            if generation == _generation:
+                _registries[site_id] = registry
+    return registry
+
+
+def _get_settings_apps() -> List[Tuple[str, dict]]:
+    global _settings_apps
+    settings_apps = _settings_apps
+    if settings_apps is not None:
+        return settings_apps
+    settings_apps = []
+    for provider, pcfg in app_settings.PROVIDERS.items():
+        app_configs = pcfg.get("APPS")
+        if app_configs is None:
+            app_config = pcfg.get("APP")
+            if app_config is None:
+                continue
+            app_configs = [app_config]
+        for config in app_configs:
+            fields = {"provider": provider}
+            for name in [
+                "name",
+                "provider_id",
+                "client_id",
+                "secret",
+                "key",
+                "settings",
+            ]:
+                if name in config:
+                    fields[name] = config[name]
+            if "certificate_key" in config:
+                warnings.warn("'certificate_key' should be moved into app.settings")
+                fields["settings"] = dict(fields.get("settings", {}))
+                fields["settings"]["certificate_key"] = config["certificate_key"]
+            settings_apps.append((provider, fields))
+    if settingskit.is_snapshot_enabled():
+        _settings_apps = settings_apps
+    return settings_apps
+
+
+def list_apps(
+    request, provider: Optional[str] = None, client_id: Optional[str] = None
+) -> List[SocialApp]:
+    # Map provider to the list of apps.
+    provider_to_apps: Dict[str, List[SocialApp]] = {}
+
+    # First, populate it with the DB backed apps.
+    for app in get_registry(request).list_apps(provider=provider, client_id=client_id):
+        provider_to_apps.setdefault(app.provider, []).append(app)
+
+    # Then, extend it with the settings backed apps.
+    for p, fields in _get_settings_apps():
+        apps = provider_to_apps.setdefault(p, [])
+        app = SocialApp(**copy.deepcopy(fields))
+        if client_id and app.client_id != client_id:
+            continue
+        if provider and app.provider_id != provider and app.provider != provider:
+            continue
+        apps.append(app)
+
+    # Flatten the list of apps.
+    apps = []
+    for provider_apps in provider_to_apps.values():
+        apps.extend(provider_apps)
+    return apps
+
+
+def clear_registries() -> None:
+    global _settings_apps, _generation
+    with _lock:
+        _registries.clear()
+        _settings_apps = None
+        _generation += 1
+
+
+def _on_app_changed(using, **kwargs) -> None:
+    clear_registries()
+    # Registries may have been reloaded before the change was committed.
+    transaction.on_commit(clear_registries, using=using)
+
+
+@receiver(setting_changed)
+def _on_setting_changed(**kwargs) -> None:
+    clear_registries()
+
+
+post_save.connect(_on_app_changed, sender=SocialApp)
+post_delete.connect(_on_app_changed, sender=SocialApp)
+if allauth_settings.SITES_ENABLED:
+    m2m_changed.connect(_on_app_changed, sender=SocialApp.sites.through)
@@ -0,0 +1,110 @@
+"""
+OpenID Connect discovery documents rarely change, yet are needed on both login
+and callback. Documents are therefore cached per server URL, in process as well
+as in the Django cache, for ``SOCIALACCOUNT_OPENID_CONNECT_DISCOVERY_MAX_AGE``
+seconds. Past that age, a document is still served for the same duration while
+it is refreshed in the background, so that requests do not have to wait for the
+provider in the steady state. If refreshing fails, it is not retried for
+``DISCOVERY_RETRY_INTERVAL`` seconds.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.core.cache import cache
+
+from allauth.socialaccount import app_settings
+from allauth.socialaccount.adapter import get_adapter
+
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_RETRY_INTERVAL = 60
+
+_documents: Dict[str, "Document"] = {}
+_refreshing: Dict[str, threading.Thread] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class Document:
+    config: dict
+    fetched_at: float
+    # When refreshing the document last failed.
+    failed_at: float = 0.0
+
+    def get_age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_retry_due(self) -> bool:
+        return time.time() - self.failed_at >= DISCOVERY_RETRY_INTERVAL
+
+
+def _get_cache_key(server_url: str) -> str:
+    return "oidc-discovery:" + hashlib.sha256(server_url.encode("utf8")).hexdigest()
+
+
+def _fetch_document(server_url: str) -> Document:
+    resp = get_adapter().get_requests_session().get(server_url)
+    resp.raise_for_status()
+    document = Document(config=resp.json(), fetched_at=time.time())
+    max_age = app_settings.OPENID_CONNECT_DISCOVERY_MAX_AGE
+    cache.set(
+        _get_cache_key(server_url),
+        {"config": document.config, "fetched_at": document.fetched_at},
+        timeout=2 * max_age,
+    )
+    _documents[server_url] = document
+    return document
+
+
+def _refresh_document(server_url: str) -> None:
+    try:
+        _fetch_document(server_url)
+    except Exception:
+        logger.exception("Unable to refresh discovery document %s", server_url)
+        document = _documents.get(server_url)
+        if document is not None:
+            document.failed_at = time.time()
+    finally:
+        with _lock:
+            _refreshing.pop(server_url, None)
+
+
+def _refresh_in_background(server_url: str) -> Optional[threading.Thread]:
+    with _lock:
+        if server_url in _refreshing:
+            return None
+        thread = threading.Thread(
+            target=_refresh_document, args=(server_url,), daemon=True
+        )
+        _refreshing[server_url] = thread
+    thread.start()
+    return thread
+
+
+def _get_cached_document(server_url: str) -> Optional[Document]:
+    document = _documents.get(server_url)
+    if document is None:
+        cached = cache.get(_get_cache_key(server_url))
+        if cached is not None:
+            document = _documents[server_url] = Document(**cached)
+    return document
+
+
+def get_openid_configuration(server_url: str) -> dict:
+    max_age = app_settings.OPENID_CONNECT_DISCOVERY_MAX_AGE
+    document = _get_cached_document(server_url)
+    if document is None or document.get_age() >= 2 * max_age:
+        document = _fetch_document(server_url)
+    elif document.get_age() >= max_age and document.is_retry_due():
+        _refresh_in_background(server_url)
+    return document.config
+
+
+def clear_documents() -> None:
+    _documents.clear()
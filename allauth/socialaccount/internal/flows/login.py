@@ -30,8 +30,10 @@ def _login(request, sociallogin):
 
 def pre_social_login(request, sociallogin):
     clear_pending_signup(request)
-    assert not sociallogin.is_existing  # nosec
-    sociallogin.lookup()
+    if not sociallogin._did_lookup:
+        # Async callbacks look up the account up front, see `alookup()`.
+        assert not sociallogin.is_existing  # nosec
+        sociallogin.lookup()
     get_adapter().pre_social_login(request, sociallogin)
     signals.pre_social_login.send(
         sender=SocialLogin, request=request, sociallogin=sociallogin
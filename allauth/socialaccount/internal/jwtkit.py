@@ -1,7 +1,25 @@
+"""
+Keys used to verify ID tokens are cached, both in process (as parsed public key
+objects) and in the Django cache (as raw key data), for as long as the provider
+allows (``Cache-Control: max-age``). The keys are refetched when they expire, or
+when a token refers to a key ID (``kid``) that is unknown, e.g. due to key
+rotation. The latter is limited to once per ``KEYS_MIN_REFRESH_INTERVAL``.
+Concurrent refetches of the same key set are coalesced. If refetching fails,
+the previous keys remain in use for up to ``KEYS_MAX_STALE`` seconds.
+"""
+
+import hashlib
 import json
+import logging
+import requests
+import threading
 import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 import jwt
 from cryptography.hazmat.backends import default_backend
@@ -11,6 +29,43 @@ from allauth.socialaccount.adapter import get_adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Error
 
 
+logger = logging.getLogger(__name__)
+
+KEYS_DEFAULT_MAX_AGE = 60 * 60
+KEYS_MAX_MAX_AGE = 24 * 60 * 60
+KEYS_MAX_STALE = 24 * 60 * 60
+KEYS_MIN_REFRESH_INTERVAL = 60
+
+_key_sets: Dict[str, "KeySet"] = {}
+_key_set_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class KeySet:
+    data: dict
+    fetched_at: float
+    expires_at: float
+    public_keys: Dict[Tuple[Callable, str], Any] = field(default_factory=dict)
+
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def is_usable(self) -> bool:
+        return time.time() < self.expires_at + KEYS_MAX_STALE
+
+    def may_refresh(self) -> bool:
+        return time.time() >= self.fetched_at + KEYS_MIN_REFRESH_INTERVAL
+
+    def lookup(self, lookup: Callable, kid: str):
+        public_key = self.public_keys.get((lookup, kid))
+        if public_key is None:
+            public_key = lookup(self.data, kid)
+            if public_key:
+                self.public_keys[(lookup, kid)] = public_key
+        return public_key
+
+
 def lookup_kid_pem_x509_certificate(keys_data, kid):
     """
     Looks up the key given keys data of the form:
@@ -47,20 +102,110 @@ def lookup_kid_jwk(keys_data, kid):
             return public_key
 
 
+def get_max_age(response) -> int:
+    directives = {}
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    try:
+        max_age = int(directives["max-age"])
+    except (KeyError, ValueError):
+        return KEYS_DEFAULT_MAX_AGE
+    return max(0, min(max_age, KEYS_MAX_MAX_AGE))
+
+
+def _get_cache_key(keys_url: str) -> str:
+    return "jwks:" + hashlib.sha256(keys_url.encode("utf8")).hexdigest()
+
+
+def _fetch_key_set(keys_url: str) -> KeySet:
+    response = get_adapter().get_requests_session().get(keys_url)
+    response.raise_for_status()
+    now = time.time()
+    key_set = KeySet(
+        data=response.json(),
+        fetched_at=now,
+        expires_at=now + get_max_age(response),
+    )
+    cache.set(
+        _get_cache_key(keys_url),
+        {
+            "data": key_set.data,
+            "fetched_at": key_set.fetched_at,
+            "expires_at": key_set.expires_at,
+        },
+        timeout=key_set.expires_at + KEYS_MAX_STALE - now,
+    )
+    return key_set
+
+
+def _load_key_set(keys_url: str, current: Optional[KeySet]) -> KeySet:
+    """
+    Returns a key set that is more recent than ``current``, taken from the
+    Django cache or fetched from the provider.
+    """
+    with _lock:
+        lock = _key_set_locks.setdefault(keys_url, threading.Lock())
+    with lock:
+        key_set = _key_sets.get(keys_url)
+        if key_set is not None and key_set is not current:
+            # Loaded by another thread while we were waiting for the lock.
+            return key_set
+        fallback = current
+        cached = cache.get(_get_cache_key(keys_url))
+        if cached is not None:
+            cached_key_set = KeySet(**cached)
+            # Only of use in case another process fetched different keys.
+            if current is None or cached_key_set.data != current.data:
+                fallback = cached_key_set
+                if not cached_key_set.is_expired():
+                    _key_sets[keys_url] = cached_key_set
+                    return cached_key_set
+        try:
+            key_set = _fetch_key_set(keys_url)
+        except (requests.RequestException, ValueError):
+            if fallback is None or not fallback.is_usable():
+                raise
+            logger.warning("Unable to refresh keys from %s", keys_url, exc_info=True)
+            key_set = fallback
+            # Give the provider some time to recover before retrying.
+            key_set.fetched_at = time.time()
+        _key_sets[keys_url] = key_set
+        return key_set
+
+
 def fetch_key(credential, keys_url, lookup):
     header = jwt.get_unverified_header(credential)
     # {'alg': 'RS256', 'kid': '0ad1fec78504f447bae65bcf5afaedb65eec9e81', 'typ': 'JWT'}
     kid = header["kid"]
     alg = header["alg"]
-    response = get_adapter().get_requests_session().get(keys_url)
-    response.raise_for_status()
-    keys_data = response.json()
-    key = lookup(keys_data, kid)
+    key_set = _key_sets.get(keys_url)
+    if key_set is None or not key_set.is_usable():
+        key_set = _load_key_set(keys_url, key_set)
+    elif key_set.is_expired() and key_set.may_refresh():
+        key_set = _load_key_set(keys_url, key_set)
+    key = key_set.lookup(lookup, kid)
+    if not key and key_set.may_refresh():
+        # Unknown key, possibly due to key rotation.
+        key_set = _load_key_set(keys_url, key_set)
+        key = key_set.lookup(lookup, kid)
     if not key:
         raise OAuth2Error(f"Invalid 'kid': '{kid}'")
     return alg, key
 
 
+def clear_keys() -> None:
+    _key_sets.clear()
+
+
+@receiver(setting_changed)
+def _clear_keys(setting, **kwargs):
+    if setting == "CACHES":
+        clear_keys()
+
+
 def verify_jti(data: dict) -> None:
     """
     Put the JWT token on a blacklist to prevent replay attacks.
@@ -0,0 +1,113 @@
+"""
+Requests to providers are performed using a ``requests`` session per thread.
+These sessions all share the same connection pool, so that connections (and
+their TLS handshakes) are reused across requests, threads, and providers that
+live on the same host.
+
+As the sessions outlive the request they are used in, cookies are never stored.
+
+Async code performs its requests using ``arequest()``, which runs the blocking
+request in a worker thread, leaving the event loop (and Django's thread for
+sync code) free in the meantime.
+"""
+
+import requests
+import threading
+from contextlib import contextmanager
+from http import cookiejar
+from requests.adapters import BaseAdapter, HTTPAdapter
+from typing import Iterator, Optional
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from asgiref.sync import sync_to_async
+from urllib3.util.retry import Retry
+
+from allauth.socialaccount import app_settings
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_http_adapter: Optional[BaseAdapter] = None
+_generation = 0
+
+
+class _RejectCookiesPolicy(cookiejar.DefaultCookiePolicy):
+    def set_ok(self, cookie, request):
+        return False
+
+
+class Session(requests.Session):
+    def __init__(self, http_adapter: BaseAdapter):
+        super().__init__()
+        self.cookies.set_policy(_RejectCookiesPolicy())
+        self.mount("https://", http_adapter)
+        self.mount("http://", http_adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", app_settings.REQUESTS_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+def _create_http_adapter() -> BaseAdapter:
+    return HTTPAdapter(
+        pool_maxsize=app_settings.REQUESTS_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=app_settings.REQUESTS_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+
+
+def _set_http_adapter(http_adapter: Optional[BaseAdapter]) -> Optional[BaseAdapter]:
+    global _http_adapter, _generation
+    with _lock:
+        old_http_adapter = _http_adapter
+        _http_adapter = http_adapter
+        _generation += 1
+    return old_http_adapter
+
+
+def get_session() -> requests.Session:
+    global _http_adapter
+    session = getattr(_local, "session", None)
+    if session is not None and _local.generation == _generation:
+        return session
+    with _lock:
+        if _http_adapter is None:
+            _http_adapter = _create_http_adapter()
+        session = Session(_http_adapter)
+        _local.session = session
+        _local.generation = _generation
+    return session
+
+
+async def arequest(method: str, url: str, **kwargs) -> requests.Response:
+    from allauth.socialaccount.adapter import get_adapter
+
+    def request():
+        return get_adapter().get_requests_session().request(method, url, **kwargs)
+
+    return await sync_to_async(request, thread_sensitive=False)()
+
+
+@contextmanager
+def override_http_adapter(http_adapter: BaseAdapter) -> Iterator[None]:
+    """
+    Routes all requests to providers through the given transport adapter, for
+    example, a stand-in for a provider in tests.
+    """
+    old_http_adapter = _set_http_adapter(http_adapter)
+    try:
+        yield
+    finally:
+        _set_http_adapter(old_http_adapter)
+
+
+@receiver(setting_changed)
+def _reset_http_adapter(setting, **kwargs):
+    if setting.startswith("SOCIALACCOUNT_REQUESTS_"):
+        _set_http_adapter(None)
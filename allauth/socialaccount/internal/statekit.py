@@ -1,7 +1,27 @@
+"""
+Provider state (``process``, ``next`` URL, PKCE verifier, and so on) is stashed
+when redirecting to the provider, and unstashed once the provider redirects
+back. Where the state is stored is up to the configured state backend
+(``SOCIALACCOUNT_STATE_BACKEND``):
+
+- ``SessionStateBackend`` (default) keeps the last ``MAX_STATES`` states in the
+  session, meaning every redirect to the provider results in a session write.
+
+- ``CacheStateBackend`` stores each state in the Django cache, keyed by its ID,
+  expiring after ``timeout`` seconds. A state can only be unstashed once, and
+  only by the browser session that stashed it. The session is only written to
+  once, to store the (random) value binding the states to the session.
+"""
+
+import secrets
 import time
 from typing import Any, Dict, Optional, Tuple
 
+from django.core.cache import cache
+
+from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
+from allauth.utils import import_attribute
 
 
 STATE_ID_LENGTH = 16
@@ -40,30 +60,113 @@ def get_states(request) -> Dict[str, Tuple[Dict[str, Any], float]]:
     return states
 
 
+class StateBackend:
+    def stash(self, request, state_id: str, state: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def unstash(self, request, state_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the state stashed under the given ID, if any, removing it so
+        that it cannot be used again.
+        """
+        raise NotImplementedError
+
+    def unstash_last(self, request) -> Optional[Dict[str, Any]]:
+        """
+        Returns (and removes) the state that was stashed last. Used for
+        providers that do not pass along a state parameter.
+        """
+        raise NotImplementedError
+
+
+class SessionStateBackend(StateBackend):
+    def stash(self, request, state_id: str, state: Dict[str, Any]) -> None:
+        states = get_states(request)
+        gc_states(states)
+        states[state_id] = (state, time.time())
+        request.session[STATES_SESSION_KEY] = states
+
+    def unstash(self, request, state_id: str) -> Optional[Dict[str, Any]]:
+        state: Optional[Dict[str, Any]] = None
+        states = get_states(request)
+        state_ts = states.get(state_id)
+        if state_ts is not None:
+            state = state_ts[0]
+            del states[state_id]
+            request.session[STATES_SESSION_KEY] = states
+        return state
+
+    def unstash_last(self, request) -> Optional[Dict[str, Any]]:
+        states = get_states(request)
+        state_id, state = get_oldest_state(states, rev=True)
+        if state_id:
+            self.unstash(request, state_id)
+        return state
+
+
+class CacheStateBackend(StateBackend):
+    timeout = 60 * 60
+    key_prefix = "socialaccount-state:"
+    last_key_prefix = "socialaccount-last-state:"
+    binding_session_key = "socialaccount_state_binding"
+
+    def get_binding(self, request) -> str:
+        binding = request.session.get(self.binding_session_key)
+        if not binding:
+            binding = secrets.token_urlsafe(16)
+            request.session[self.binding_session_key] = binding
+        return binding
+
+    def stash(self, request, state_id: str, state: Dict[str, Any]) -> None:
+        binding = self.get_binding(request)
+        cache.set_many(
+            {
+                self.key_prefix + state_id: (binding, state),
+                self.last_key_prefix + binding: state_id,
+            },
+            timeout=self.timeout,
+        )
+
+    def unstash(self, request, state_id: str) -> Optional[Dict[str, Any]]:
+        binding = request.session.get(self.binding_session_key)
+        if not binding:
+            return None
+        key = self.key_prefix + state_id
+        value = cache.get(key)
+        if value is None:
+            return None
+        state_binding, state = value
+        # A state stashed by another session is left alone, and the state is
+        # only handed out to the request that managed to delete it.
+        if state_binding != binding or not cache.delete(key):
+            return None
+        return state
+
+    def unstash_last(self, request) -> Optional[Dict[str, Any]]:
+        binding = request.session.get(self.binding_session_key)
+        if not binding:
+            return None
+        state_id = cache.get(self.last_key_prefix + binding)
+        if not state_id:
+            return None
+        cache.delete(self.last_key_prefix + binding)
+        return self.unstash(request, state_id)
+
+
+def get_backend() -> StateBackend:
+    return import_attribute(app_settings.STATE_BACKEND)()
+
+
 def stash_state(request, state: Dict[str, Any], state_id: Optional[str] = None) -> str:
-    states = get_states(request)
-    gc_states(states)
     if state_id is None:
         state_id = get_adapter().generate_state_param(state)
-    states[state_id] = (state, time.time())
-    request.session[STATES_SESSION_KEY] = states
+    get_backend().stash(request, state_id, state)
     return state_id
 
 
 def unstash_state(request, state_id: str) -> Optional[Dict[str, Any]]:
-    state: Optional[Dict[str, Any]] = None
-    states = get_states(request)
-    state_ts = states.get(state_id)
-    if state_ts is not None:
-        state = state_ts[0]
-        del states[state_id]
-        request.session[STATES_SESSION_KEY] = states
-    return state
+    return get_backend().unstash(request, state_id)
 
 
 def unstash_last_state(request) -> Optional[Dict[str, Any]]:
-    states = get_states(request)
-    state_id, state = get_oldest_state(states, rev=True)
-    if state_id:
-        unstash_state(request, state_id)
-    return state
+    return get_backend().unstash_last(request)
@@ -0,0 +1,180 @@
+"""
+Refreshing of stored (OAuth2) access tokens that are about to expire, using
+their refresh token (``SocialToken.token_secret``).
+
+Tokens are streamed in batches, ordered by primary key, and refreshed
+concurrently by a bounded pool of worker threads. Before refreshing a token, a
+worker claims it for ``CLAIM_TIMEOUT`` seconds (``refresh_claimed_until``),
+using a single conditional ``UPDATE``, so that two workers (threads or
+processes) never refresh the same token: with refresh token rotation, the
+second refresh would fail as the refresh token was already used. This works on
+all database backends, and no transaction or lock is held while the provider
+is being contacted. The refreshed token is only stored if the claim is still
+held, which is the case unless the refresh took longer than ``CLAIM_TIMEOUT``.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterator, List, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from allauth.socialaccount.models import SocialToken
+from allauth.socialaccount.providers.oauth2.provider import OAuth2Provider
+
+
+logger = logging.getLogger(__name__)
+
+# Claimed tokens are left alone by other workers for this number of seconds.
+# This is to exceed the time it takes to refresh a token (see
+# `SOCIALACCOUNT_REQUESTS_TIMEOUT`).
+CLAIM_TIMEOUT = 5 * 60
+
+
+@dataclass
+class RefreshResult:
+    refreshed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def get_expiring_tokens(within: timedelta):
+    return SocialToken.objects.filter(
+        expires_at__lte=timezone.now() + within,
+    ).exclude(token_secret="")
+
+
+def iter_expiring_token_ids(within: timedelta, batch_size: int) -> Iterator[List[int]]:
+    """
+    Yields the IDs of the tokens expiring within the given time, in batches.
+    Paginates by primary key, so that tokens refreshed in the meantime do not
+    shift the batches.
+    """
+    last_id = None
+    while True:
+        qs = get_expiring_tokens(within).order_by("pk")
+        if last_id is not None:
+            qs = qs.filter(pk__gt=last_id)
+        ids = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def claim_token(token_id: int, within: timedelta) -> Optional[SocialToken]:
+    """
+    Claims the token for ``CLAIM_TIMEOUT`` seconds. Returns ``None`` in case the
+    token is claimed by another worker, or, was refreshed already.
+    """
+    now = timezone.now()
+    claimed_until = now + timedelta(seconds=CLAIM_TIMEOUT)
+    claimed = (
+        get_expiring_tokens(within)
+        .filter(pk=token_id)
+        .filter(
+            Q(refresh_claimed_until__isnull=True) | Q(refresh_claimed_until__lte=now)
+        )
+        .update(refresh_claimed_until=claimed_until)
+    )
+    if not claimed:
+        return None
+    return SocialToken.objects.select_related("account", "app").get(pk=token_id)
+
+
+def release_token(token: SocialToken) -> None:
+    SocialToken.objects.filter(
+        pk=token.pk, refresh_claimed_until=token.refresh_claimed_until
+    ).update(refresh_claimed_until=None)
+
+
+def refresh_token(token: SocialToken, request=None) -> SocialToken:
+    """
+    Refreshes the given token (without saving it), using the OAuth2 adapter of
+    its provider.
+    """
+    provider = token.account.get_provider(request)
+    if not isinstance(provider, OAuth2Provider):
+        raise ValueError(f"Provider {provider.id} does not support refreshing tokens")
+    adapter = provider.get_oauth2_adapter(request)
+    return adapter.refresh_token(token.app or provider.app, token)
+
+
+def refresh_expiring_token(token_id: int, within: timedelta, request=None) -> bool:
+    """
+    Refreshes the token, unless another worker is already doing so. Returns
+    whether or not the token was refreshed.
+    """
+    token = claim_token(token_id, within)
+    if token is None:
+        return False
+    try:
+        refresh_token(token, request=request)
+    except Exception:
+        release_token(token)
+        raise
+    stored = SocialToken.objects.filter(
+        pk=token.pk, refresh_claimed_until=token.refresh_claimed_until
+    ).update(
+        token=token.token,
+        token_secret=token.token_secret,
+        expires_at=token.expires_at,
+        refresh_claimed_until=None,
+    )
+    if not stored:
+        logger.warning("Token %s was claimed by another worker while refreshing", token.pk)
+    return bool(stored)
+
+
+def _refresh_worker(token_id: int, within: timedelta, request) -> Optional[bool]:
+    try:
+        return refresh_expiring_token(token_id, within, request=request)
+    except Exception:
+        logger.exception("Unable to refresh token %s", token_id)
+        return None
+
+
+def _refresh_worker_thread(token_id: int, within: timedelta, request) -> Optional[bool]:
+    try:
+        return _refresh_worker(token_id, within, request)
+    finally:
+        # Worker threads have their own database connection.
+        connection.close()
+
+
+def refresh_expiring_tokens(
+    within: timedelta = timedelta(minutes=5),
+    batch_size: int = 100,
+    max_workers: int = 4,
+    request=None,
+) -> RefreshResult:
+    result = RefreshResult()
+
+    def record(outcome: Optional[bool]) -> None:
+        if outcome is None:
+            result.failed += 1
+        elif outcome:
+            result.refreshed += 1
+        else:
+            result.skipped += 1
+
+    if max_workers <= 1:
+        for ids in iter_expiring_token_ids(within, batch_size):
+            for token_id in ids:
+                record(_refresh_worker(token_id, within, request))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for ids in iter_expiring_token_ids(within, batch_size):
+            # Wait for the batch to complete before fetching the next, keeping
+            # the number of pending refreshes bounded.
+            for outcome in executor.map(
+                lambda token_id: _refresh_worker_thread(token_id, within, request),
+                ids,
+            ):
+                record(outcome)
+    return result
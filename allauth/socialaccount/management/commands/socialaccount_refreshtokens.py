@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from allauth.socialaccount.internal import tokenkit
+
+
+class Command(BaseCommand):
+    help = "Refreshes the stored access tokens that are about to expire."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--within",
+            type=int,
+            default=300,
+            help="Refresh tokens expiring within this number of seconds.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="The number of tokens refreshed concurrently.",
+        )
+
+    def handle(self, *args, **options):
+        result = tokenkit.refresh_expiring_tokens(
+            within=timedelta(seconds=options["within"]),
+            batch_size=options["batch_size"],
+            max_workers=options["workers"],
+        )
+        self.stdout.write(
+            f"Refreshed: {result.refreshed}, skipped: {result.skipped},"
+            f" failed: {result.failed}"
+        )
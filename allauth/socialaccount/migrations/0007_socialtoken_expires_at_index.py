@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("socialaccount", "0006_alter_socialaccount_extra_data"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="socialtoken",
+            index=models.Index(
+                fields=["expires_at"], name="socialaccou_expires_cc058b_idx"
+            ),
+        ),
+    ]
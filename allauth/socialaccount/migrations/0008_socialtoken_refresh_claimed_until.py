@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("socialaccount", "0007_socialtoken_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="socialtoken",
+            name="refresh_claimed_until",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -5,8 +5,11 @@ from django.contrib.auth import authenticate, get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from asgiref.sync import sync_to_async
+
 import allauth.app_settings
 from allauth import app_settings as allauth_settings
 from allauth.account.adapter import get_adapter as get_account_adapter
@@ -169,9 +172,12 @@ class SocialToken(models.Model):
     expires_at = models.DateTimeField(
         blank=True, null=True, verbose_name=_("expires at")
     )
+    # Set while the token is being refreshed, see `tokenkit`.
+    refresh_claimed_until = models.DateTimeField(blank=True, null=True, editable=False)
 
     class Meta:
         unique_together = ("app", "account")
+        indexes = [models.Index(fields=["expires_at"])]
         verbose_name = _("social application token")
         verbose_name_plural = _("social application tokens")
 
@@ -210,6 +216,7 @@ class SocialLogin:
     email_addresses: List[EmailAddress]
     state: Dict
     _did_authenticate_by_email: Optional[str]
+    _did_lookup: bool = False
     phone: Optional[str]
     phone_verified: bool
 
@@ -335,48 +342,112 @@ class SocialLogin:
         self._did_authenticate_by_email = None
         if not self._lookup_by_socialaccount():
             self._lookup_by_email()
+        self._did_lookup = True
+
+    async def alookup(self) -> None:
+        """Async counterpart of ``lookup()``. The account is looked up using
+        the async ORM, only the writes that follow are run in a thread.
+        """
+        self._did_authenticate_by_email = None
+        if not await self._alookup_by_socialaccount():
+            await sync_to_async(self._lookup_by_email)()
+        self._did_lookup = True
 
     def _lookup_by_socialaccount(self) -> bool:
         assert not self.is_existing  # nosec
-        try:
-            a = SocialAccount.objects.get(
-                provider=self.account.provider, uid=self.account.uid
+        a = self._get_socialaccount_queryset().first()
+        if a is None:
+            return False
+        self._update_socialaccount(a)
+        return True
+
+    async def _alookup_by_socialaccount(self) -> bool:
+        # See `is_existing`, which queries synchronously.
+        if self.user.pk is not None:
+            user_exists = (
+                await get_user_model().objects.filter(pk=self.user.pk).aexists()
+            )
+            assert not user_exists  # nosec
+        a = await self._get_socialaccount_queryset().afirst()
+        if a is None:
+            return False
+        await sync_to_async(self._update_socialaccount)(a)
+        return True
+
+    def _get_socialaccount_queryset(self):
+        qs = SocialAccount.objects.select_related("user").filter(
+            provider=self.account.provider, uid=self.account.uid
+        )
+        if app_settings.STORE_TOKENS and self.token:
+            # Fetch the existing token (if any) along with the account.
+            tokens = SocialToken.objects.filter(
+                account=models.OuterRef("pk"), app=self._get_token_app()
+            )
+            qs = qs.annotate(
+                existing_token_id=models.Subquery(tokens.values("pk")[:1]),
+                existing_token_secret=models.Subquery(
+                    tokens.values("token_secret")[:1]
+                ),
             )
-            # Update account
+        return qs
+
+    def _update_socialaccount(self, a: SocialAccount) -> None:
+        # Update account
+        if a.extra_data == self.account.extra_data:
+            # Avoid rewriting the complete row, only `last_login` changed.
+            a.last_login = timezone.now()
+            SocialAccount.objects.filter(pk=a.pk).update(last_login=a.last_login)
+        else:
             a.extra_data = self.account.extra_data
-            self.account = a
-            self.user = self.account.user
             a.save()
-            signals.social_account_updated.send(
-                sender=SocialLogin, request=context.request, sociallogin=self
+        self.account = a
+        self.user = self.account.user
+        signals.social_account_updated.send(
+            sender=SocialLogin, request=context.request, sociallogin=self
+        )
+        if app_settings.STORE_TOKENS and self.token:
+            self._store_token(
+                existing_token_id=a.existing_token_id,
+                existing_token_secret=a.existing_token_secret,
             )
-            self._store_token()
-            return True
-        except SocialAccount.DoesNotExist:
-            return False
 
-    def _store_token(self) -> None:
+    def _get_token_app(self) -> Optional[SocialApp]:
+        app = self.token.app if self.token else None
+        if app and not app.pk:
+            # If the app is not stored in the db, leave the FK empty.
+            app = None
+        return app
+
+    def _store_token(
+        self,
+        existing_token_id: Optional[int] = None,
+        existing_token_secret: Optional[str] = None,
+    ) -> None:
         # Update token
         if not app_settings.STORE_TOKENS or not self.token:
             return
         assert not self.token.pk  # nosec
-        app = self.token.app
-        if app and not app.pk:
-            # If the app is not stored in the db, leave the FK empty.
-            app = None
-        try:
-            t = SocialToken.objects.get(account=self.account, app=app)
-            t.token = self.token.token
-            if self.token.token_secret:
-                # only update the refresh token if we got one
-                # many oauth2 providers do not resend the refresh token
-                t.token_secret = self.token.token_secret
-            t.expires_at = self.token.expires_at
-            t.save()
-            self.token = t
-        except SocialToken.DoesNotExist:
-            self.token.account = self.account
-            self.token.app = app
+        self.token.account = self.account
+        self.token.app = self._get_token_app()
+        if existing_token_id is None:
+            self.token.save()
+            return
+        self.token.pk = existing_token_id
+        self.token._state.adding = False
+        self.token._state.db = SocialToken.objects.db
+        if not self.token.token_secret:
+            # only update the refresh token if we got one
+            # many oauth2 providers do not resend the refresh token
+            self.token.token_secret = existing_token_secret or ""
+        updated = SocialToken.objects.filter(pk=existing_token_id).update(
+            token=self.token.token,
+            token_secret=self.token.token_secret,
+            expires_at=self.token.expires_at,
+        )
+        if not updated:
+            # The token was deleted in the meantime.
+            self.token.pk = None
+            self.token._state.adding = True
             self.token.save()
 
     def _lookup_by_email(self) -> None:
@@ -1,5 +1,8 @@
 import importlib
+import threading
 from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
 
 from django.apps import apps
 from django.conf import settings
@@ -7,25 +10,109 @@ from django.conf import settings
 from allauth.utils import import_attribute
 
 
+@dataclass(frozen=True)
+class ProviderSpec:
+    """
+    What is known about a provider without importing its module.
+    """
+
+    package: str
+    id: str
+    name: str
+    slug: str
+    uses_apps: bool
+    # The kind of default URL patterns ("oauth", "oauth2") the provider uses,
+    # if any.
+    urls: Optional[str] = None
+
+    @classmethod
+    def from_class(cls, provider_class) -> "ProviderSpec":
+        return cls(
+            package=provider_class.get_package(),
+            id=provider_class.id,
+            name=provider_class.name,
+            slug=provider_class.get_slug(),
+            uses_apps=provider_class.uses_apps,
+        )
+
+    def get_package(self) -> str:
+        return self.package
+
+    def get_slug(self) -> str:
+        return self.slug
+
+
 class ProviderRegistry:
     def __init__(self):
         self.provider_map = OrderedDict()
+        # All providers, including the ones that are not imported yet.
+        self.spec_map = OrderedDict()
         self.loaded = False
+        self._lock = threading.Lock()
 
     def get_class_list(self):
         self.load()
-        return list(self.provider_map.values())
+        return [self.get_class(id) for id in self.spec_map]
+
+    def get_spec_list(self):
+        self.load()
+        return list(self.spec_map.values())
 
     def register(self, cls):
         self.provider_map[cls.id] = cls
+        spec = ProviderSpec.from_class(cls)
+        old_spec = self.spec_map.get(cls.id)
+        if old_spec is not None and old_spec.package == spec.package:
+            spec = replace(spec, urls=old_spec.urls)
+        self.spec_map[cls.id] = spec
 
     def get_class(self, id):
-        return self.provider_map.get(id)
+        cls = self.provider_map.get(id)
+        if cls is None:
+            spec = self.spec_map.get(id)
+            if spec is not None:
+                self._load_package(spec.package)
+                cls = self.provider_map.get(id)
+        return cls
+
+    def is_imported(self, id) -> bool:
+        return id in self.provider_map
 
     def as_choices(self):
         self.load()
-        for provider_cls in self.provider_map.values():
-            yield (provider_cls.id, provider_cls.name)
+        for spec in self.spec_map.values():
+            yield (spec.id, spec.name)
+
+    def _load_package(self, package):
+        module_name = package + ".provider"
+        provider_module = importlib.import_module(module_name)
+        provider_settings = getattr(settings, "SOCIALACCOUNT_PROVIDERS", {})
+        with self._lock:
+            for cls in getattr(provider_module, "provider_classes", []):
+                provider_class = provider_settings.get(cls.id, {}).get("provider_class")
+                if provider_class:
+                    cls = import_attribute(provider_class)
+                self.register(cls)
+
+    def _load_manifest(self, package) -> bool:
+        from allauth.socialaccount.providers.manifest import PROVIDERS
+
+        specs = PROVIDERS.get(package)
+        if specs is None:
+            return False
+        provider_settings = getattr(settings, "SOCIALACCOUNT_PROVIDERS", {})
+        if any(
+            provider_settings.get(spec["id"], {}).get("provider_class")
+            for spec in specs
+        ):
+            # The overriding provider class may deviate from the manifest.
+            return False
+        with self._lock:
+            for spec in specs:
+                self.spec_map.setdefault(
+                    spec["id"], ProviderSpec(package=package, **spec)
+                )
+        return True
 
     def load(self):
         # TODO: Providers register with the provider registry when
@@ -35,22 +122,17 @@ class ProviderRegistry:
         # mechanism is way to magical and depends on the import order et al, so
         # all of this really needs to be revisited.
         if not self.loaded:
+            from allauth.socialaccount import app_settings
+
+            lazy = app_settings.LAZY_PROVIDERS
             for app_config in apps.get_app_configs():
+                if lazy and self._load_manifest(app_config.name):
+                    continue
                 try:
-                    module_name = app_config.name + ".provider"
-                    provider_module = importlib.import_module(module_name)
+                    self._load_package(app_config.name)
                 except ImportError as e:
-                    if e.name != module_name:
+                    if e.name != app_config.name + ".provider":
                         raise
-                else:
-                    provider_settings = getattr(settings, "SOCIALACCOUNT_PROVIDERS", {})
-                    for cls in getattr(provider_module, "provider_classes", []):
-                        provider_class = provider_settings.get(cls.id, {}).get(
-                            "provider_class"
-                        )
-                        if provider_class:
-                            cls = import_attribute(provider_class)
-                        self.register(cls)
             self.loaded = True
 
 
@@ -1,7 +1,11 @@
 from django.shortcuts import render
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
 from allauth.account import app_settings as account_app_settings
+from allauth.account.internal.decorators import login_not_required
 from allauth.socialaccount import app_settings
+from allauth.utils import import_attribute
 
 
 def respond_to_login_on_get(request, provider):
@@ -14,3 +18,42 @@ def respond_to_login_on_get(request, provider):
                 "process": request.GET.get("process"),
             },
         )
+
+
+def lazy_view(path):
+    """
+    Returns a view that imports the view at ``path`` only once it is called.
+    Meant for (OAuth/OAuth2 adapter) views that do not require login, and that
+    are not CSRF exempt, as their attributes are not available up front.
+    """
+    resolved = []
+
+    @login_not_required
+    def view(request, *args, **kwargs):
+        if not resolved:
+            resolved.append(import_attribute(path))
+        return resolved[0](request, *args, **kwargs)
+
+    return view
+
+
+def alazy_view(path, resolve=None):
+    """
+    The async counterpart of ``lazy_view()``. The imported view is passed
+    through ``resolve``, if given, and may turn out to be either sync or async.
+    """
+    resolved = []
+
+    @login_not_required
+    async def view(request, *args, **kwargs):
+        if not resolved:
+            target = import_attribute(path)
+            if resolve:
+                target = resolve(target)
+            resolved.append(target)
+        target = resolved[0]
+        if iscoroutinefunction(target):
+            return await target(request, *args, **kwargs)
+        return await sync_to_async(target)(request, *args, **kwargs)
+
+    return view
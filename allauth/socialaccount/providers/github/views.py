@@ -1,7 +1,11 @@
+import asyncio
 from typing import Optional
 
+from asgiref.sync import sync_to_async
+
 from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import requestskit
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -27,20 +31,55 @@ class GitHubOAuth2Adapter(OAuth2Adapter):
 
     def complete_login(self, request, app, token, **kwargs):
         headers = {"Authorization": "token {}".format(token.token)}
+        if app_settings.QUERY_EMAIL:
+            extra_data, emails = self.fetch_concurrently(
+                lambda: self.get_profile(headers), lambda: self.get_emails(headers)
+            )
+            if emails:
+                extra_data["emails"] = emails
+        else:
+            extra_data = self.get_profile(headers)
+        return self.get_provider().sociallogin_from_response(request, extra_data)
+
+    async def acomplete_login(self, request, app, token, **kwargs):
+        headers = {"Authorization": "token {}".format(token.token)}
+        if app_settings.QUERY_EMAIL:
+            extra_data, emails = await asyncio.gather(
+                self.aget_profile(headers), self.aget_emails(headers)
+            )
+            if emails:
+                extra_data["emails"] = emails
+        else:
+            extra_data = await self.aget_profile(headers)
+        return await sync_to_async(
+            lambda: self.get_provider().sociallogin_from_response(request, extra_data)
+        )()
+
+    def get_profile(self, headers) -> dict:
         resp = (
             get_adapter().get_requests_session().get(self.profile_url, headers=headers)
         )
+        return self._parse_profile_response(resp)
+
+    async def aget_profile(self, headers) -> dict:
+        resp = await requestskit.arequest("GET", self.profile_url, headers=headers)
+        return self._parse_profile_response(resp)
+
+    def _parse_profile_response(self, resp) -> dict:
         resp.raise_for_status()
-        extra_data = resp.json()
-        if app_settings.QUERY_EMAIL:
-            if emails := self.get_emails(headers):
-                extra_data["emails"] = emails
-        return self.get_provider().sociallogin_from_response(request, extra_data)
+        return resp.json()
 
     def get_emails(self, headers) -> Optional[list]:
         resp = (
             get_adapter().get_requests_session().get(self.emails_url, headers=headers)
         )
+        return self._parse_emails_response(resp)
+
+    async def aget_emails(self, headers) -> Optional[list]:
+        resp = await requestskit.arequest("GET", self.emails_url, headers=headers)
+        return self._parse_emails_response(resp)
+
+    def _parse_emails_response(self, resp) -> Optional[list]:
         # https://api.github.com/user/emails -- 404 is documented to occur.
         if resp.status_code == 404:
             return None
@@ -0,0 +1,1154 @@
+"""
+A static manifest of the providers that ship with allauth, allowing for the
+provider registry to know about providers without importing their modules
+(see ``SOCIALACCOUNT_LAZY_PROVIDERS``).
+
+Do not edit by hand. Instead, with Django set up such that all providers are
+installed, run ``manifest.main()`` followed by ``black``.
+"""
+
+from typing import Dict, List, Optional
+
+
+def _get_urls_kind(provider_class) -> Optional[str]:
+    """
+    Returns the kind of default URL patterns the provider uses, provided it
+    uses nothing but the default URL patterns.
+    """
+    from importlib import import_module
+
+    from django.urls import URLResolver
+
+    urlpatterns = getattr(
+        import_module(provider_class.get_package() + ".urls"), "urlpatterns", []
+    )
+    if len(urlpatterns) != 1 or not isinstance(urlpatterns[0], URLResolver):
+        return None
+    resolver = urlpatterns[0]
+    if str(resolver.pattern) != provider_class.get_slug() + "/":
+        return None
+    views = {p.name: p.callback for p in resolver.url_patterns}
+    if set(views) != {f"{provider_class.id}_login", f"{provider_class.id}_callback"}:
+        return None
+    if not all(
+        view.__qualname__
+        in (
+            "OAuthView.adapter_view.<locals>.view",
+            "OAuth2View.adapter_view.<locals>.view",
+        )
+        for view in views.values()
+    ):
+        return None
+    views_module = import_module(provider_class.get_package() + ".views")
+    for kind in ["oauth2", "oauth"]:
+        if (
+            getattr(views_module, f"{kind}_login", None)
+            is views[f"{provider_class.id}_login"]
+            and getattr(views_module, f"{kind}_callback", None)
+            is views[f"{provider_class.id}_callback"]
+        ):
+            return kind
+    return None
+
+
+def build_manifest() -> Dict[str, List[dict]]:
+    import importlib
+    import pkgutil
+
+    from allauth.socialaccount import providers
+
+    manifest = {}
+    for module_info in pkgutil.iter_modules(providers.__path__):
+        package = f"{providers.__name__}.{module_info.name}"
+        try:
+            provider_module = importlib.import_module(package + ".provider")
+        except ImportError as e:
+            if e.name != package + ".provider":
+                raise
+            continue
+        specs = []
+        for provider_class in getattr(provider_module, "provider_classes", []):
+            specs.append(
+                {
+                    "id": provider_class.id,
+                    "name": provider_class.name,
+                    "slug": provider_class.get_slug(),
+                    "uses_apps": provider_class.uses_apps,
+                    "urls": _get_urls_kind(provider_class),
+                }
+            )
+        if specs:
+            manifest[package] = specs
+    return manifest
+
+
+def main() -> None:
+    with open(__file__) as f:
+        source = f.read()
+    head, _, _ = source.partition("\nPROVIDERS")
+    with open(__file__, "w") as f:
+        f.write(head)
+        f.write("\nPROVIDERS: Dict[str, List[dict]] = {\n")
+        for package, specs in build_manifest().items():
+            f.write(f"    {package!r}: [\n")
+            for spec in specs:
+                f.write(f"        {spec!r},\n")
+            f.write("    ],\n")
+        f.write("}\n")
+
+
+PROVIDERS: Dict[str, List[dict]] = {
+    "allauth.socialaccount.providers.agave": [
+        {
+            "id": "agave",
+            "name": "Agave",
+            "slug": "agave",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.amazon": [
+        {
+            "id": "amazon",
+            "name": "Amazon",
+            "slug": "amazon",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.amazon_cognito": [
+        {
+            "id": "amazon_cognito",
+            "name": "Amazon Cognito",
+            "slug": "amazon-cognito",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.angellist": [
+        {
+            "id": "angellist",
+            "name": "AngelList",
+            "slug": "angellist",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.apple": [
+        {
+            "id": "apple",
+            "name": "Apple",
+            "slug": "apple",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.asana": [
+        {
+            "id": "asana",
+            "name": "Asana",
+            "slug": "asana",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.atlassian": [
+        {
+            "id": "atlassian",
+            "name": "Atlassian",
+            "slug": "atlassian",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.auth0": [
+        {
+            "id": "auth0",
+            "name": "Auth0",
+            "slug": "auth0",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.authentiq": [
+        {
+            "id": "authentiq",
+            "name": "Authentiq",
+            "slug": "authentiq",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.baidu": [
+        {
+            "id": "baidu",
+            "name": "Baidu",
+            "slug": "baidu",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.basecamp": [
+        {
+            "id": "basecamp",
+            "name": "Basecamp",
+            "slug": "basecamp",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.battlenet": [
+        {
+            "id": "battlenet",
+            "name": "Battle.net",
+            "slug": "battlenet",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.bitbucket_oauth2": [
+        {
+            "id": "bitbucket_oauth2",
+            "name": "Bitbucket",
+            "slug": "bitbucket_oauth2",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.bitly": [
+        {
+            "id": "bitly",
+            "name": "Bitly",
+            "slug": "bitly",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.box": [
+        {"id": "box", "name": "Box", "slug": "box", "uses_apps": True, "urls": "oauth"},
+    ],
+    "allauth.socialaccount.providers.cilogon": [
+        {
+            "id": "cilogon",
+            "name": "CILogon",
+            "slug": "cilogon",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.coinbase": [
+        {
+            "id": "coinbase",
+            "name": "Coinbase",
+            "slug": "coinbase",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.dataporten": [
+        {
+            "id": "dataporten",
+            "name": "Dataporten",
+            "slug": "dataporten",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.daum": [
+        {
+            "id": "Daum",
+            "name": "Daum",
+            "slug": "Daum",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.digitalocean": [
+        {
+            "id": "digitalocean",
+            "name": "DigitalOcean",
+            "slug": "digitalocean",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.dingtalk": [
+        {
+            "id": "dingtalk",
+            "name": "DingTalk",
+            "slug": "dingtalk",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.discord": [
+        {
+            "id": "discord",
+            "name": "Discord",
+            "slug": "discord",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.disqus": [
+        {
+            "id": "disqus",
+            "name": "Disqus",
+            "slug": "disqus",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.douban": [
+        {
+            "id": "douban",
+            "name": "Douban",
+            "slug": "douban",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.doximity": [
+        {
+            "id": "doximity",
+            "name": "Doximity",
+            "slug": "doximity",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.draugiem": [
+        {
+            "id": "draugiem",
+            "name": "Draugiem",
+            "slug": "draugiem",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.drip": [
+        {
+            "id": "drip",
+            "name": "Drip",
+            "slug": "drip",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.dummy": [
+        {
+            "id": "dummy",
+            "name": "Dummy",
+            "slug": "dummy",
+            "uses_apps": False,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.dwolla": [
+        {
+            "id": "dwolla",
+            "name": "Dwolla",
+            "slug": "dwolla",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.edmodo": [
+        {
+            "id": "edmodo",
+            "name": "Edmodo",
+            "slug": "edmodo",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.edx": [
+        {
+            "id": "edx",
+            "name": "Edx",
+            "slug": "edx",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.eventbrite": [
+        {
+            "id": "eventbrite",
+            "name": "Eventbrite",
+            "slug": "eventbrite",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.eveonline": [
+        {
+            "id": "eveonline",
+            "name": "EVE Online",
+            "slug": "eveonline",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.evernote": [
+        {
+            "id": "evernote",
+            "name": "Evernote",
+            "slug": "evernote",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.exist": [
+        {
+            "id": "exist",
+            "name": "Exist.io",
+            "slug": "exist",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.facebook": [
+        {
+            "id": "facebook",
+            "name": "Facebook",
+            "slug": "facebook",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.feedly": [
+        {
+            "id": "feedly",
+            "name": "Feedly",
+            "slug": "feedly",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.feishu": [
+        {
+            "id": "feishu",
+            "name": "feishu",
+            "slug": "feishu",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.fivehundredpx": [
+        {
+            "id": "500px",
+            "name": "500px",
+            "slug": "500px",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.flickr": [
+        {
+            "id": "flickr",
+            "name": "Flickr",
+            "slug": "flickr",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.foursquare": [
+        {
+            "id": "foursquare",
+            "name": "Foursquare",
+            "slug": "foursquare",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.frontier": [
+        {
+            "id": "frontier",
+            "name": "Frontier",
+            "slug": "frontier",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.fxa": [
+        {
+            "id": "fxa",
+            "name": "Firefox Accounts",
+            "slug": "fxa",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.gitea": [
+        {
+            "id": "gitea",
+            "name": "Gitea",
+            "slug": "gitea",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.github": [
+        {
+            "id": "github",
+            "name": "GitHub",
+            "slug": "github",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.gitlab": [
+        {
+            "id": "gitlab",
+            "name": "GitLab",
+            "slug": "gitlab",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.globus": [
+        {
+            "id": "globus",
+            "name": "Globus",
+            "slug": "globus",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.google": [
+        {
+            "id": "google",
+            "name": "Google",
+            "slug": "google",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.gumroad": [
+        {
+            "id": "gumroad",
+            "name": "Gumroad",
+            "slug": "gumroad",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.hubic": [
+        {
+            "id": "hubic",
+            "name": "Hubic",
+            "slug": "hubic",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.hubspot": [
+        {
+            "id": "hubspot",
+            "name": "Hubspot",
+            "slug": "hubspot",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.instagram": [
+        {
+            "id": "instagram",
+            "name": "Instagram",
+            "slug": "instagram",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.jupyterhub": [
+        {
+            "id": "jupyterhub",
+            "name": "JupyterHub",
+            "slug": "jupyterhub",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.kakao": [
+        {
+            "id": "kakao",
+            "name": "Kakao",
+            "slug": "kakao",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.lemonldap": [
+        {
+            "id": "lemonldap",
+            "name": "LemonLDAP::NG",
+            "slug": "lemonldap",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.lichess": [
+        {
+            "id": "lichess",
+            "name": "Lichess",
+            "slug": "lichess",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.line": [
+        {
+            "id": "line",
+            "name": "Line",
+            "slug": "line",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.linkedin_oauth2": [
+        {
+            "id": "linkedin_oauth2",
+            "name": "LinkedIn",
+            "slug": "linkedin_oauth2",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.mailchimp": [
+        {
+            "id": "mailchimp",
+            "name": "MailChimp",
+            "slug": "mailchimp",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.mailcow": [
+        {
+            "id": "mailcow",
+            "name": "Mailcow",
+            "slug": "mailcow",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.mailru": [
+        {
+            "id": "mailru",
+            "name": "Mail.RU",
+            "slug": "mailru",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.mediawiki": [
+        {
+            "id": "mediawiki",
+            "name": "MediaWiki",
+            "slug": "mediawiki",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.meetup": [
+        {
+            "id": "meetup",
+            "name": "Meetup",
+            "slug": "meetup",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.microsoft": [
+        {
+            "id": "microsoft",
+            "name": "Microsoft",
+            "slug": "microsoft",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.miro": [
+        {
+            "id": "miro",
+            "name": "Miro",
+            "slug": "miro",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.naver": [
+        {
+            "id": "naver",
+            "name": "Naver",
+            "slug": "naver",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.netiq": [
+        {
+            "id": "netiq",
+            "name": "NetIQ",
+            "slug": "netiq",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.nextcloud": [
+        {
+            "id": "nextcloud",
+            "name": "NextCloud",
+            "slug": "nextcloud",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.notion": [
+        {
+            "id": "notion",
+            "name": "Notion",
+            "slug": "notion",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.odnoklassniki": [
+        {
+            "id": "odnoklassniki",
+            "name": "Odnoklassniki",
+            "slug": "odnoklassniki",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.okta": [
+        {
+            "id": "okta",
+            "name": "Okta",
+            "slug": "okta",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.openid": [
+        {
+            "id": "openid",
+            "name": "OpenID",
+            "slug": "openid",
+            "uses_apps": False,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.openid_connect": [
+        {
+            "id": "openid_connect",
+            "name": "OpenID Connect",
+            "slug": "openid_connect",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.openstreetmap": [
+        {
+            "id": "openstreetmap",
+            "name": "OpenStreetMap",
+            "slug": "openstreetmap",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.orcid": [
+        {
+            "id": "orcid",
+            "name": "Orcid.org",
+            "slug": "orcid",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.patreon": [
+        {
+            "id": "patreon",
+            "name": "Patreon",
+            "slug": "patreon",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.paypal": [
+        {
+            "id": "paypal",
+            "name": "Paypal",
+            "slug": "paypal",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.pinterest": [
+        {
+            "id": "pinterest",
+            "name": "Pinterest",
+            "slug": "pinterest",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.pocket": [
+        {
+            "id": "pocket",
+            "name": "Pocket",
+            "slug": "pocket",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.questrade": [
+        {
+            "id": "questrade",
+            "name": "Questrade",
+            "slug": "questrade",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.quickbooks": [
+        {
+            "id": "quickbooks",
+            "name": "QuickBooks",
+            "slug": "quickbooks",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.reddit": [
+        {
+            "id": "reddit",
+            "name": "Reddit",
+            "slug": "reddit",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.robinhood": [
+        {
+            "id": "robinhood",
+            "name": "Robinhood",
+            "slug": "robinhood",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.saml": [
+        {"id": "saml", "name": "SAML", "slug": "saml", "uses_apps": True, "urls": None},
+    ],
+    "allauth.socialaccount.providers.sharefile": [
+        {
+            "id": "sharefile",
+            "name": "ShareFile",
+            "slug": "sharefile",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.shopify": [
+        {
+            "id": "shopify",
+            "name": "Shopify",
+            "slug": "shopify",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.slack": [
+        {
+            "id": "slack",
+            "name": "Slack",
+            "slug": "slack",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.snapchat": [
+        {
+            "id": "snapchat",
+            "name": "Snapchat",
+            "slug": "snapchat",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.soundcloud": [
+        {
+            "id": "soundcloud",
+            "name": "SoundCloud",
+            "slug": "soundcloud",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.spotify": [
+        {
+            "id": "spotify",
+            "name": "Spotify",
+            "slug": "spotify",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.stackexchange": [
+        {
+            "id": "stackexchange",
+            "name": "Stack Exchange",
+            "slug": "stackexchange",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.steam": [
+        {
+            "id": "steam",
+            "name": "Steam",
+            "slug": "steam",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.stocktwits": [
+        {
+            "id": "stocktwits",
+            "name": "Stocktwits",
+            "slug": "stocktwits",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.strava": [
+        {
+            "id": "strava",
+            "name": "Strava",
+            "slug": "strava",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.stripe": [
+        {
+            "id": "stripe",
+            "name": "Stripe",
+            "slug": "stripe",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.telegram": [
+        {
+            "id": "telegram",
+            "name": "Telegram",
+            "slug": "telegram",
+            "uses_apps": True,
+            "urls": None,
+        },
+    ],
+    "allauth.socialaccount.providers.tiktok": [
+        {
+            "id": "tiktok",
+            "name": "TikTok",
+            "slug": "tiktok",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.trainingpeaks": [
+        {
+            "id": "trainingpeaks",
+            "name": "TrainingPeaks",
+            "slug": "trainingpeaks",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.trello": [
+        {
+            "id": "trello",
+            "name": "Trello",
+            "slug": "trello",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.tumblr": [
+        {
+            "id": "tumblr",
+            "name": "Tumblr",
+            "slug": "tumblr",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.tumblr_oauth2": [
+        {
+            "id": "tumblr_oauth2",
+            "name": "Tumblr",
+            "slug": "tumblr_oauth2",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.twentythreeandme": [
+        {
+            "id": "twentythreeandme",
+            "name": "23andMe",
+            "slug": "23andme",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.twitch": [
+        {
+            "id": "twitch",
+            "name": "Twitch",
+            "slug": "twitch",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.twitter": [
+        {
+            "id": "twitter",
+            "name": "Twitter",
+            "slug": "twitter",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.twitter_oauth2": [
+        {
+            "id": "twitter_oauth2",
+            "name": "Twitter",
+            "slug": "twitter_oauth2",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.untappd": [
+        {
+            "id": "untappd",
+            "name": "Untappd",
+            "slug": "untappd",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.vimeo": [
+        {
+            "id": "vimeo",
+            "name": "Vimeo",
+            "slug": "vimeo",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.vimeo_oauth2": [
+        {
+            "id": "vimeo_oauth2",
+            "name": "Vimeo",
+            "slug": "vimeo_oauth2",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.vk": [
+        {"id": "vk", "name": "VK", "slug": "vk", "uses_apps": True, "urls": "oauth2"},
+    ],
+    "allauth.socialaccount.providers.wahoo": [
+        {
+            "id": "wahoo",
+            "name": "Wahoo",
+            "slug": "wahoo",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.weibo": [
+        {
+            "id": "weibo",
+            "name": "Weibo",
+            "slug": "weibo",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.weixin": [
+        {
+            "id": "weixin",
+            "name": "Weixin",
+            "slug": "weixin",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.windowslive": [
+        {
+            "id": "windowslive",
+            "name": "Live",
+            "slug": "windowslive",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.xing": [
+        {
+            "id": "xing",
+            "name": "Xing",
+            "slug": "xing",
+            "uses_apps": True,
+            "urls": "oauth",
+        },
+    ],
+    "allauth.socialaccount.providers.yahoo": [
+        {
+            "id": "yahoo",
+            "name": "Yahoo",
+            "slug": "yahoo",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.yandex": [
+        {
+            "id": "yandex",
+            "name": "Yandex",
+            "slug": "yandex",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.ynab": [
+        {
+            "id": "ynab",
+            "name": "YNAB",
+            "slug": "ynab",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.zoho": [
+        {
+            "id": "zoho",
+            "name": "Zoho",
+            "slug": "zoho",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+    "allauth.socialaccount.providers.zoom": [
+        {
+            "id": "zoom",
+            "name": "Zoom",
+            "slug": "zoom",
+            "uses_apps": True,
+            "urls": "oauth2",
+        },
+    ],
+}
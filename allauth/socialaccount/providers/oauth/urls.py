@@ -1,11 +1,15 @@
 from django.urls import include, path
 
+from allauth.socialaccount.providers.base.utils import lazy_view
 from allauth.utils import import_attribute
 
 
-def default_urlpatterns(provider):
-    login_view = import_attribute(provider.get_package() + ".views.oauth_login")
-    callback_view = import_attribute(provider.get_package() + ".views.oauth_callback")
+def default_urlpatterns(provider, lazy=False):
+    # With `lazy`, the provider package is not imported until the views are
+    # called, allowing for `provider` to be a `ProviderSpec`.
+    get_view = lazy_view if lazy else import_attribute
+    login_view = get_view(provider.get_package() + ".views.oauth_login")
+    callback_view = get_view(provider.get_package() + ".views.oauth_callback")
 
     urlpatterns = [
         path("login/", login_view, name=provider.id + "_login"),
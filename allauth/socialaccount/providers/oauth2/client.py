@@ -4,6 +4,7 @@ from urllib.parse import parse_qsl
 from django.utils.http import urlencode
 
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import requestskit
 
 
 class OAuth2Error(Exception):
@@ -50,11 +51,53 @@ class OAuth2Client:
         return "%s?%s" % (authorization_url, urlencode(params))
 
     def get_access_token(self, code, pkce_code_verifier=None, extra_data=None):
-        data = {
+        data = self._get_access_token_data(code)
+        return self._fetch_token(
+            data, pkce_code_verifier=pkce_code_verifier, extra_data=extra_data
+        )
+
+    async def aget_access_token(self, code, pkce_code_verifier=None, extra_data=None):
+        data = self._get_access_token_data(code)
+        return await self._afetch_token(
+            data, pkce_code_verifier=pkce_code_verifier, extra_data=extra_data
+        )
+
+    def _get_access_token_data(self, code):
+        return {
             "redirect_uri": self.callback_url,
             "grant_type": "authorization_code",
             "code": code,
         }
+
+    def refresh_token(self, refresh_token, extra_data=None):
+        data = {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+        }
+        return self._fetch_token(data, extra_data=extra_data)
+
+    def _fetch_token(self, data, pkce_code_verifier=None, extra_data=None):
+        kwargs = self._get_token_request_kwargs(
+            data, pkce_code_verifier=pkce_code_verifier, extra_data=extra_data
+        )
+        # TODO: Proper exception handling
+        resp = (
+            get_adapter()
+            .get_requests_session()
+            .request(self.access_token_method, self.access_token_url, **kwargs)
+        )
+        return self._parse_token_response(resp)
+
+    async def _afetch_token(self, data, pkce_code_verifier=None, extra_data=None):
+        kwargs = self._get_token_request_kwargs(
+            data, pkce_code_verifier=pkce_code_verifier, extra_data=extra_data
+        )
+        resp = await requestskit.arequest(
+            self.access_token_method, self.access_token_url, **kwargs
+        )
+        return self._parse_token_response(resp)
+
+    def _get_token_request_kwargs(self, data, pkce_code_verifier=None, extra_data=None):
         if self.basic_auth:
             auth = requests.auth.HTTPBasicAuth(self.consumer_key, self.consumer_secret)
         else:
@@ -69,26 +112,19 @@ class OAuth2Client:
             data.update(extra_data)
         params = None
         self._strip_empty_keys(data)
-        url = self.access_token_url
         if self.access_token_method == "GET":  # nosec
             params = data
             data = None
         if data and pkce_code_verifier:
             data["code_verifier"] = pkce_code_verifier
-        # TODO: Proper exception handling
-        resp = (
-            get_adapter()
-            .get_requests_session()
-            .request(
-                self.access_token_method,
-                url,
-                params=params,
-                data=data,
-                headers=self.headers,
-                auth=auth,
-            )
-        )
+        return {
+            "params": params,
+            "data": data,
+            "headers": self.headers,
+            "auth": auth,
+        }
 
+    def _parse_token_response(self, resp):
         access_token = None
         if resp.status_code in [200, 201]:
             # Weibo sends json via 'text/plain;charset=UTF-8'
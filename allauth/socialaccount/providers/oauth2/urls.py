@@ -1,11 +1,23 @@
 from django.urls import include, path
 
+from allauth.socialaccount import app_settings
+from allauth.socialaccount.providers.base.utils import alazy_view, lazy_view
+from allauth.socialaccount.providers.oauth2.views import get_async_callback_view
 from allauth.utils import import_attribute
 
 
-def default_urlpatterns(provider):
-    login_view = import_attribute(provider.get_package() + ".views.oauth2_login")
-    callback_view = import_attribute(provider.get_package() + ".views.oauth2_callback")
+def default_urlpatterns(provider, lazy=False):
+    # With `lazy`, the provider package is not imported until the views are
+    # called, allowing for `provider` to be a `ProviderSpec`.
+    get_view = lazy_view if lazy else import_attribute
+    login_view = get_view(provider.get_package() + ".views.oauth2_login")
+    callback_path = provider.get_package() + ".views.oauth2_callback"
+    if not app_settings.ASYNC_CALLBACKS:
+        callback_view = get_view(callback_path)
+    elif lazy:
+        callback_view = alazy_view(callback_path, resolve=get_async_callback_view)
+    else:
+        callback_view = get_async_callback_view(import_attribute(callback_path))
 
     urlpatterns = [
         path("login/", login_view, name=provider.id + "_login"),
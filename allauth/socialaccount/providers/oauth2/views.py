@@ -1,6 +1,8 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from requests import RequestException
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
@@ -8,12 +10,15 @@ from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
 
+from asgiref.sync import sync_to_async
+
 from allauth.account import app_settings as account_settings
 from allauth.account.internal.decorators import login_not_required
 from allauth.core.exceptions import ImmediateHttpResponse
 from allauth.core.internal.httpkit import add_query_params
 from allauth.socialaccount.adapter import get_adapter
 from allauth.socialaccount.helpers import (
+    acomplete_social_login,
     complete_social_login,
     render_authentication_error,
 )
@@ -52,6 +57,14 @@ class OAuth2Adapter:
         """
         raise NotImplementedError
 
+    async def acomplete_login(self, request, app, token: SocialToken, **kwargs):
+        """
+        Async counterpart of ``complete_login()``, used by the async callback
+        view. Providers opt in to fetching the user profile async by
+        implementing this, by default ``complete_login()`` is run in a thread.
+        """
+        return await sync_to_async(self.complete_login)(request, app, token, **kwargs)
+
     def get_callback_url(self, request, app):
         callback_url = reverse(self.provider_id + "_callback")
         protocol = self.redirect_uri_protocol
@@ -71,6 +84,59 @@ class OAuth2Adapter:
         self.did_fetch_access_token = True
         return data
 
+    async def aget_access_token_data(
+        self, request, app, client, pkce_code_verifier=None
+    ):
+        if _overrides(self, OAuth2Adapter, "get_access_token_data") or (
+            _overrides(client, OAuth2Client, "get_access_token")
+            and not _overrides(client, OAuth2Client, "aget_access_token")
+        ):
+            # Provider specific token handling, which is not async (yet).
+            return await sync_to_async(self.get_access_token_data)(
+                request, app, client, pkce_code_verifier=pkce_code_verifier
+            )
+        code = get_request_param(self.request, "code")
+        data = await client.aget_access_token(
+            code, pkce_code_verifier=pkce_code_verifier
+        )
+        self.did_fetch_access_token = True
+        return data
+
+    def refresh_token(self, app, token: SocialToken) -> SocialToken:
+        """
+        Refreshes the (expired) access token using the refresh token, which is
+        stored in ``token.token_secret``. The token is updated in place, but
+        not saved.
+        """
+        if not token.token_secret:
+            raise OAuth2Error("No refresh token available")
+        client = self.get_client(self.request, app)
+        data = client.refresh_token(token.token_secret)
+        refreshed_token = self.parse_token(data)
+        token.token = refreshed_token.token
+        if refreshed_token.token_secret:
+            # Not all providers rotate the refresh token.
+            token.token_secret = refreshed_token.token_secret
+        token.expires_at = refreshed_token.expires_at
+        return token
+
+    def fetch_concurrently(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Performs the given calls, typically independent requests for (parts
+        of) the user profile, concurrently. Returns their results, in order.
+        If any of the calls fails, the exception of the first failing call is
+        raised.
+        """
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            # Run each call in a copy of the current context, so that the
+            # request context remains available to the calls.
+            futures = [
+                executor.submit(contextvars.copy_context().run, call) for call in calls
+            ]
+            return [future.result() for future in futures]
+
     def get_client(self, request, app):
         callback_url = self.get_callback_url(request, app)
         client = self.client_class(
@@ -87,6 +153,10 @@ class OAuth2Adapter:
         return client
 
 
+def _overrides(obj, base, name) -> bool:
+    return getattr(type(obj), name) is not getattr(base, name)
+
+
 class OAuth2View:
     @classmethod
     def adapter_view(cls, adapter):
@@ -103,6 +173,8 @@ class OAuth2View:
             except ImmediateHttpResponse as e:
                 return e.response
 
+        view.view_class = cls
+        view.adapter = adapter
         return view
 
 
@@ -117,22 +189,9 @@ class OAuth2CallbackView(OAuth2View):
         state, resp = self._get_state(request, provider)
         if resp:
             return resp
-        if "error" in request.GET or "code" not in request.GET:
-            # Distinguish cancel from error
-            auth_error = request.GET.get("error", None)
-            if auth_error == self.adapter.login_cancelled_error:
-                error = AuthError.CANCELLED
-            else:
-                error = AuthError.UNKNOWN
-            return render_authentication_error(
-                request,
-                provider,
-                error=error,
-                extra_context={
-                    "state": state,
-                    "callback_view": self,
-                },
-            )
+        resp = self._handle_error(request, provider, state)
+        if resp:
+            return resp
         app = provider.app
         client = self.adapter.get_client(self.request, app)
 
@@ -159,6 +218,25 @@ class OAuth2CallbackView(OAuth2View):
                 request, provider, exception=e, extra_context={"state": state}
             )
 
+    def _handle_error(self, request, provider, state):
+        if "error" in request.GET or "code" not in request.GET:
+            # Distinguish cancel from error
+            auth_error = request.GET.get("error", None)
+            if auth_error == self.adapter.login_cancelled_error:
+                error = AuthError.CANCELLED
+            else:
+                error = AuthError.UNKNOWN
+            return render_authentication_error(
+                request,
+                provider,
+                error=error,
+                extra_context={
+                    "state": state,
+                    "callback_view": self,
+                },
+            )
+        return None
+
     def _redirect_strict_samesite(self, request, provider):
         if (
             "_redir" in request.GET
@@ -200,3 +278,75 @@ class OAuth2CallbackView(OAuth2View):
                 },
             )
         return state, None
+
+
+class AsyncOAuth2CallbackView(OAuth2CallbackView):
+    """
+    The async counterpart of ``OAuth2CallbackView``. The token request, the
+    account lookup and (for providers implementing ``acomplete_login()``) the
+    profile requests are performed without blocking the event loop. The
+    session related parts of the flow are run in a thread.
+    """
+
+    @classmethod
+    def adapter_view(cls, adapter):
+        @login_not_required
+        async def view(request, *args, **kwargs):
+            self = cls()
+            self.request = request
+            if not isinstance(adapter, OAuth2Adapter):
+                self.adapter = adapter(request)
+            else:
+                self.adapter = adapter
+            try:
+                return await self.dispatch(request, *args, **kwargs)
+            except ImmediateHttpResponse as e:
+                return e.response
+
+        view.view_class = cls
+        view.adapter = adapter
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        provider = await sync_to_async(self.adapter.get_provider)()
+        state, resp = await sync_to_async(self._get_state)(request, provider)
+        if resp:
+            return resp
+        resp = await sync_to_async(self._handle_error)(request, provider, state)
+        if resp:
+            return resp
+        app = provider.app
+        client = await sync_to_async(self.adapter.get_client)(self.request, app)
+
+        try:
+            access_token = await self.adapter.aget_access_token_data(
+                request, app, client, pkce_code_verifier=state.get("pkce_code_verifier")
+            )
+            token = self.adapter.parse_token(access_token)
+            if app.pk:
+                token.app = app
+            login = await self.adapter.acomplete_login(
+                request, app, token, response=access_token
+            )
+            login.token = token
+            login.state = state
+            return await acomplete_social_login(request, login)
+        except (
+            PermissionDenied,
+            OAuth2Error,
+            RequestException,
+            ProviderException,
+        ) as e:
+            return await sync_to_async(render_authentication_error)(
+                request, provider, exception=e, extra_context={"state": state}
+            )
+
+
+def get_async_callback_view(view):
+    """
+    Returns the async counterpart of the given callback view, provided that it
+    is a plain ``OAuth2CallbackView``. Custom callback views are returned as is.
+    """
+    if getattr(view, "view_class", None) is not OAuth2CallbackView:
+        return view
+    return AsyncOAuth2CallbackView.adapter_view(view.adapter)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from allauth.socialaccount.providers.openid.utils import DBOpenIDStore
+
+
+class Command(BaseCommand):
+    help = "Purges expired nonces and associations from the OpenID database store."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        store = DBOpenIDStore()
+        nonces = store.cleanupNonces(batch_size=options["batch_size"])
+        associations = store.cleanupAssociations(batch_size=options["batch_size"])
+        self.stdout.write(f"Purged nonces: {nonces}, associations: {associations}")
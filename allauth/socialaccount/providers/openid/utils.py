@@ -1,13 +1,19 @@
 import base64
+import hashlib
 import pickle  # nosec
+import time
 from collections import UserDict
 
+from django.core.cache import cache
+from django.db.models import F
+
 from openid.association import Association as OIDAssociation
 from openid.extensions.ax import FetchResponse
 from openid.extensions.sreg import SRegResponse
+from openid.store import nonce as oid_nonce
 from openid.store.interface import OpenIDStore as OIDStore
 
-from allauth.utils import valid_email_or_none
+from allauth.utils import import_attribute, valid_email_or_none
 
 from .models import OpenIDNonce, OpenIDStore
 
@@ -145,6 +151,103 @@ class DBOpenIDStore(OIDStore):
 
         return False
 
+    def cleanupNonces(self, batch_size=1000):
+        qs = OpenIDNonce.objects.filter(timestamp__lt=time.time() - oid_nonce.SKEW)
+        return _delete_in_batches(qs, batch_size)
+
+    def cleanupAssociations(self, batch_size=1000):
+        qs = OpenIDStore.objects.alias(expires_at=F("issued") + F("lifetime")).filter(
+            expires_at__lt=time.time()
+        )
+        return _delete_in_batches(qs, batch_size)
+
+
+def _delete_in_batches(qs, batch_size):
+    """
+    Deletes the rows matched by the queryset in batches, to avoid long running
+    transactions (and locks) on large tables.
+    """
+    count = 0
+    while True:
+        ids = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return count
+        count += len(ids)
+        qs.model.objects.filter(pk__in=ids).delete()
+
+
+class CacheOpenIDStore(OIDStore):
+    """
+    Stores associations and nonces in the Django cache, relying on the cache to
+    expire them. Requires a cache that is shared between all processes.
+    """
+
+    def _get_key(self, prefix, *parts):
+        key = "\n".join(str(part) for part in parts)
+        return prefix + hashlib.sha256(key.encode("utf8")).hexdigest()
+
+    def storeAssociation(self, server_url, assoc):
+        expires_in = assoc.expiresIn
+        if expires_in <= 0:
+            return
+        data = assoc.serialize()
+        cache.set_many(
+            {
+                # The most recently issued association, for lookups by server.
+                self._get_key("openid-assoc:", server_url): data,
+                self._get_key("openid-assoc:", server_url, assoc.handle): data,
+            },
+            timeout=expires_in,
+        )
+
+    def getAssociation(self, server_url, handle=None):
+        if handle is None:
+            key = self._get_key("openid-assoc:", server_url)
+        else:
+            key = self._get_key("openid-assoc:", server_url, handle)
+        data = cache.get(key)
+        if data is None:
+            return None
+        assoc = OIDAssociation.deserialize(data)
+        if assoc.expiresIn <= 0:
+            return None
+        return assoc
+
+    def removeAssociation(self, server_url, handle):
+        key = self._get_key("openid-assoc:", server_url, handle)
+        latest_key = self._get_key("openid-assoc:", server_url)
+        found = cache.get_many([key, latest_key])
+        latest = found.get(latest_key)
+        if latest is not None and OIDAssociation.deserialize(latest).handle == handle:
+            cache.delete(latest_key)
+        cache.delete(key)
+        return key in found
+
+    def useNonce(self, server_url, timestamp, salt):
+        if abs(timestamp - time.time()) > oid_nonce.SKEW:
+            return False
+        # The nonce is only accepted once, for as long as its timestamp is
+        # acceptable.
+        key = self._get_key("openid-nonce:", server_url, timestamp, salt)
+        return cache.add(key, True, timeout=oid_nonce.SKEW)
+
+    def cleanupNonces(self):
+        return 0
+
+    def cleanupAssociations(self):
+        return 0
+
+
+def get_store(provider):
+    """
+    Returns the store configured for the provider (``"STORE"``), defaulting to
+    the database backed store.
+    """
+    store_class = provider.get_settings().get("STORE")
+    if store_class is None:
+        return DBOpenIDStore()
+    return import_attribute(store_class)()
+
 
 def get_email_from_response(response):
     email = None
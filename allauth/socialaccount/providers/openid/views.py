@@ -22,13 +22,13 @@ from allauth.socialaccount.providers.openid.provider import OpenIDProvider
 
 from ..base import AuthError
 from .forms import LoginForm
-from .utils import AXAttributes, DBOpenIDStore, JSONSafeSession, SRegFields
+from .utils import AXAttributes, JSONSafeSession, SRegFields, get_store
 
 
 def _openid_consumer(request, provider, endpoint):
     server_settings = provider.get_server_settings(endpoint)
     stateless = server_settings.get("stateless", False)
-    store = None if stateless else DBOpenIDStore()
+    store = None if stateless else get_store(provider)
     client = consumer.Consumer(JSONSafeSession(request.session), store)
     return client
 
@@ -3,6 +3,7 @@ from django.urls import reverse
 
 from allauth.account.internal.decorators import login_not_required
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import discoverykit
 from allauth.socialaccount.models import SocialApp, SocialToken
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
@@ -21,9 +22,7 @@ class OpenIDConnectOAuth2Adapter(OAuth2Adapter):
     def openid_config(self):
         if not hasattr(self, "_openid_config"):
             server_url = self.get_provider().server_url
-            resp = get_adapter().get_requests_session().get(server_url)
-            resp.raise_for_status()
-            self._openid_config = resp.json()
+            self._openid_config = discoverykit.get_openid_configuration(server_url)
         return self._openid_config
 
     @property
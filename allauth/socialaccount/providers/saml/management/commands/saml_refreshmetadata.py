@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from allauth.socialaccount.providers.saml.utils import refresh_stale_metadata
+
+
+class Command(BaseCommand):
+    help = "Refreshes the SAML IdP metadata that is (about to be) stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=15 * 60,
+            help="Refresh metadata that turns stale within this number of seconds.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed, failed = refresh_stale_metadata(ahead=options["ahead"])
+        self.stdout.write(f"Refreshed: {refreshed}, failed: {failed}")
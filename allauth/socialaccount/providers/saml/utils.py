@@ -1,3 +1,10 @@
+import copy
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 from django.core.cache import cache
@@ -9,12 +16,16 @@ from django.utils.http import urlencode
 from onelogin.saml2.auth import OneLogin_Saml2_Auth
 from onelogin.saml2.constants import OneLogin_Saml2_Constants
 from onelogin.saml2.idp_metadata_parser import OneLogin_Saml2_IdPMetadataParser
+from onelogin.saml2.settings import OneLogin_Saml2_Settings
 
 from allauth.socialaccount.adapter import get_adapter
 from allauth.socialaccount.models import SocialApp
 from allauth.socialaccount.providers.saml.provider import SAMLProvider
 
 
+logger = logging.getLogger(__name__)
+
+
 def get_app_or_404(request, organization_slug):
     adapter = get_adapter()
     try:
@@ -73,23 +84,170 @@ def build_sp_config(request, provider_config, org):
     return sp_config
 
 
-def fetch_metadata_url_config(idp_config):
-    metadata_url = idp_config["metadata_url"]
-    entity_id = idp_config["entity_id"]
-    cache_key = f"saml.metadata.{metadata_url}.{entity_id}"
-    saml_config = cache.get(cache_key)
-    if saml_config is None:
-        saml_config = OneLogin_Saml2_IdPMetadataParser.parse_remote(
-            metadata_url,
-            entity_id=entity_id,
-            timeout=idp_config.get("metadata_request_timeout", 10),
-        )
+# Past their `metadata_cache_timeout`, IdP metadata is refreshed in the
+# background. In the meantime, and for as long as refreshing fails, the last
+# known good metadata is served, up until this many seconds.
+METADATA_STALE_IF_ERROR = 60 * 60 * 24
+# The minimum number of seconds between attempts to refresh metadata.
+METADATA_RETRY_INTERVAL = 60
+
+_refreshing_metadata: Set[str] = set()
+_metadata_lock = threading.Lock()
+
+
+def _get_metadata_cache_key(idp_config) -> str:
+    key = "{metadata_url} {entity_id}".format(**idp_config)
+    return "saml-metadata:" + hashlib.sha256(key.encode("utf8")).hexdigest()
+
+
+def _get_metadata_cache_timeout(idp_config) -> int:
+    return idp_config.get("metadata_cache_timeout", 60 * 60 * 4)
+
+
+def _is_metadata_stale(entry, idp_config, ahead=0) -> bool:
+    now = time.time()
+    if (
+        entry["checked_at"] > entry["fetched_at"]
+        and now - entry["checked_at"] < METADATA_RETRY_INTERVAL
+    ):
+        # Refreshing failed recently, back off.
+        return False
+    return now - entry["fetched_at"] >= _get_metadata_cache_timeout(idp_config) - ahead
+
+
+def _refresh_metadata_entry(idp_config, entry=None, lock=True) -> Optional[dict]:
+    cache_key = _get_metadata_cache_key(idp_config)
+    request_timeout = idp_config.get("metadata_request_timeout", 10)
+    lock_key = cache_key + ":lock"
+    if lock and not cache.add(lock_key, True, timeout=request_timeout + 5):
+        return None
+    try:
+        try:
+            saml_config = OneLogin_Saml2_IdPMetadataParser.parse_remote(
+                idp_config["metadata_url"],
+                entity_id=idp_config["entity_id"],
+                timeout=request_timeout,
+            )
+        except Exception:
+            if entry is None:
+                raise
+            entry = dict(entry, checked_at=time.time())
+            cache.set(
+                cache_key,
+                entry,
+                _get_metadata_cache_timeout(idp_config)
+                + METADATA_STALE_IF_ERROR
+                - (entry["checked_at"] - entry["fetched_at"]),
+            )
+            raise
+        now = time.time()
+        entry = {"config": saml_config, "fetched_at": now, "checked_at": now}
         cache.set(
             cache_key,
-            saml_config,
-            idp_config.get("metadata_cache_timeout", 60 * 60 * 4),
+            entry,
+            _get_metadata_cache_timeout(idp_config) + METADATA_STALE_IF_ERROR,
         )
-    return saml_config
+        return entry
+    finally:
+        if lock:
+            cache.delete(lock_key)
+
+
+def refresh_metadata_url_config(idp_config, entry=None) -> Optional[dict]:
+    """
+    Fetches the IdP metadata, and stores it in the cache. Only one process
+    refreshes the metadata of an IdP at a time: returns ``None`` if the metadata
+    is already being refreshed elsewhere. In case the refresh fails, the
+    ``entry`` currently cached (if any) is kept, and retried later on.
+    """
+    entry = _refresh_metadata_entry(idp_config, entry=entry)
+    return None if entry is None else entry["config"]
+
+
+def _refresh_metadata(idp_config, entry) -> None:
+    try:
+        refresh_metadata_url_config(idp_config, entry=entry)
+    except Exception:
+        logger.exception(
+            "Unable to refresh SAML IdP metadata from %s", idp_config["metadata_url"]
+        )
+    finally:
+        with _metadata_lock:
+            _refreshing_metadata.discard(_get_metadata_cache_key(idp_config))
+
+
+def _refresh_metadata_in_background(idp_config, entry) -> Optional[threading.Thread]:
+    cache_key = _get_metadata_cache_key(idp_config)
+    with _metadata_lock:
+        if cache_key in _refreshing_metadata:
+            return None
+        _refreshing_metadata.add(cache_key)
+    thread = threading.Thread(
+        target=_refresh_metadata, args=(idp_config, entry), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def get_metadata_entry(idp_config) -> dict:
+    """
+    Returns the cached IdP metadata entry, fetching it if needed. Stale
+    metadata is served while it is refreshed in the background.
+    """
+    cache_key = _get_metadata_cache_key(idp_config)
+    request_timeout = idp_config.get("metadata_request_timeout", 10)
+    # Do not wait for longer than the lock held by another process can last.
+    deadline = time.monotonic() + request_timeout + 5
+    while True:
+        entry = cache.get(cache_key)
+        if entry is not None:
+            break
+        if time.monotonic() >= deadline:
+            # Whoever is fetching the metadata is taking too long, or, got lost.
+            return _refresh_metadata_entry(idp_config, lock=False)
+        entry = _refresh_metadata_entry(idp_config)
+        if entry is not None:
+            return entry
+        # Another process is fetching the metadata, wait for it.
+        time.sleep(0.1)
+    if _is_metadata_stale(entry, idp_config):
+        _refresh_metadata_in_background(idp_config, entry)
+    return entry
+
+
+def fetch_metadata_url_config(idp_config):
+    return get_metadata_entry(idp_config)["config"]
+
+
+def refresh_stale_metadata(ahead=0) -> Tuple[int, int]:
+    """
+    Refreshes the metadata of all SAML apps that is (about to be) stale, so
+    that logins do not have to. Returns the number of IdPs that were refreshed
+    and that failed.
+    """
+    refreshed = failed = 0
+    seen = set()
+    for app in get_adapter().list_apps(None, provider=SAMLProvider.id):
+        idp_config = app.settings.get("idp", {})
+        if not idp_config.get("metadata_url"):
+            continue
+        cache_key = _get_metadata_cache_key(idp_config)
+        if cache_key in seen:
+            continue
+        seen.add(cache_key)
+        entry = cache.get(cache_key)
+        if entry is not None and not _is_metadata_stale(entry, idp_config, ahead):
+            continue
+        try:
+            if refresh_metadata_url_config(idp_config, entry=entry) is not None:
+                refreshed += 1
+        except Exception:
+            logger.exception(
+                "Unable to refresh SAML IdP metadata from %s",
+                idp_config["metadata_url"],
+            )
+            failed += 1
+    return refreshed, failed
 
 
 def build_saml_config(request, provider_config, org):
@@ -168,8 +326,69 @@ def decode_relay_state(relay_state):
     return next_url
 
 
+@dataclass
+class _CachedSettings:
+    provider_config: dict
+    saml_settings: OneLogin_Saml2_Settings
+    # Identifies the IdP metadata entry the settings were built from, if any.
+    metadata_fetched_at: Optional[float]
+
+    def is_valid(self, provider_config: dict, metadata_fetched_at) -> bool:
+        if self.metadata_fetched_at != metadata_fetched_at:
+            return False
+        # Changes to the app (settings) are picked up by comparing the config.
+        return self.provider_config == provider_config
+
+
+# The maximum number of (organization, host) combinations kept in memory.
+SETTINGS_CACHE_SIZE = 256
+
+_settings_cache: Dict[Tuple[str, str, bool], _CachedSettings] = {}
+_settings_cache_lock = threading.Lock()
+
+
+def get_saml_settings(
+    request, provider_config, org, sp_validation_only=False
+) -> OneLogin_Saml2_Settings:
+    """
+    Returns the (parsed and validated) settings for the organization. These are
+    cached per organization and host (the SP URLs are absolute), and are rebuilt
+    when the app settings change, or when the IdP metadata was refreshed. The
+    settings are shared across requests, and must not be altered.
+    """
+    acs_url = request.build_absolute_uri(reverse("saml_acs", args=[org]))
+    key = (org, acs_url, sp_validation_only)
+    metadata_fetched_at = None
+    idp = provider_config.get("idp") or {}
+    if idp.get("metadata_url"):
+        metadata_fetched_at = get_metadata_entry(idp)["fetched_at"]
+    cached = _settings_cache.get(key)
+    if cached is not None and cached.is_valid(provider_config, metadata_fetched_at):
+        return cached.saml_settings
+    config = build_saml_config(request, provider_config, org)
+    saml_settings = OneLogin_Saml2_Settings(
+        settings=config, sp_validation_only=sp_validation_only
+    )
+    with _settings_cache_lock:
+        if len(_settings_cache) >= SETTINGS_CACHE_SIZE:
+            _settings_cache.clear()
+        _settings_cache[key] = _CachedSettings(
+            provider_config=copy.deepcopy(provider_config),
+            saml_settings=saml_settings,
+            metadata_fetched_at=metadata_fetched_at,
+        )
+    return saml_settings
+
+
+def clear_settings_cache() -> None:
+    with _settings_cache_lock:
+        _settings_cache.clear()
+
+
 def build_auth(request, provider):
     req = prepare_django_request(request)
-    config = build_saml_config(request, provider.app.settings, provider.app.client_id)
-    auth = OneLogin_Saml2_Auth(req, config)
+    saml_settings = get_saml_settings(
+        request, provider.app.settings, provider.app.client_id
+    )
+    auth = OneLogin_Saml2_Auth(req, saml_settings)
     return auth
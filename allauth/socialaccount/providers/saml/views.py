@@ -7,7 +7,6 @@ from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
-from onelogin.saml2.auth import OneLogin_Saml2_Settings
 from onelogin.saml2.errors import OneLogin_Saml2_Error
 
 from allauth.account.adapter import get_adapter as get_account_adapter
@@ -21,7 +20,7 @@ from allauth.socialaccount.providers.base.constants import AuthError, AuthProces
 from allauth.socialaccount.providers.base.views import BaseLoginView
 from allauth.socialaccount.sessions import LoginSession
 
-from .utils import build_auth, build_saml_config, decode_relay_state, get_app_or_404
+from .utils import build_auth, decode_relay_state, get_app_or_404, get_saml_settings
 
 
 logger = logging.getLogger(__name__)
@@ -169,11 +168,11 @@ sls = SLSView.as_view()
 class MetadataView(SAMLViewMixin, View):
     def dispatch(self, request, organization_slug):
         provider = self.get_provider(organization_slug)
-        config = build_saml_config(
-            self.request, provider.app.settings, organization_slug
-        )
-        saml_settings = OneLogin_Saml2_Settings(
-            settings=config, sp_validation_only=True
+        saml_settings = get_saml_settings(
+            self.request,
+            provider.app.settings,
+            organization_slug,
+            sp_validation_only=True,
         )
         metadata = saml_settings.get_sp_metadata()
         errors = saml_settings.validate_metadata(metadata)
@@ -12,17 +12,24 @@ from . import app_settings
 def build_provider_urlpatterns() -> List[Union[URLPattern, URLResolver]]:
     # Provider urlpatterns, as separate attribute (for reusability).
     provider_urlpatterns: List[Union[URLPattern, URLResolver]] = []
-    provider_classes = providers.registry.get_class_list()
+    provider_specs = providers.registry.get_spec_list()
 
     # We need to move the OpenID Connect provider to the end. The reason is that
     # matches URLs that the builtin providers also match.
     #
     # NOTE: Only needed if OPENID_CONNECT_URL_PREFIX is blank.
-    provider_classes = [
-        cls for cls in provider_classes if cls.id != "openid_connect"
-    ] + [cls for cls in provider_classes if cls.id == "openid_connect"]
-    for provider_class in provider_classes:
-        prov_mod = import_module(provider_class.get_package() + ".urls")
+    provider_specs = [
+        spec for spec in provider_specs if spec.id != "openid_connect"
+    ] + [spec for spec in provider_specs if spec.id == "openid_connect"]
+    for spec in provider_specs:
+        if spec.urls and not providers.registry.is_imported(spec.id):
+            # Build the default URL patterns without importing the provider.
+            urls_mod = import_module(
+                f"allauth.socialaccount.providers.{spec.urls}.urls"
+            )
+            provider_urlpatterns += urls_mod.default_urlpatterns(spec, lazy=True)
+            continue
+        prov_mod = import_module(spec.get_package() + ".urls")
         prov_urlpatterns = getattr(prov_mod, "urlpatterns", None)
         if prov_urlpatterns:
             provider_urlpatterns += prov_urlpatterns
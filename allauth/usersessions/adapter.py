@@ -1,6 +1,5 @@
-from allauth.core.internal.adapter import BaseAdapter
+from allauth.core.internal.adapter import BaseAdapter, resolve_adapter
 from allauth.usersessions import app_settings
-from allauth.utils import import_attribute
 
 
 class DefaultUserSessionsAdapter(BaseAdapter):
@@ -17,4 +16,4 @@ class DefaultUserSessionsAdapter(BaseAdapter):
 
 
 def get_adapter():
-    return import_attribute(app_settings.ADAPTER)()
+    return resolve_adapter(app_settings.ADAPTER)
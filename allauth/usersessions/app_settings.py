@@ -1,3 +1,6 @@
+from allauth.core.internal.settingskit import SettingsSnapshot
+
+
 class AppSettings:
     def __init__(self, prefix):
         self.prefix = prefix
@@ -23,8 +26,9 @@ class AppSettings:
 
 
 _app_settings = AppSettings("USERSESSIONS_")
+_snapshot = SettingsSnapshot(_app_settings)
 
 
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
-    return getattr(_app_settings, name)
+    return _snapshot.get(name)
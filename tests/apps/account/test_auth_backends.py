@@ -1,12 +1,15 @@
+import threading
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.test import TestCase
 from django.test.utils import override_settings
 
 import pytest
+from asgiref.sync import sync_to_async
 
-from allauth.account import app_settings
+from allauth.account import app_settings, auth_backends
 from allauth.account.auth_backends import AuthenticationBackend
 
 
@@ -108,3 +111,66 @@ def test_account_enumeration_timing_attack(user, db, rf, settings, login_methods
                 rf.get("/"), email=user.email, username="not-known", password="secret"
             )
             set_password_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "login_methods,credentials",
+    [
+        ({app_settings.LoginMethod.EMAIL}, {"email": "john@example.com"}),
+        ({app_settings.LoginMethod.USERNAME}, {"username": "john"}),
+        (
+            {app_settings.LoginMethod.USERNAME, app_settings.LoginMethod.EMAIL},
+            {"username": "john@example.com"},
+        ),
+    ],
+)
+async def test_aauthenticate(settings, login_methods, credentials, monkeypatch):
+    settings.ACCOUNT_LOGIN_METHODS = login_methods
+    user = await sync_to_async(get_user_model().objects.create_user)(
+        username="john", email="john@example.com", password="secret"
+    )
+    threads = []
+    verify_password = auth_backends._verify_password
+
+    def record_thread(*args):
+        threads.append(threading.current_thread().name)
+        return verify_password(*args)
+
+    monkeypatch.setattr(auth_backends, "_verify_password", record_thread)
+    backend = AuthenticationBackend()
+    authenticated = await backend.aauthenticate(None, password="secret", **credentials)
+    assert authenticated.pk == user.pk
+    assert await backend.aauthenticate(None, password="wrong", **credentials) is None
+    assert threads and all(t.startswith("allauth-hasher") for t in threads)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_aauthenticate_upgrades_password_hash(settings):
+    settings.ACCOUNT_LOGIN_METHODS = {app_settings.LoginMethod.USERNAME}
+    settings.PASSWORD_HASHERS = [
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ]
+    user = get_user_model()(username="john")
+    user.password = make_password("secret", hasher="pbkdf2_sha1")
+    await user.asave()
+    backend = AuthenticationBackend()
+    assert (await backend.aauthenticate(None, username="john", password="secret")).pk
+    await user.arefresh_from_db()
+    assert user.password.startswith("md5$")
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_aauthenticate_timing_attack(settings):
+    settings.ACCOUNT_LOGIN_METHODS = {app_settings.LoginMethod.USERNAME}
+    with patch("django.contrib.auth.models.User.set_password") as set_password_mock:
+        backend = AuthenticationBackend()
+        assert (
+            await backend.aauthenticate(None, username="not-known", password="secret")
+            is None
+        )
+        set_password_mock.assert_called_once()
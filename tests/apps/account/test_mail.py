@@ -0,0 +1,274 @@
+from datetime import timedelta
+from typing import Dict
+
+from django.contrib import admin
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from allauth.account.admin import OutgoingEmailAdmin
+from allauth.account.internal import mailkit
+from allauth.account.models import OutgoingEmail
+
+
+@pytest.fixture
+def outbox_backend(settings):
+    settings.ACCOUNT_MAIL_BACKEND = "allauth.account.internal.mailkit.OutboxMailBackend"
+
+
+def test_outbox(client, user, outbox_backend, mailoutbox):
+    resp = client.post(reverse("account_reset_password"), {"email": user.email})
+    assert resp.status_code == 302
+    assert len(mailoutbox) == 0
+    outgoing_email = OutgoingEmail.objects.get()
+    assert outgoing_email.message["to"] == [user.email]
+
+    call_command("account_sendmail")
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == [user.email]
+    assert "Password Reset" in mailoutbox[0].subject
+    assert not OutgoingEmail.objects.exists()
+
+
+def test_outbox_rollback(db, outbox_backend):
+    msg = EmailMultiAlternatives("Subject", "Body", to=["john@example.com"])
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            mailkit.send(msg)
+            raise RuntimeError()
+    assert not OutgoingEmail.objects.exists()
+
+
+def test_outbox_on_commit(
+    db, outbox_backend, django_capture_on_commit_callbacks, monkeypatch
+):
+    committed = []
+    monkeypatch.setattr(
+        mailkit.OutboxMailBackend,
+        "on_commit",
+        lambda self, outgoing_email: committed.append(outgoing_email),
+    )
+    msg = EmailMultiAlternatives("Subject", "Body", to=["john@example.com"])
+    with django_capture_on_commit_callbacks(execute=True):
+        mailkit.send(msg)
+        assert committed == []
+    assert committed == [OutgoingEmail.objects.get()]
+
+
+def test_serialize_message():
+    msg = EmailMultiAlternatives(
+        "Subject",
+        "Body",
+        "from@example.com",
+        ["john@example.com"],
+        headers={"X-Foo": "bar"},
+    )
+    msg.attach_alternative("<p>Body</p>", "text/html")
+    msg.attach("data.bin", b"\x00\x01", "application/octet-stream")
+    data = mailkit.serialize_message(msg)
+    restored = mailkit.deserialize_message(data)
+    assert mailkit.serialize_message(restored) == data
+    assert restored.alternatives == [("<p>Body</p>", "text/html")]
+    assert restored.attachments == [
+        ("data.bin", b"\x00\x01", "application/octet-stream")
+    ]
+    assert restored.extra_headers == {"X-Foo": "bar"}
+
+
+def test_send_outbox_retries(db, outbox_backend, mailoutbox, monkeypatch):
+    mailkit.send(EmailMultiAlternatives("Subject", "Body", to=["john@example.com"]))
+
+    def fail(self, messages):
+        raise ConnectionError("Mail server unavailable")
+
+    with monkeypatch.context() as m:
+        m.setattr(EmailBackend, "send_messages", fail)
+        result = mailkit.send_outbox()
+    assert (result.sent, result.failed) == (0, 1)
+    outgoing_email = OutgoingEmail.objects.get()
+    assert outgoing_email.attempts == 1
+    assert "Mail server unavailable" in outgoing_email.last_error
+    assert outgoing_email.send_at > timezone.now()
+
+    # Not due yet.
+    assert mailkit.send_outbox().sent == 0
+
+    OutgoingEmail.objects.update(send_at=timezone.now() - timedelta(seconds=1))
+    assert mailkit.send_outbox().sent == 1
+    assert len(mailoutbox) == 1
+
+
+def test_send_outbox_gives_up(db, outbox_backend, mailoutbox):
+    mailkit.send(EmailMultiAlternatives("Subject", "Body", to=["john@example.com"]))
+    OutgoingEmail.objects.update(attempts=mailkit.MAX_ATTEMPTS)
+    result = mailkit.send_outbox()
+    assert (result.sent, result.failed) == (0, 0)
+    assert OutgoingEmail.objects.exists()
+    assert len(mailoutbox) == 0
+
+
+def test_send_outbox_batches(db, outbox_backend, mailoutbox, monkeypatch):
+    for i in range(5):
+        mailkit.send(EmailMultiAlternatives("Subject", "Body", to=[f"{i}@example.com"]))
+    opened = []
+    open_connection = EmailBackend.open
+    monkeypatch.setattr(
+        EmailBackend,
+        "open",
+        lambda self: opened.append(self) or open_connection(self),
+    )
+    result = mailkit.send_outbox(batch_size=2)
+    assert result.sent == 5
+    assert len(opened) == 3
+    assert [m.to[0] for m in mailoutbox] == [f"{i}@example.com" for i in range(5)]
+
+
+def test_batch(db, mailoutbox, monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        mailkit.ImmediateMailBackend,
+        "send_messages",
+        lambda self, msgs: sent.append(list(msgs)),
+    )
+    with mailkit.batch():
+        mailkit.send(EmailMultiAlternatives("One", "Body", to=["john@example.com"]))
+        with mailkit.batch():
+            mailkit.send(EmailMultiAlternatives("Two", "Body", to=["john@example.com"]))
+        assert sent == []
+    assert [[m.subject for m in msgs] for msgs in sent] == [["One", "Two"]]
+
+
+class SiteLoader(FilesystemLoader):
+    """
+    Resolves templates from a directory per site.
+    """
+
+    site_dirs: Dict[str, str] = {}
+    current_site = None
+
+    def get_dirs(self):
+        return [self.site_dirs[self.current_site]]
+
+
+def test_mail_templates_per_site(settings, tmp_path, monkeypatch):
+    for site, names in [
+        ("text", ["message.txt"]),
+        ("html", ["message.html", "message.txt"]),
+    ]:
+        (tmp_path / site / "account" / "email").mkdir(parents=True)
+        for name in ["subject.txt"] + names:
+            (tmp_path / site / "account" / "email" / f"greeting_{name}").write_text(
+                name
+            )
+        monkeypatch.setitem(SiteLoader.site_dirs, site, str(tmp_path / site))
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {"loaders": [f"{__name__}.SiteLoader"]},
+        }
+    ]
+    for site, exts in [
+        ("text", ["txt"]),
+        ("html", ["html", "txt"]),
+        ("text", ["txt"]),
+    ]:
+        monkeypatch.setattr(SiteLoader, "current_site", site)
+        mail_templates = mailkit.get_mail_templates("account/email/greeting")
+        assert list(mail_templates.bodies) == exts
+
+
+def test_mail_templates_html_only(settings, tmp_path):
+    (tmp_path / "account" / "email").mkdir(parents=True)
+    for name, content in [("subject.txt", "Hi"), ("message.html", "<p>Hello</p>")]:
+        (tmp_path / "account" / "email" / f"greeting_{name}").write_text(content)
+    settings.TEMPLATES = [
+        {
+            **settings.TEMPLATES[0],
+            "DIRS": [str(tmp_path)] + list(settings.TEMPLATES[0].get("DIRS", [])),
+        }
+    ]
+    mail_templates = mailkit.get_mail_templates("account/email/greeting")
+    assert list(mail_templates.bodies) == ["html"]
+    with pytest.raises(TemplateDoesNotExist):
+        mailkit.get_mail_templates("account/email/nonexistent")
+
+
+def test_send_outbox_skips_mails_claimed_elsewhere(
+    db, outbox_backend, mailoutbox, monkeypatch
+):
+    for i in range(2):
+        mailkit.send(EmailMultiAlternatives("Subject", "Body", to=[f"{i}@example.com"]))
+    # Have the claim expire right away, so that it is extended for each mail.
+    monkeypatch.setattr(mailkit, "CLAIM_TIMEOUT", 0)
+    send_messages = EmailBackend.send_messages
+
+    def send_then_lose_claim(self, messages):
+        # Meanwhile, another worker claims the remaining mail.
+        OutgoingEmail.objects.exclude(message__to=messages[0].to).update(
+            send_at=timezone.now() + timedelta(minutes=1)
+        )
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", send_then_lose_claim)
+    result = mailkit.send_outbox()
+    assert (result.sent, result.failed) == (1, 0)
+    assert [m.to for m in mailoutbox] == [["0@example.com"]]
+    assert OutgoingEmail.objects.get().message["to"] == ["1@example.com"]
+
+
+def test_claim_batch_skips_mails_claimed_concurrently(db, outbox_backend, monkeypatch):
+    for i in range(2):
+        mailkit.send(EmailMultiAlternatives("Subject", "Body", to=[f"{i}@example.com"]))
+    get_due_pks = mailkit._get_due_pks
+
+    def claim_first_elsewhere(now, batch_size):
+        pks = get_due_pks(now, batch_size)
+        # Another worker claims the first mail after it was selected.
+        OutgoingEmail.objects.filter(pk=pks[0]).update(
+            send_at=timezone.now() + timedelta(minutes=1)
+        )
+        return pks
+
+    monkeypatch.setattr(mailkit, "_get_due_pks", claim_first_elsewhere)
+    batch = mailkit.claim_batch(10)
+    assert [e.message["to"] for e in batch] == [["1@example.com"]]
+
+
+def test_fail_keeps_claim_of_other_worker(db, outbox_backend):
+    mailkit.send(EmailMultiAlternatives("Subject", "Body", to=["john@example.com"]))
+    (outgoing_email,) = mailkit.claim_batch(10)
+    # The claim expired, and another worker claimed the mail.
+    claimed_until = timezone.now() + timedelta(minutes=10)
+    OutgoingEmail.objects.update(send_at=claimed_until)
+    mailkit._fail(outgoing_email, ConnectionError("Mail server unavailable"))
+    outgoing_email = OutgoingEmail.objects.get()
+    assert outgoing_email.attempts == 0
+    assert outgoing_email.send_at == claimed_until
+
+
+def test_purge_outbox(db, outbox_backend):
+    for attempts in [0, mailkit.MAX_ATTEMPTS]:
+        mailkit.send(EmailMultiAlternatives("Subject", "Body", to=["john@example.com"]))
+        OutgoingEmail.objects.filter(pk=OutgoingEmail.objects.latest("pk").pk).update(
+            attempts=attempts, created_at=timezone.now() - timedelta(days=8)
+        )
+    assert mailkit.purge_outbox(older_than=timedelta(days=9)) == 0
+    assert mailkit.purge_outbox(older_than=timedelta(days=7)) == 1
+    assert OutgoingEmail.objects.get().attempts == 0
+
+
+def test_outbox_admin(rf, admin_user):
+    # Only registered when the outbox is used.
+    assert not admin.site.is_registered(OutgoingEmail)
+    request = rf.get("/")
+    request.user = admin_user
+    model_admin = OutgoingEmailAdmin(OutgoingEmail, admin.site)
+    assert "message" not in model_admin.get_fields(request)
+    assert not model_admin.has_add_permission(request)
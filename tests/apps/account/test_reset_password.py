@@ -3,6 +3,7 @@ import json
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.urls import reverse, reverse_lazy
@@ -355,3 +356,30 @@ def test_reset_password_from_key_next_url(
     resp = client.post(resp["location"], data)
     assert resp.status_code == 302
     assert resp["location"] == expected_location
+
+
+def test_reset_password_mails_sent_over_one_connection(
+    client, user_factory, mailoutbox, monkeypatch
+):
+    users = [
+        user_factory(email="shared@example.com", email_verified=False) for _ in range(3)
+    ]
+    connections = []
+    send_messages = EmailBackend.send_messages
+    monkeypatch.setattr(
+        EmailBackend,
+        "send_messages",
+        lambda self, messages: connections.append(self)
+        or send_messages(self, messages),
+    )
+    resp = client.post(
+        reverse("account_reset_password"), {"email": "shared@example.com"}
+    )
+    assert resp.status_code == 302
+    assert len(connections) == 1
+    assert len(mailoutbox) == 3
+    urls = {
+        next(line for line in m.body.splitlines() if "/password/reset/key/" in line)
+        for m in mailoutbox
+    }
+    assert len(urls) == len(users)
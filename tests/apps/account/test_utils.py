@@ -18,6 +18,7 @@ import allauth.app_settings
 from allauth.account.adapter import get_adapter
 from allauth.account.models import EmailAddress
 from allauth.account.utils import (
+    filter_users_by_email,
     filter_users_by_username,
     url_str_to_user_pk,
     user_pk_to_url_str,
@@ -133,3 +134,42 @@ def test_redirect_noreversematch(auth_client):
     # `NoReverseMatch`, resulting in 500s.
     resp = auth_client.post(reverse("account_logout") + "?next=badurlname")
     assert resp["location"] == "/badurlname"
+
+
+def test_filter_users_by_email(user_factory, django_assert_num_queries):
+    email = "shared@example.com"
+    by_address = user_factory(email="other@example.com", email_verified=False)
+    EmailAddress.objects.create(user=by_address, email=email)
+    by_user_email = user_factory(email=email, with_emailaddress=False)
+    by_both = user_factory(email=email, email_verified=False)
+    inactive = user_factory(email=email, email_verified=False)
+    inactive.is_active = False
+    inactive.save()
+    user_factory()
+
+    with django_assert_num_queries(1):
+        users = filter_users_by_email("Shared@Example.com")
+    assert {u.pk for u in users} == {
+        by_address.pk,
+        by_user_email.pk,
+        by_both.pk,
+        inactive.pk,
+    }
+    users = filter_users_by_email(email, is_active=True)
+    assert inactive.pk not in {u.pk for u in users}
+
+
+def test_filter_users_by_email_ordered_user_model(user_factory, monkeypatch):
+    # Not all databases support ordering the parts of a compound (UNION) query.
+    monkeypatch.setattr(get_user_model()._meta, "ordering", ["username"])
+    user = user_factory(email="john@example.com")
+    assert filter_users_by_email("john@example.com") == [user]
+
+
+def test_filter_users_by_email_prefer_verified(user_factory):
+    email = "shared@example.com"
+    unverified = user_factory(email=email, email_verified=False)
+    assert filter_users_by_email(email, prefer_verified=True) == [unverified]
+    verified = user_factory(email=email, email_verified=True)
+    assert filter_users_by_email(email, prefer_verified=True) == [verified]
+    assert len(filter_users_by_email(email)) == 2
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from allauth.account.adapter import DefaultAccountAdapter, get_adapter
+from allauth.core import context
+
+
+class PerRequestAdapter(DefaultAccountAdapter):
+    per_request = True
+
+
+def test_adapter_class_cached(settings):
+    get_adapter()
+    with patch("allauth.utils.import_attribute") as import_attribute:
+        assert isinstance(get_adapter(), DefaultAccountAdapter)
+    import_attribute.assert_not_called()
+    settings.ACCOUNT_ADAPTER = "tests.apps.core.internal.test_adapter.PerRequestAdapter"
+    assert isinstance(get_adapter(), PerRequestAdapter)
+
+
+def test_adapter_per_request(settings, rf):
+    request = rf.get("/")
+    request.allauth = SimpleNamespace()
+    with context.request_context(request):
+        assert get_adapter() is not get_adapter()
+        settings.ACCOUNT_ADAPTER = (
+            "tests.apps.core.internal.test_adapter.PerRequestAdapter"
+        )
+        adapter = get_adapter()
+        assert get_adapter() is adapter
+        assert get_adapter(request) is adapter
+        assert get_adapter(rf.get("/")) is not adapter
+    other_request = rf.get("/")
+    other_request.allauth = SimpleNamespace()
+    with context.request_context(other_request):
+        assert get_adapter() is not adapter
@@ -1,5 +1,12 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+
 import pytest
 
+from allauth.core.exceptions import RateLimited
 from allauth.core.internal import ratelimit
 
 
@@ -38,3 +45,150 @@ def test_parse(rate, values):
         assert rate.amount == values[i][0]
         assert rate.duration == values[i][1]
         assert rate.per == values[i][2]
+
+
+def test_sliding_window(enable_cache):
+    engine = ratelimit.SlidingWindowCounterEngine()
+    rate = ratelimit.Rate(2, 60, "ip")
+    with patch("allauth.core.internal.ratelimit.time.time", return_value=6030):
+        assert engine.consume("k", rate)
+        assert engine.consume("k", rate)
+        assert engine.consume("k", rate) is None
+    # Halfway the next window, the previous window counts for 50%.
+    with patch("allauth.core.internal.ratelimit.time.time", return_value=6090):
+        assert engine.consume("k", rate)
+        assert engine.consume("k", rate) is None
+    # Two windows later, the previous window has no hits.
+    with patch("allauth.core.internal.ratelimit.time.time", return_value=6180):
+        assert engine.consume("k", rate)
+        assert engine.consume("k", rate)
+        assert engine.consume("k", rate) is None
+
+
+def test_constant_space(enable_cache):
+    engine = ratelimit.SlidingWindowCounterEngine()
+    rate = ratelimit.Rate(1000, 60, "ip")
+    with patch("allauth.core.internal.ratelimit.time.time", return_value=6030):
+        for i in range(100):
+            hit = engine.consume("k", rate)
+        assert cache.get(hit) == 100
+
+
+def test_dry_run_and_clear(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "1/m/ip"}
+    assert ratelimit.consume(request, config=config, action="foo", dry_run=True)
+    assert ratelimit.consume(request, config=config, action="foo")
+    assert not ratelimit.consume(request, config=config, action="foo", dry_run=True)
+    ratelimit.clear(request, config=config, action="foo")
+    assert ratelimit.consume(request, config=config, action="foo")
+
+
+def test_denied_hit_not_counted(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "1/m/ip"}
+    usage = ratelimit.consume(request, config=config, action="foo")
+    for i in range(3):
+        assert not ratelimit.consume(request, config=config, action="foo")
+    usage.rollback()
+    assert ratelimit.consume(request, config=config, action="foo")
+
+
+def test_raise_exception(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "1/m/ip"}
+    ratelimit.consume(request, config=config, action="foo", raise_exception=True)
+    with pytest.raises(RateLimited):
+        ratelimit.consume(request, config=config, action="foo", raise_exception=True)
+
+
+class NeverEngine(ratelimit.RateLimitEngine):
+    def consume(self, cache_key, rate, *, dry_run=False):
+        return None
+
+
+def test_custom_engine(rf, settings):
+    settings.ALLAUTH_RATE_LIMIT_ENGINE = (
+        "tests.apps.core.internal.test_ratelimit.NeverEngine"
+    )
+    request = rf.post("/")
+    assert not ratelimit.consume(request, config={"foo": "5/m/ip"}, action="foo")
+
+
+def test_multiple_rates_single_read(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "3/m/ip,2/5m/key"}
+    spy = Mock(wraps=caches["default"])
+    with patch("allauth.core.internal.ratelimit.cache", spy):
+        assert ratelimit.consume(request, config=config, action="foo", key="k")
+    assert spy.get_many.call_count == 1
+    assert spy.get.call_count == 0
+
+
+def test_multiple_rates_all_or_nothing(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "3/m/ip,1/5m/key"}
+    assert ratelimit.consume(request, config=config, action="foo", key="a")
+    # The key rate is exhausted, so the IP rate is not consumed either.
+    for i in range(3):
+        assert not ratelimit.consume(request, config=config, action="foo", key="a")
+    assert ratelimit.consume(request, config=config, action="foo", key="b")
+    assert ratelimit.consume(request, config=config, action="foo", key="c")
+    assert not ratelimit.consume(request, config=config, action="foo", key="d")
+
+
+def test_compiled_config(settings):
+    from allauth.account import app_settings
+
+    settings.ACCOUNT_RATE_LIMITS = {"login": "3/m/ip,1/5m/key"}
+    config = ratelimit.get_config(app_settings)
+    assert config["login"] == ((3, 60, "ip"), (1, 300, "key"))
+    assert ratelimit.get_config(app_settings) is config
+    settings.ACCOUNT_RATE_LIMITS = {"login": "4/m/ip"}
+    assert ratelimit.get_config(app_settings)["login"] == ((4, 60, "ip"),)
+
+
+@pytest.mark.asyncio
+async def test_aconsume_shares_keys_with_consume(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,3/m/key"}
+    usage = await ratelimit.aconsume(request, config=config, action="foo", key="k")
+    assert usage
+    assert ratelimit.consume(request, config=config, action="foo", key="k")
+    assert not await ratelimit.aconsume(request, config=config, action="foo", key="k")
+    await usage.arollback()
+    assert ratelimit.consume(request, config=config, action="foo", key="k")
+    await ratelimit.aclear(request, config=config, action="foo", key="k")
+    assert await ratelimit.aconsume(request, config=config, action="foo", key="k")
+
+
+@pytest.mark.asyncio
+async def test_aconsume_per_user(rf, enable_cache):
+    request = rf.post("/")
+    request.user = AnonymousUser()
+    with pytest.raises(ImproperlyConfigured):
+        await ratelimit.aconsume(request, config={"foo": "1/m/user"}, action="foo")
+
+
+def test_events(rf, enable_cache):
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,1/m/key"}
+    stats = ratelimit.RateLimitStats()
+    stats.connect()
+    try:
+        usage = ratelimit.consume(request, config=config, action="foo", key="a")
+        assert not ratelimit.consume(request, config=config, action="foo", key="a")
+        usage.rollback()
+        assert ratelimit.consume(request, config=config, action="foo", key="b")
+        ratelimit.consume(request, config=config, action="foo", key="c", dry_run=True)
+    finally:
+        stats.disconnect()
+    assert stats.snapshot() == {
+        ("foo", "2/60s/ip", "allowed"): 2,
+        ("foo", "1/60s/key", "allowed"): 2,
+        ("foo", "1/60s/key", "denied"): 1,
+        ("foo", "2/60s/ip", "rolled_back"): 1,
+        ("foo", "1/60s/key", "rolled_back"): 1,
+    }
+    ratelimit.consume(request, config=config, action="foo", key="d")
+    assert len(stats.snapshot()) == 5
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from allauth.account import app_settings
+
+
+def test_snapshot(settings):
+    settings.ACCOUNT_PREVENT_ENUMERATION = "strict"
+    assert app_settings.PREVENT_ENUMERATION == "strict"
+    with patch("allauth.utils.get_setting") as get_setting:
+        assert app_settings.PREVENT_ENUMERATION == "strict"
+    get_setting.assert_not_called()
+    settings.ACCOUNT_PREVENT_ENUMERATION = False
+    assert app_settings.PREVENT_ENUMERATION is False
+
+
+def test_mutable_values_not_cached(settings):
+    settings.ACCOUNT_RATE_LIMITS = {"login": "1/m"}
+    app_settings.RATE_LIMITS["login"] = "2/m"
+    assert app_settings.RATE_LIMITS["login"] == "1/m"
+
+
+def test_snapshot_disabled(settings):
+    settings.ALLAUTH_CACHE_SETTINGS = False
+    assert app_settings.PREVENT_ENUMERATION is True
+    with patch("allauth.utils.get_setting", return_value="strict"):
+        assert app_settings.PREVENT_ENUMERATION == "strict"
+
+
+def test_snapshot_disabled_for_setting_getter(settings):
+    settings.ALLAUTH_SETTING_GETTER = lambda name, dflt: (
+        "strict" if name == "ACCOUNT_PREVENT_ENUMERATION" else dflt
+    )
+    assert app_settings.PREVENT_ENUMERATION == "strict"
+    with patch("allauth.utils.get_setting", return_value=False):
+        assert app_settings.PREVENT_ENUMERATION is False
+
+
+def test_plain_data_served_from_snapshot(settings):
+    settings.ACCOUNT_SIGNUP_FIELDS = ["email*", "password1*"]
+    assert app_settings.LOGIN_METHODS == {app_settings.LoginMethod.USERNAME}
+    fields = app_settings.SIGNUP_FIELDS
+    assert fields == {"email": {"required": True}, "password1": {"required": True}}
+    with patch("allauth.utils.get_setting") as get_setting:
+        assert app_settings.LOGIN_METHODS == {app_settings.LoginMethod.USERNAME}
+        fields["email"]["required"] = False
+        assert app_settings.SIGNUP_FIELDS["email"]["required"] is True
+        assert app_settings.SIGNUP_FIELDS is not app_settings.SIGNUP_FIELDS
+    get_setting.assert_not_called()
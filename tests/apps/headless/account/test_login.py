@@ -1,9 +1,19 @@
-from unittest.mock import ANY
+from contextlib import contextmanager
+from unittest.mock import ANY, patch
+
+from django.contrib.auth import get_user_model
+from django.urls import URLResolver, get_resolver, reverse
 
 import pytest
+from asgiref.sync import iscoroutinefunction
 
+from allauth.account.adapter import DefaultAccountAdapter
+from allauth.account.internal import flows
 from allauth.account.signals import user_logged_in
+from allauth.headless.account.urls import build_urlpatterns
+from allauth.headless.account.views import AsyncLoginView, LoginView
 from allauth.headless.base.response import AuthenticationResponse
+from allauth.headless.internal import authkit
 
 
 def test_auth_password_input_error(headless_reverse, client):
@@ -213,3 +223,192 @@ def test_custom_post_login_response(
         assert login_resp.status_code == 200
     finally:
         user_logged_in.disconnect(on_user_logged_in)
+
+
+def patch_login_view(monkeypatch):
+    """
+    Serves the login endpoints using ``AsyncLoginView``, as done when
+    ``HEADLESS_ASYNC_LOGIN`` is enabled.
+    """
+
+    patched = []
+
+    def patch_patterns(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                patch_patterns(pattern.url_patterns)
+            elif getattr(pattern.callback, "view_class", None) is LoginView:
+                view = AsyncLoginView.as_api_view(**pattern.callback.view_initkwargs)
+                monkeypatch.setattr(pattern, "callback", view)
+                patched.append(pattern)
+
+    patch_patterns(get_resolver().url_patterns)
+    assert patched
+
+
+@pytest.fixture
+def async_login_view(monkeypatch):
+    patch_login_view(monkeypatch)
+
+
+def test_async_login_urlpatterns(settings):
+    settings.HEADLESS_ASYNC_LOGIN = True
+    for client in ["app", "browser"]:
+        patterns = build_urlpatterns(client)[0].url_patterns
+        view = next(p.callback for p in patterns if getattr(p, "name", None) == "login")
+        assert iscoroutinefunction(view)
+        assert getattr(view, "csrf_exempt", False) == (client == "app")
+
+
+def test_async_login(
+    client, user, user_password, settings, headless_reverse, async_login_view
+):
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": "wrong"},
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["code"] == "email_password_mismatch"
+
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": user_password},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert resp.json()["data"]["user"]["id"] == user.pk
+    resp = client.get(
+        headless_reverse("headless:account:current_session"),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert resp.json()["meta"]["is_authenticated"]
+
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": user_password},
+        content_type="application/json",
+    )
+    assert resp.status_code == 409
+
+
+def test_async_login_conflict(
+    client, user, user_password, settings, headless_reverse, async_login_view
+):
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": user_password},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    with patch.object(DefaultAccountAdapter, "aauthenticate") as aauthenticate:
+        resp = client.post(
+            headless_reverse("headless:account:login"),
+            data={"email": user.email, "password": user_password},
+            content_type="application/json",
+        )
+    assert resp.status_code == 409
+    assert not aauthenticate.called
+
+
+class CustomAuthenticateAdapter(DefaultAccountAdapter):
+    def authenticate(self, request, **credentials):
+        if credentials.get("password") == "backdoor":
+            return get_user_model().objects.get(email=credentials["email"])
+        return super().authenticate(request, **credentials)
+
+
+def test_async_login_custom_authenticate(
+    client, user, settings, headless_reverse, async_login_view
+):
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    settings.ACCOUNT_ADAPTER = (
+        "tests.apps.headless.account.test_login.CustomAuthenticateAdapter"
+    )
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": "backdoor"},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert resp.json()["data"]["user"]["id"] == user.pk
+
+
+def test_async_login_rate_limited(
+    client, user, settings, headless_reverse, async_login_view, enable_cache
+):
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    settings.ACCOUNT_RATE_LIMITS = {"login_failed": "1/m/key"}
+    for expected_code in ["email_password_mismatch", "too_many_login_attempts"]:
+        resp = client.post(
+            headless_reverse("headless:account:login"),
+            data={"email": user.email, "password": "wrong"},
+            content_type="application/json",
+        )
+        assert resp.status_code == 400
+        assert resp.json()["errors"][0]["code"] == expected_code
+
+
+def test_async_login_method_not_allowed(client, headless_reverse, async_login_view):
+    resp = client.get(headless_reverse("headless:account:login"))
+    assert resp.status_code == 405
+
+
+def test_async_login_authentication_context(
+    client, user, user_password, settings, async_login_view, monkeypatch
+):
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    entered = []
+    authentication_context = authkit.authentication_context
+
+    @contextmanager
+    def record_authentication_context(request):
+        with authentication_context(request):
+            entered.append(request.session)
+            yield
+
+    async def aauthenticate(self, request, **credentials):
+        # Authenticated within the (single) authentication context.
+        assert request.session is entered[-1]
+        return await adapter_aauthenticate(self, request, **credentials)
+
+    adapter_aauthenticate = DefaultAccountAdapter.aauthenticate
+    monkeypatch.setattr(
+        authkit, "authentication_context", record_authentication_context
+    )
+    monkeypatch.setattr(DefaultAccountAdapter, "aauthenticate", aauthenticate)
+    resp = client.post(
+        reverse("headless:app:account:login"),
+        data={"email": user.email, "password": user_password},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert resp.json()["meta"]["session_token"]
+    assert len(entered) == 1
+
+
+@pytest.mark.parametrize("async_login", [False, True])
+def test_login_verification_rate_limited(
+    client, user, user_password, settings, headless_reverse, monkeypatch, async_login
+):
+    if async_login:
+        patch_login_view(monkeypatch)
+    settings.ACCOUNT_LOGIN_METHODS = {"email"}
+    monkeypatch.setattr(
+        flows.login, "is_login_rate_limited", lambda request, login: True
+    )
+    resp = client.post(
+        headless_reverse("headless:account:login"),
+        data={"email": user.email, "password": user_password},
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+    assert resp.json()["errors"] == [
+        {
+            "message": "Too many failed login attempts. Try again later.",
+            "code": "too_many_login_attempts",
+        }
+    ]
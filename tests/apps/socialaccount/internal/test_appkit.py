@@ -0,0 +1,48 @@
+from django.contrib.sites.models import Site
+
+import pytest
+
+from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.models import SocialApp
+
+
+@pytest.fixture
+def app(db):
+    app = SocialApp.objects.create(
+        provider="openid_connect",
+        provider_id="db-server",
+        name="DB Server",
+        client_id="client-id",
+    )
+    app.sites.add(Site.objects.get_current())
+    return app
+
+
+def test_list_apps_is_cached(app, rf, django_assert_num_queries):
+    request = rf.get("/")
+    get_adapter().list_apps(request)
+    with django_assert_num_queries(0):
+        assert get_adapter().get_app(request, "db-server").pk == app.pk
+        assert get_adapter().list_apps(request, client_id="client-id") == [app]
+        assert app in get_adapter().list_apps(request, provider="openid_connect")
+        assert get_adapter().list_apps(request, client_id="other") == []
+        assert get_adapter().list_apps(request, provider="google") == []
+
+
+def test_list_apps_returns_fresh_instances(app, rf):
+    request = rf.get("/")
+    get_adapter().get_app(request, "db-server").settings["foo"] = "bar"
+    assert get_adapter().get_app(request, "db-server").settings == {}
+
+
+def test_invalidated_on_change(app, rf):
+    request = rf.get("/")
+    assert get_adapter().get_app(request, "db-server").name == "DB Server"
+    app.name = "Renamed"
+    app.save()
+    assert get_adapter().get_app(request, "db-server").name == "Renamed"
+    app.sites.clear()
+    assert get_adapter().list_apps(request, provider="db-server") == []
+    assert get_adapter().list_apps(None, provider="db-server") == [app]
+    app.delete()
+    assert get_adapter().list_apps(None, provider="db-server") == []
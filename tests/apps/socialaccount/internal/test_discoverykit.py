@@ -0,0 +1,83 @@
+import requests
+
+from allauth.socialaccount.internal import discoverykit
+from allauth.tests import mocked_response
+
+
+SERVER_URL = "https://oidc.test/.well-known/openid-configuration"
+
+
+def test_get_openid_configuration(enable_cache):
+    with mocked_response({"issuer": "https://oidc.test"}):
+        for _ in range(2):
+            config = discoverykit.get_openid_configuration(SERVER_URL)
+            assert config == {"issuer": "https://oidc.test"}
+        assert requests.Session.get.call_count == 1
+
+    # Other processes pick up the document from the Django cache.
+    discoverykit.clear_documents()
+    with mocked_response():
+        config = discoverykit.get_openid_configuration(SERVER_URL)
+        assert config == {"issuer": "https://oidc.test"}
+        assert requests.Session.get.call_count == 0
+
+
+def test_refresh_in_background(settings, monkeypatch):
+    settings.SOCIALACCOUNT_OPENID_CONNECT_DISCOVERY_MAX_AGE = 60
+    threads = []
+    refresh_in_background = discoverykit._refresh_in_background
+    monkeypatch.setattr(
+        discoverykit,
+        "_refresh_in_background",
+        lambda server_url: threads.append(refresh_in_background(server_url)),
+    )
+    with mocked_response({"issuer": "v1"}, {"issuer": "v2"}):
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+        discoverykit._documents[SERVER_URL].fetched_at -= 60
+
+        # Expired, served while refreshing in the background.
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+        threads[0].join()
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v2"
+        assert requests.Session.get.call_count == 2
+
+
+def test_refresh_in_background_backs_off(settings, monkeypatch):
+    settings.SOCIALACCOUNT_OPENID_CONNECT_DISCOVERY_MAX_AGE = 60
+    threads = []
+    refresh_in_background = discoverykit._refresh_in_background
+    monkeypatch.setattr(
+        discoverykit,
+        "_refresh_in_background",
+        lambda server_url: threads.append(refresh_in_background(server_url)),
+    )
+    with mocked_response({"issuer": "v1"}):
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+    document = discoverykit._documents[SERVER_URL]
+    document.fetched_at -= 60
+
+    def unavailable(*args, **kwargs):
+        raise requests.ConnectionError("Provider unavailable")
+
+    with mocked_response(callback=unavailable):
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+        threads[0].join()
+        # The provider is down, do not retry right away.
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+        assert len(threads) == 1
+        assert requests.Session.get.call_count == 1
+
+    document.failed_at -= discoverykit.DISCOVERY_RETRY_INTERVAL
+    with mocked_response({"issuer": "v2"}):
+        discoverykit.get_openid_configuration(SERVER_URL)
+        threads[1].join()
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v2"
+
+
+def test_refresh_when_too_old(settings):
+    settings.SOCIALACCOUNT_OPENID_CONNECT_DISCOVERY_MAX_AGE = 60
+    with mocked_response({"issuer": "v1"}, {"issuer": "v2"}):
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v1"
+        discoverykit._documents[SERVER_URL].fetched_at -= 120
+        assert discoverykit.get_openid_configuration(SERVER_URL)["issuer"] == "v2"
+        assert not discoverykit._refreshing
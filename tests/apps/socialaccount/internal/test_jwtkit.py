@@ -1,10 +1,20 @@
+import json
+import requests
+import time
 from datetime import timedelta
 
 from django.utils import timezone
 
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from allauth.socialaccount.internal import jwtkit
 from allauth.socialaccount.internal.jwtkit import verify_and_decode
 from allauth.socialaccount.providers.apple.client import jwt_encode
 from allauth.socialaccount.providers.oauth2.client import OAuth2Error
+from allauth.tests import MockedResponse, mocked_response
 
 
 def test_verify_and_decode(enable_cache):
@@ -34,3 +44,109 @@ def test_verify_and_decode(enable_cache):
             assert attempt == 0
         except OAuth2Error:
             assert attempt == 1
+
+
+@pytest.fixture
+def rsa_key():
+    def f(kid):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+        return private_key, jwk
+
+    return f
+
+
+@pytest.fixture
+def id_token():
+    def f(private_key, kid):
+        now = timezone.now()
+        payload = {
+            "iss": "https://idp.test",
+            "aud": "client_id",
+            "sub": "123",
+            "iat": now,
+            "exp": now + timedelta(hours=1),
+        }
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+    return f
+
+
+def _verify(credential):
+    return jwtkit.verify_and_decode(
+        credential=credential,
+        keys_url="https://idp.test/jwks",
+        issuer="https://idp.test",
+        audience="client_id",
+        lookup_kid=jwtkit.lookup_kid_jwk,
+    )
+
+
+def test_keys_are_cached(enable_cache, rsa_key, id_token):
+    private_key, jwk = rsa_key("k1")
+    token = id_token(private_key, "k1")
+    with mocked_response(
+        MockedResponse(200, {"keys": [jwk]}, {"Cache-Control": "max-age=600"})
+    ):
+        assert _verify(token)["sub"] == "123"
+        assert requests.Session.get.call_count == 1
+        assert _verify(token)["sub"] == "123"
+        assert requests.Session.get.call_count == 1
+
+    # Other processes pick up the keys from the Django cache.
+    jwtkit.clear_keys()
+    assert _verify(token)["sub"] == "123"
+
+
+def test_unknown_kid_refreshes_keys(enable_cache, rsa_key, id_token):
+    private_key, jwk = rsa_key("k1")
+    rotated_private_key, rotated_jwk = rsa_key("k2")
+    with mocked_response({"keys": [jwk]}):
+        _verify(id_token(private_key, "k1"))
+
+    # Refreshing is rate limited.
+    with mocked_response({"keys": [jwk, rotated_jwk]}):
+        with pytest.raises(OAuth2Error):
+            _verify(id_token(rotated_private_key, "k2"))
+        assert requests.Session.get.call_count == 0
+
+    jwtkit._key_sets[
+        "https://idp.test/jwks"
+    ].fetched_at -= jwtkit.KEYS_MIN_REFRESH_INTERVAL
+    with mocked_response({"keys": [jwk, rotated_jwk]}):
+        assert _verify(id_token(rotated_private_key, "k2"))["sub"] == "123"
+        assert requests.Session.get.call_count == 1
+
+
+def test_stale_keys_on_fetch_error(rsa_key, id_token):
+    private_key, jwk = rsa_key("k1")
+    token = id_token(private_key, "k1")
+    with mocked_response({"keys": [jwk]}):
+        _verify(token)
+    key_set = jwtkit._key_sets["https://idp.test/jwks"]
+    key_set.expires_at = key_set.fetched_at = time.time() - 3600
+    with mocked_response(MockedResponse(503, "Unavailable")):
+        assert _verify(token)["sub"] == "123"
+        assert requests.Session.get.call_count == 1
+
+    key_set.expires_at -= jwtkit.KEYS_MAX_STALE
+    key_set.fetched_at -= jwtkit.KEYS_MIN_REFRESH_INTERVAL
+    with mocked_response(MockedResponse(503, "Unavailable")):
+        with pytest.raises(ValueError):
+            _verify(token)
+
+
+@pytest.mark.parametrize(
+    "cache_control,max_age",
+    [
+        (None, jwtkit.KEYS_DEFAULT_MAX_AGE),
+        ("public, max-age=19652, must-revalidate", 19652),
+        ("max-age=invalid", jwtkit.KEYS_DEFAULT_MAX_AGE),
+        ("no-store", 0),
+        ("max-age=99999999", jwtkit.KEYS_MAX_MAX_AGE),
+    ],
+)
+def test_get_max_age(cache_control, max_age):
+    headers = {"Cache-Control": cache_control} if cache_control else {}
+    assert jwtkit.get_max_age(MockedResponse(200, "", headers)) == max_age
@@ -0,0 +1,61 @@
+import threading
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import requestskit
+
+
+class StandInAdapter(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append((request, kwargs))
+        response = Response()
+        response.status_code = 200
+        response.headers["Set-Cookie"] = "sessionid=secret; Path=/"
+        response._content = b"{}"
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_session_is_shared():
+    assert get_adapter().get_requests_session() is requestskit.get_session()
+    assert requestskit.get_session() is requestskit.get_session()
+
+
+def test_session_per_thread():
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(requestskit.get_session()))
+    thread.start()
+    thread.join()
+    assert sessions[0] is not requestskit.get_session()
+    assert sessions[0].get_adapter("https://") is requestskit.get_session().get_adapter(
+        "https://"
+    )
+
+
+def test_timeout_and_cookies(settings):
+    settings.SOCIALACCOUNT_REQUESTS_TIMEOUT = 3
+    http_adapter = StandInAdapter()
+    with requestskit.override_http_adapter(http_adapter):
+        session = get_adapter().get_requests_session()
+        assert session.get("https://provider.test/me").json() == {}
+        session.get("https://provider.test/me", timeout=7)
+    assert [kwargs["timeout"] for _, kwargs in http_adapter.requests] == [3, 7]
+    assert "Cookie" not in http_adapter.requests[1][0].headers
+    assert not session.cookies
+
+
+def test_reset_on_setting_changed(settings):
+    session = requestskit.get_session()
+    settings.SOCIALACCOUNT_REQUESTS_POOL_MAXSIZE = 3
+    new_session = requestskit.get_session()
+    assert new_session is not session
+    assert new_session.get_adapter("https://")._pool_maxsize == 3
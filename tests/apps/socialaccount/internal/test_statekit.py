@@ -1,4 +1,9 @@
 import time
+from urllib.parse import parse_qs, urlparse
+
+from django.urls import reverse
+
+import pytest
 
 from allauth.socialaccount.internal import statekit
 
@@ -55,3 +60,62 @@ def test_stashing(rf):
     assert state == {"foo": "bar"}
     state = statekit.unstash_state(request, state_id)
     assert state is None
+
+
+@pytest.fixture
+def cache_state_backend(settings, enable_cache):
+    settings.SOCIALACCOUNT_STATE_BACKEND = (
+        "allauth.socialaccount.internal.statekit.CacheStateBackend"
+    )
+
+
+def test_cache_backend_stashing(rf, cache_state_backend):
+    request = rf.get("/")
+    request.session = {}
+    state_id = statekit.stash_state(request, {"foo": "bar"})
+    state2_id = statekit.stash_state(request, {"foo2": "bar2"})
+    assert statekit.STATES_SESSION_KEY not in request.session
+
+    assert statekit.unstash_state(request, state_id) == {"foo": "bar"}
+    assert statekit.unstash_state(request, state_id) is None
+    assert statekit.unstash_last_state(request) == {"foo2": "bar2"}
+    assert statekit.unstash_state(request, state2_id) is None
+    assert statekit.unstash_last_state(request) is None
+
+
+def test_cache_backend_bound_to_session(rf, cache_state_backend):
+    request = rf.get("/")
+    request.session = {}
+    state_id = statekit.stash_state(request, {"foo": "bar"})
+
+    other_request = rf.get("/")
+    other_request.session = {}
+    assert statekit.unstash_state(other_request, state_id) is None
+    other_request.session = {"socialaccount_state_binding": "other"}
+    assert statekit.unstash_state(other_request, state_id) is None
+    assert statekit.unstash_last_state(other_request) is None
+
+    # The state is still available to the session that stashed it.
+    assert statekit.unstash_state(request, state_id) == {"foo": "bar"}
+
+
+def test_cache_backend_expiry(rf, cache_state_backend, monkeypatch):
+    monkeypatch.setattr(statekit.CacheStateBackend, "timeout", -1)
+    request = rf.get("/")
+    request.session = {}
+    state_id = statekit.stash_state(request, {"foo": "bar"})
+    assert statekit.unstash_state(request, state_id) is None
+
+
+def test_cache_backend_redirect(
+    rf, client, db, google_provider_settings, cache_state_backend
+):
+    resp = client.post(reverse("google_login"), {"next": "/foo"})
+    state_id = parse_qs(urlparse(resp["location"]).query)["state"][0]
+    assert statekit.STATES_SESSION_KEY not in client.session
+
+    request = rf.get("/")
+    request.session = client.session
+    state = statekit.unstash_state(request, state_id)
+    assert state["process"] == "login"
+    assert state["next"] == "/foo"
@@ -0,0 +1,124 @@
+import requests
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from allauth.socialaccount.internal import tokenkit
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from allauth.tests import MockedResponse, mocked_response
+
+
+@pytest.fixture
+def token_factory(db, user):
+    app = SocialApp.objects.create(
+        provider="github", name="GitHub", client_id="app123id", secret="dummy"
+    )
+    app.sites.add(Site.objects.get_current())
+
+    def f(uid="123", expires_in=-60, token_secret="refresh-token"):
+        account = SocialAccount.objects.create(user=user, provider="github", uid=uid)
+        return SocialToken.objects.create(
+            app=app,
+            account=account,
+            token="access-token",
+            token_secret=token_secret,
+            expires_at=timezone.now() + timedelta(seconds=expires_in),
+        )
+
+    return f
+
+
+def test_refresh_expiring_tokens(token_factory):
+    expired = token_factory(uid="1")
+    token_factory(uid="2", expires_in=3600)
+    token_factory(uid="3", token_secret="")
+    with mocked_response({"access_token": "new-access-token", "expires_in": 3600}):
+        result = tokenkit.refresh_expiring_tokens(max_workers=1)
+        data = requests.Session.request.call_args.kwargs["data"]
+    assert data["grant_type"] == "refresh_token"
+    assert data["refresh_token"] == "refresh-token"
+    assert result == tokenkit.RefreshResult(refreshed=1)
+    expired.refresh_from_db()
+    assert expired.token == "new-access-token"
+    # The refresh token was not rotated.
+    assert expired.token_secret == "refresh-token"
+    assert expired.expires_at > timezone.now() + timedelta(minutes=5)
+
+
+def test_refresh_rotates_refresh_token(token_factory):
+    token = token_factory()
+    with mocked_response(
+        {
+            "access_token": "new-access-token",
+            "refresh_token": "new-refresh-token",
+            "expires_in": 3600,
+        }
+    ):
+        assert tokenkit.refresh_expiring_token(token.pk, timedelta(minutes=5))
+    token.refresh_from_db()
+    assert token.token_secret == "new-refresh-token"
+
+
+def test_refresh_skips_refreshed_token(token_factory):
+    token = token_factory()
+    token.expires_at = timezone.now() + timedelta(hours=1)
+    token.save()
+    with mocked_response():
+        assert not tokenkit.refresh_expiring_token(token.pk, timedelta(minutes=5))
+        assert requests.Session.request.call_count == 0
+
+
+def test_refresh_failure(token_factory):
+    token = token_factory()
+    with mocked_response(MockedResponse(400, {"error": "invalid_grant"})):
+        result = tokenkit.refresh_expiring_tokens(max_workers=1)
+    assert result == tokenkit.RefreshResult(failed=1)
+    token.refresh_from_db()
+    assert token.token == "access-token"
+    # The claim is released, so that the token is retried.
+    assert token.refresh_claimed_until is None
+
+
+def test_refresh_skips_claimed_token(token_factory):
+    token = token_factory()
+    assert tokenkit.claim_token(token.pk, timedelta(minutes=5))
+    with mocked_response():
+        assert not tokenkit.refresh_expiring_token(token.pk, timedelta(minutes=5))
+        assert requests.Session.request.call_count == 0
+
+    # Claims of crashed workers expire.
+    SocialToken.objects.update(refresh_claimed_until=timezone.now())
+    with mocked_response({"access_token": "new-access-token", "expires_in": 3600}):
+        assert tokenkit.refresh_expiring_token(token.pk, timedelta(minutes=5))
+    token.refresh_from_db()
+    assert token.token == "new-access-token"
+    assert token.refresh_claimed_until is None
+
+
+def test_refresh_not_stored_when_claim_lost(token_factory):
+    token = token_factory()
+    refresh_token = tokenkit.refresh_token
+
+    def reclaim_then_refresh_token(token, request=None):
+        # The claim expired, and another worker claimed the token.
+        SocialToken.objects.update(refresh_claimed_until=timezone.now())
+        assert tokenkit.claim_token(token.pk, timedelta(minutes=5))
+        return refresh_token(token, request=request)
+
+    with patch.object(tokenkit, "refresh_token", reclaim_then_refresh_token):
+        with mocked_response({"access_token": "new-access-token", "expires_in": 3600}):
+            assert not tokenkit.refresh_expiring_token(token.pk, timedelta(minutes=5))
+    token.refresh_from_db()
+    assert token.token == "access-token"
+
+
+def test_refresh_tokens_command(token_factory, capsys):
+    token_factory()
+    with mocked_response({"access_token": "new-access-token", "expires_in": 3600}):
+        call_command("socialaccount_refreshtokens", "--workers=1")
+    assert "Refreshed: 1, skipped: 0, failed: 0" in capsys.readouterr().out
@@ -5,13 +5,29 @@ from django.test import TestCase
 from allauth.account.models import EmailAddress
 from allauth.socialaccount.models import SocialAccount
 from allauth.socialaccount.providers.github.provider import GitHubProvider
+from allauth.socialaccount.providers.github.views import GitHubOAuth2Adapter
 from allauth.socialaccount.tests import OAuth2TestsMixin
-from allauth.tests import MockedResponse
+from allauth.tests import MockedResponse, mocked_response
 
 
 class GitHubTests(OAuth2TestsMixin, TestCase):
     provider_id = GitHubProvider.id
 
+    def mocked_response(self, *responses):
+        """
+        The profile and the emails are fetched concurrently, so the emails
+        response (the last of access token, profile, emails) is served by URL
+        instead of by order.
+        """
+        responses = list(responses)
+        emails_response = responses.pop() if len(responses) == 3 else None
+
+        def callback(url, *args, **kwargs):
+            if url == GitHubOAuth2Adapter.emails_url:
+                return emails_response
+
+        return mocked_response(*responses, callback=callback)
+
     def get_mocked_response(self):
         return [
             MockedResponse(
@@ -0,0 +1,155 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.sites.models import Site
+from django.urls import include, path, resolve, reverse
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from allauth.socialaccount.providers.github.views import (
+    GitHubOAuth2Adapter,
+    oauth2_callback,
+)
+from allauth.socialaccount.providers.google.provider import GoogleProvider
+from allauth.socialaccount.providers.oauth2.urls import default_urlpatterns
+from allauth.socialaccount.providers.oauth2.views import (
+    AsyncOAuth2CallbackView,
+    get_async_callback_view,
+)
+
+
+urlpatterns = [
+    path(
+        "accounts/github/login/callback/",
+        get_async_callback_view(oauth2_callback),
+        name="github_callback",
+    ),
+    path("accounts/", include("allauth.urls")),
+]
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    routes = {
+        "/login/oauth/access_token": {"access_token": "async-token"},
+        "/api/v3/user": {"id": 201022, "login": "pennersr", "name": "Raymond"},
+        "/api/v3/user/emails": [
+            {"email": "raymond@example.com", "verified": True, "primary": True}
+        ],
+    }
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.respond()
+
+    def respond(self):
+        self.server.requests.append(self.path)
+        data = self.routes.get(urlparse(self.path).path)
+        if data is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps(data).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def github_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://127.0.0.1:{}".format(server.server_port)
+    monkeypatch.setattr(
+        GitHubOAuth2Adapter, "access_token_url", url + "/login/oauth/access_token"
+    )
+    monkeypatch.setattr(GitHubOAuth2Adapter, "profile_url", url + "/api/v3/user")
+    monkeypatch.setattr(GitHubOAuth2Adapter, "emails_url", url + "/api/v3/user/emails")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def github_app(db):
+    app = SocialApp.objects.create(
+        provider="github", name="GitHub", client_id="app123id", secret="dummy"
+    )
+    app.sites.add(Site.objects.get_current())
+    return app
+
+
+def login(client):
+    resp = client.post(reverse("github_login"))
+    state = parse_qs(urlparse(resp["location"]).query)["state"][0]
+    return client.get(reverse("github_callback"), {"code": "test", "state": state})
+
+
+def test_get_async_callback_view():
+    view = get_async_callback_view(oauth2_callback)
+    assert view.view_class is AsyncOAuth2CallbackView
+    assert view.adapter is GitHubOAuth2Adapter
+    # Custom callback views are left alone.
+    assert get_async_callback_view(view) is view
+
+
+def test_async_callback_signup(
+    client, settings, github_server, github_app, django_user_model
+):
+    settings.ROOT_URLCONF = "tests.apps.socialaccount.providers.oauth2.tests.test_async"
+    settings.SOCIALACCOUNT_STORE_TOKENS = True
+    assert iscoroutinefunction(resolve(reverse("github_callback")).func)
+    resp = login(client)
+    assert resp.status_code == 302
+    account = SocialAccount.objects.get(provider="github")
+    assert account.uid == "201022"
+    assert account.user.email == "raymond@example.com"
+    assert SocialToken.objects.get(account=account).token == "async-token"
+    assert sorted(github_server.requests) == [
+        "/api/v3/user",
+        "/api/v3/user/emails",
+        "/login/oauth/access_token",
+    ]
+
+
+def test_async_callback_login(client, settings, github_server, github_app, user):
+    settings.ROOT_URLCONF = "tests.apps.socialaccount.providers.oauth2.tests.test_async"
+    SocialAccount.objects.create(user=user, provider="github", uid="201022")
+    resp = login(client)
+    assert resp.status_code == 302
+    assert client.session["_auth_user_id"] == str(user.pk)
+    assert SocialAccount.objects.get(uid="201022").extra_data["login"] == "pennersr"
+
+
+def test_async_callback_error(client, settings, github_app):
+    settings.ROOT_URLCONF = "tests.apps.socialaccount.providers.oauth2.tests.test_async"
+    resp = client.post(reverse("github_login"))
+    state = parse_qs(urlparse(resp["location"]).query)["state"][0]
+    resp = client.get(
+        reverse("github_callback"), {"error": "access_denied", "state": state}
+    )
+    assert resp["location"] == reverse("socialaccount_login_cancelled")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_async_callbacks_setting(settings, lazy):
+    def get_callback_view():
+        (pattern,) = default_urlpatterns(GoogleProvider, lazy=lazy)
+        return pattern.url_patterns[1].callback
+
+    assert not iscoroutinefunction(get_callback_view())
+    settings.SOCIALACCOUNT_ASYNC_CALLBACKS = True
+    assert iscoroutinefunction(get_callback_view())
@@ -1,9 +1,13 @@
+import threading
+
 from django.urls import reverse
 
 import pytest
 from pytest_django.asserts import assertTemplateUsed
 
+from allauth.core import context
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.providers.oauth2.views import OAuth2Adapter
 
 
 @pytest.mark.parametrize(
@@ -66,3 +70,28 @@ def test_config_from_provider_config(
     assert provider.get_scope() == ["some-scope"]
     assert provider.get_auth_params() == {"auth": "param"}
     assert ("code_verifier" in provider.get_pkce_params().keys()) == pkce_enabled
+
+
+def test_fetch_concurrently(rf):
+    request = rf.get("/")
+    adapter = OAuth2Adapter(request)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(value):
+        # Both calls need to be in flight at the same time to pass the barrier.
+        barrier.wait()
+        return value, context.request
+
+    with context.request_context(request):
+        assert adapter.fetch_concurrently(lambda: fetch(1), lambda: fetch(2)) == [
+            (1, request),
+            (2, request),
+        ]
+
+
+def test_fetch_concurrently_raises(rf):
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        OAuth2Adapter(rf.get("/")).fetch_concurrently(lambda: 1, fail)
@@ -1,16 +1,23 @@
+import time
 import urllib.error
+from io import StringIO
 from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 
 import pytest
 from openid import fetchers
+from openid.association import Association
 from openid.consumer import consumer
+from openid.store.nonce import SKEW
 
 from allauth.socialaccount.models import SocialAccount
-from allauth.socialaccount.providers.openid import views
+from allauth.socialaccount.providers.openid import utils, views
+from allauth.socialaccount.providers.openid.models import OpenIDNonce, OpenIDStore
+from allauth.socialaccount.providers.openid.provider import OpenIDProvider
 from allauth.socialaccount.providers.openid.utils import AXAttribute
 
 
@@ -157,3 +164,65 @@ def test_login_with_extra_attributes(client, db):
                 assert resp["location"] == "/accounts/profile/"
                 socialaccount = SocialAccount.objects.get(user__first_name="raymond")
                 assert socialaccount.extra_data.get("phone") == "123456789"
+
+
+@pytest.fixture(params=["db", "cache"])
+def store(request, db, enable_cache):
+    if request.param == "db":
+        return utils.DBOpenIDStore()
+    return utils.CacheOpenIDStore()
+
+
+def test_store_associations(store):
+    now = int(time.time())
+    old = Association("old", b"secret", now - 10, 3600, "HMAC-SHA1")
+    new = Association("new", b"secret", now, 3600, "HMAC-SHA1")
+    store.storeAssociation("https://server.org", old)
+    store.storeAssociation("https://server.org", new)
+    assert store.getAssociation("https://server.org", "old").handle == "old"
+    assert store.getAssociation("https://server.org").handle in {"old", "new"}
+    store.removeAssociation("https://server.org", "new")
+    assert store.getAssociation("https://server.org", "new") is None
+    assert store.getAssociation("https://other.org") is None
+
+
+def test_store_nonces(store):
+    now = int(time.time())
+    assert store.useNonce("https://server.org", now, "salt")
+    assert not store.useNonce("https://server.org", now, "salt")
+    assert store.useNonce("https://server.org", now, "pepper")
+
+
+def test_cache_store_rejects_old_nonces(enable_cache):
+    store = utils.CacheOpenIDStore()
+    assert not store.useNonce("https://server.org", int(time.time()) - SKEW - 1, "s")
+
+
+def test_get_store(settings):
+    assert isinstance(utils.get_store(OpenIDProvider(None)), utils.DBOpenIDStore)
+    settings.SOCIALACCOUNT_PROVIDERS = {
+        "openid": {
+            "STORE": "allauth.socialaccount.providers.openid.utils.CacheOpenIDStore"
+        }
+    }
+    assert isinstance(utils.get_store(OpenIDProvider(None)), utils.CacheOpenIDStore)
+
+
+def test_purge_store(db):
+    now = int(time.time())
+    OpenIDNonce.objects.create(server_url="s", timestamp=now - SKEW - 1, salt="old")
+    OpenIDNonce.objects.create(server_url="s", timestamp=now, salt="new")
+    for handle, issued in [("old", now - 7200), ("new", now)]:
+        OpenIDStore.objects.create(
+            server_url="s",
+            handle=handle,
+            secret="",
+            issued=issued,
+            lifetime=3600,
+            assoc_type="HMAC-SHA1",
+        )
+    out = StringIO()
+    call_command("openid_purgestore", "--batch-size=1", stdout=out)
+    assert out.getvalue().strip() == "Purged nonces: 1, associations: 1"
+    assert list(OpenIDNonce.objects.values_list("salt", flat=True)) == ["new"]
+    assert list(OpenIDStore.objects.values_list("handle", flat=True)) == ["new"]
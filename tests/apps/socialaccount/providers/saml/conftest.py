@@ -5,6 +5,15 @@ from django.test.client import Client
 
 import pytest
 
+from allauth.socialaccount.providers.saml.utils import clear_settings_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_saml_settings():
+    clear_settings_cache()
+    yield
+    clear_settings_cache()
+
 
 @pytest.fixture
 def client():
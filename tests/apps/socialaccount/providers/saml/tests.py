@@ -1,7 +1,11 @@
+import time
+from io import StringIO
 from unittest.mock import Mock, patch
 from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse, reverse_lazy
 from django.utils.http import urlencode
 
@@ -13,7 +17,11 @@ from allauth.socialaccount.adapter import get_adapter
 from allauth.socialaccount.internal import statekit
 from allauth.socialaccount.models import SocialAccount
 from allauth.socialaccount.providers.base.constants import AuthProcess
-from allauth.socialaccount.providers.saml.utils import build_saml_config
+from allauth.socialaccount.providers.saml import utils
+from allauth.socialaccount.providers.saml.utils import (
+    build_saml_config,
+    get_saml_settings,
+)
 
 
 @pytest.mark.parametrize(
@@ -269,3 +277,169 @@ def test_extract_attributes(db, data, result, uid, settings):
     )
     assert provider._extract(onelogin_data) == result
     assert provider.extract_uid(onelogin_data) == uid
+
+
+def test_get_saml_settings_is_cached(rf, settings):
+    settings.ALLOWED_HOSTS = ["example.com", "other.org"]
+    request = rf.get("/", HTTP_HOST="example.com")
+    provider_config = {
+        "idp": {
+            "entity_id": "dummy",
+            "sso_url": "https://idp.org/sso/",
+            "x509cert": "",
+        }
+    }
+    with patch.object(
+        utils, "build_saml_config", wraps=utils.build_saml_config
+    ) as build_mock:
+        saml_settings = get_saml_settings(request, provider_config, "org")
+        assert get_saml_settings(request, provider_config, "org") is saml_settings
+        assert build_mock.call_count == 1
+
+        # Other hosts have other SP URLs.
+        other_request = rf.get("/", HTTP_HOST="other.org")
+        other_saml_settings = get_saml_settings(other_request, provider_config, "org")
+        assert other_saml_settings is not saml_settings
+        assert other_saml_settings.get_sp_data()["entityId"].startswith(
+            "http://other.org/"
+        )
+
+        # Changing the app settings invalidates the cached settings.
+        provider_config["idp"]["sso_url"] = "https://idp.org/sso/v2/"
+        saml_settings = get_saml_settings(request, provider_config, "org")
+        assert saml_settings.get_idp_data()["singleSignOnService"]["url"] == (
+            "https://idp.org/sso/v2/"
+        )
+        assert build_mock.call_count == 3
+
+
+def test_get_saml_settings_follows_metadata(
+    rf, enable_cache, metadata_idp_config, monkeypatch
+):
+    monkeypatch.setattr(
+        utils,
+        "_refresh_metadata_in_background",
+        lambda idp_config, entry: utils._refresh_metadata(idp_config, entry),
+    )
+    request = rf.get("/", HTTP_HOST="example.com")
+    provider_config = {"idp": metadata_idp_config}
+    with patch(
+        "onelogin.saml2.idp_metadata_parser.OneLogin_Saml2_IdPMetadataParser.parse_remote"
+    ) as parse_mock:
+        parse_mock.side_effect = [
+            parsed_metadata("https://idp.org/sso/v1/"),
+            parsed_metadata("https://idp.org/sso/v2/"),
+            Exception("IdP down"),
+        ]
+        saml_settings = get_saml_settings(request, provider_config, "org")
+        assert get_saml_settings(request, provider_config, "org") is saml_settings
+
+        # Refreshed metadata is picked up right away.
+        utils.refresh_metadata_url_config(metadata_idp_config)
+        saml_settings = get_saml_settings(request, provider_config, "org")
+        assert saml_settings.get_idp_data()["singleSignOnService"]["url"] == (
+            "https://idp.org/sso/v2/"
+        )
+
+        # Stale metadata is refreshed, which fails, leaving the settings as is.
+        with patch("time.time", return_value=time.time() + 60):
+            assert get_saml_settings(request, provider_config, "org") is saml_settings
+        assert parse_mock.call_count == 3
+
+
+def test_fetch_metadata_wait_is_bounded(enable_cache, metadata_idp_config):
+    # Another process holds the lock, but does not store the metadata.
+    cache.add(utils._get_metadata_cache_key(metadata_idp_config) + ":lock", True)
+    with patch(
+        "onelogin.saml2.idp_metadata_parser.OneLogin_Saml2_IdPMetadataParser.parse_remote"
+    ) as parse_mock, patch("time.sleep") as sleep_mock, patch(
+        "time.monotonic", side_effect=[0, 5, 20]
+    ):
+        parse_mock.return_value = parsed_metadata("https://idp.org/sso/")
+        config = utils.fetch_metadata_url_config(metadata_idp_config)
+    assert sleep_mock.call_count == 1
+    assert config["idp"]["singleSignOnService"]["url"] == "https://idp.org/sso/"
+
+
+@pytest.fixture
+def metadata_idp_config():
+    return {
+        "entity_id": "dummy",
+        "metadata_url": "https://idp.org/metadata/",
+        "metadata_cache_timeout": 60,
+    }
+
+
+def parsed_metadata(sso_url):
+    return {
+        "idp": {
+            "entityId": "dummy",
+            "singleSignOnService": {"url": sso_url},
+            "x509cert": "",
+        }
+    }
+
+
+def test_fetch_metadata_stale_if_error(enable_cache, metadata_idp_config, monkeypatch):
+    threads = []
+    refresh_in_background = utils._refresh_metadata_in_background
+    monkeypatch.setattr(
+        utils,
+        "_refresh_metadata_in_background",
+        lambda *args: threads.append(refresh_in_background(*args)),
+    )
+    with patch(
+        "onelogin.saml2.idp_metadata_parser.OneLogin_Saml2_IdPMetadataParser.parse_remote"
+    ) as parse_mock:
+        parse_mock.side_effect = [
+            parsed_metadata("https://idp.org/sso/v1/"),
+            Exception("IdP down"),
+            parsed_metadata("https://idp.org/sso/v2/"),
+        ]
+        config = utils.fetch_metadata_url_config(metadata_idp_config)
+        assert config["idp"]["singleSignOnService"]["url"] == "https://idp.org/sso/v1/"
+        assert not threads
+
+        # Stale: served while refreshing in the background, which fails.
+        with patch("time.time", return_value=time.time() + 60):
+            config = utils.fetch_metadata_url_config(metadata_idp_config)
+            assert config["idp"]["singleSignOnService"]["url"] == (
+                "https://idp.org/sso/v1/"
+            )
+            threads.pop().join()
+            # The failed refresh is not retried right away.
+            config = utils.fetch_metadata_url_config(metadata_idp_config)
+            assert config["idp"]["singleSignOnService"]["url"] == (
+                "https://idp.org/sso/v1/"
+            )
+            assert not threads
+
+        with patch("time.time", return_value=time.time() + 120):
+            utils.fetch_metadata_url_config(metadata_idp_config)
+            threads.pop().join()
+        config = utils.fetch_metadata_url_config(metadata_idp_config)
+        assert config["idp"]["singleSignOnService"]["url"] == "https://idp.org/sso/v2/"
+        assert parse_mock.call_count == 3
+
+
+def test_refresh_metadata_command(enable_cache, db, settings, metadata_idp_config):
+    settings.SOCIALACCOUNT_PROVIDERS = {
+        "saml": {
+            "APPS": [
+                {"client_id": "org", "settings": {"idp": metadata_idp_config}},
+                {"client_id": "other", "settings": {"idp": metadata_idp_config}},
+            ]
+        }
+    }
+    with patch(
+        "onelogin.saml2.idp_metadata_parser.OneLogin_Saml2_IdPMetadataParser.parse_remote"
+    ) as parse_mock:
+        parse_mock.return_value = parsed_metadata("https://idp.org/sso/")
+        out = StringIO()
+        call_command("saml_refreshmetadata", stdout=out)
+        assert out.getvalue().strip() == "Refreshed: 1, failed: 0"
+        # Fresh metadata is left alone, unless it is about to turn stale.
+        call_command("saml_refreshmetadata", "--ahead=30", stdout=out)
+        assert parse_mock.call_count == 1
+        call_command("saml_refreshmetadata", "--ahead=60", stdout=out)
+        assert parse_mock.call_count == 2
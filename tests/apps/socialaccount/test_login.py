@@ -6,12 +6,13 @@ from django.contrib.auth.models import AnonymousUser
 from django.urls import reverse
 
 import pytest
+from asgiref.sync import sync_to_async
 from pytest_django.asserts import assertTemplateUsed
 
 from allauth.account.authentication import AUTHENTICATION_METHODS_SESSION_KEY
 from allauth.core import context
 from allauth.socialaccount.helpers import complete_social_login
-from allauth.socialaccount.models import SocialAccount, SocialToken
+from allauth.socialaccount.models import SocialAccount, SocialLogin, SocialToken
 from allauth.socialaccount.providers.base import AuthProcess
 
 
@@ -149,3 +150,78 @@ def test_record_authentication(
         ).exists()
         == store_tokens
     )
+
+
+@pytest.mark.parametrize("store_tokens", [False, True])
+def test_lookup_existing_account(
+    db, settings, sociallogin_factory, user, django_assert_num_queries, store_tokens
+):
+    settings.SOCIALACCOUNT_STORE_TOKENS = store_tokens
+    account = SocialAccount.objects.create(
+        user=user, provider="unittest-server", uid="123", extra_data={"id": 123}
+    )
+    SocialToken.objects.create(account=account, token="old", token_secret="secret")
+    sociallogin = sociallogin_factory(with_token=True)
+    sociallogin.account.extra_data = {"id": 123}
+    sociallogin.token.token_secret = ""
+
+    # Select account, user and token, touch last_login, update the token.
+    with django_assert_num_queries(3 if store_tokens else 2):
+        sociallogin.lookup()
+    assert sociallogin.user == user
+    assert sociallogin.account.pk == account.pk
+    token = SocialToken.objects.get()
+    assert token.token == ("123" if store_tokens else "old")
+    assert token.token_secret == "secret"
+    if store_tokens:
+        assert sociallogin.token.pk == token.pk
+
+    # Changed extra data is saved.
+    sociallogin = sociallogin_factory(with_token=True)
+    sociallogin.account.extra_data = {"id": 123, "name": "John"}
+    sociallogin.lookup()
+    account.refresh_from_db()
+    assert account.extra_data == {"id": 123, "name": "John"}
+    assert SocialToken.objects.get().token_secret == (
+        "456" if store_tokens else "secret"
+    )
+
+
+def test_lookup_token_deleted_concurrently(
+    db, settings, sociallogin_factory, user, monkeypatch
+):
+    settings.SOCIALACCOUNT_STORE_TOKENS = True
+    account = SocialAccount.objects.create(
+        user=user, provider="unittest-server", uid="123", extra_data={"id": 123}
+    )
+    SocialToken.objects.create(account=account, token="old", token_secret="secret")
+    store_token = SocialLogin._store_token
+
+    def delete_then_store_token(self, **kwargs):
+        # The token is deleted after it was looked up.
+        SocialToken.objects.all().delete()
+        store_token(self, **kwargs)
+
+    monkeypatch.setattr(SocialLogin, "_store_token", delete_then_store_token)
+    sociallogin = sociallogin_factory(with_token=True)
+    sociallogin.lookup()
+    token = SocialToken.objects.get()
+    assert token.pk == sociallogin.token.pk
+    assert token.token == "123"
+    assert token.account == account
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_alookup_existing_account(settings, sociallogin_factory):
+    settings.SOCIALACCOUNT_STORE_TOKENS = True
+    user = await get_user_model().objects.acreate(username="john")
+    account = await SocialAccount.objects.acreate(
+        user=user, provider="unittest-server", uid="123", extra_data={"id": 123}
+    )
+    sociallogin = await sync_to_async(sociallogin_factory)(with_token=True)
+    await sociallogin.alookup()
+    assert sociallogin.user == user
+    assert sociallogin.account.pk == account.pk
+    token = await SocialToken.objects.aget()
+    assert token.pk == sociallogin.token.pk
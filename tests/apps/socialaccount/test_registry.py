@@ -3,6 +3,8 @@ from django.test import TestCase
 from django.test.utils import override_settings
 
 from allauth.socialaccount import providers
+from allauth.socialaccount.providers import manifest
+from allauth.urls import build_provider_urlpatterns
 
 
 class CustomFacebookAppConfig(AppConfig):
@@ -58,3 +60,27 @@ class ProviderRegistryTests(TestCase):
         app_config = app_config_list[0]
         self.assertEqual("allauth.socialaccount.providers.facebook", app_config.name)
         self.assertEqual("allauth_facebook", app_config.label)
+
+
+def test_manifest_is_up_to_date():
+    assert manifest.PROVIDERS == manifest.build_manifest()
+
+
+@override_settings(
+    INSTALLED_APPS=[
+        "allauth.socialaccount.providers.github",
+        "allauth.socialaccount.providers.google",
+    ],
+    SOCIALACCOUNT_LAZY_PROVIDERS=True,
+)
+def test_lazy_registry(monkeypatch):
+    registry = providers.ProviderRegistry()
+    monkeypatch.setattr(providers, "registry", registry)
+    assert list(registry.as_choices()) == [("github", "GitHub"), ("google", "Google")]
+    urlpatterns = build_provider_urlpatterns()
+    assert not registry.is_imported("github")
+    assert [p.pattern.describe() for p in urlpatterns[:1]] == ["'github/'"]
+
+    provider_class = registry.get_class("github")
+    assert provider_class is providers.github.provider.GitHubProvider
+    assert registry.is_imported("github")
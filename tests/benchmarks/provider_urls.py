@@ -0,0 +1,67 @@
+"""
+Measures the time it takes to set up the allauth URLs (``allauth.urls``, which
+includes ``allauth.socialaccount.urls`` as well as all provider URLs), with N
+providers installed, with and without ``SOCIALACCOUNT_LAZY_PROVIDERS``. Only
+providers using the default OAuth/OAuth2 URL patterns are installed, as the
+other providers are imported in either case.
+
+Each measurement is done in a fresh interpreter, as it is the import cost that
+is measured::
+
+    python -m tests.benchmarks.provider_urls 10 50 120
+"""
+
+import subprocess  # nosec
+import sys
+
+
+SCRIPT = """
+import time
+
+import django
+from django.conf import settings
+
+from allauth.socialaccount.providers.manifest import PROVIDERS
+from tests.projects.regular import settings as regular_settings
+
+installed_apps = [
+    app
+    for app in regular_settings.INSTALLED_APPS
+    if not app.startswith("allauth.socialaccount.providers.")
+] + [
+    package for package, specs in PROVIDERS.items() if all(s["urls"] for s in specs)
+][:{count}]
+settings.configure(
+    **{{
+        **{{k: v for k, v in vars(regular_settings).items() if k.isupper()}},
+        "INSTALLED_APPS": installed_apps,
+        "SOCIALACCOUNT_LAZY_PROVIDERS": {lazy},
+    }}
+)
+start = time.perf_counter()
+django.setup()
+import allauth.urls  # noqa
+print(time.perf_counter() - start)
+"""
+
+
+def measure(count: int, lazy: bool, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output(  # nosec
+            [sys.executable, "-c", SCRIPT.format(count=count, lazy=lazy)]
+        )
+        timings.append(float(output))
+    return min(timings)
+
+
+def main(counts) -> None:
+    print("providers      eager       lazy")
+    for count in counts:
+        eager = measure(count, lazy=False)
+        lazy = measure(count, lazy=True)
+        print(f"{count:>9} {eager * 1000:>8.1f}ms {lazy * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 120])
@@ -0,0 +1,66 @@
+"""
+Measures the time it takes to access frequently used app settings, with and
+without the settings snapshot (``ALLAUTH_CACHE_SETTINGS``). Settings holding
+mutable values (e.g. ``SIGNUP_FIELDS``) are not served from the snapshot, and
+are measured separately::
+
+    python -m tests.benchmarks.settings_access 100000
+"""
+
+import sys
+import timeit
+
+import django
+from django.conf import settings
+from django.test import override_settings
+
+
+ACCOUNT_SETTINGS = [
+    "LOGIN_METHODS",
+    "EMAIL_VERIFICATION",
+    "PREVENT_ENUMERATION",
+    "LOGIN_BY_CODE_ENABLED",
+    "SIGNUP_FORM_CLASS",
+]
+
+MUTABLE_ACCOUNT_SETTINGS = [
+    "SIGNUP_FIELDS",
+    "RATE_LIMITS",
+]
+
+
+def setup() -> None:
+    from tests.projects.regular import settings as regular_settings
+
+    settings.configure(
+        **{k: v for k, v in vars(regular_settings).items() if k.isupper()}
+    )
+    django.setup()
+
+
+def measure(names, number: int) -> float:
+    from allauth.account import app_settings
+
+    def access():
+        for name in names:
+            getattr(app_settings, name)
+
+    return min(timeit.repeat(access, number=number, repeat=5)) / (number * len(names))
+
+
+def main(number: int) -> None:
+    setup()
+    print("settings         snapshot   uncached")
+    for label, names in [
+        ("immutable", ACCOUNT_SETTINGS),
+        ("mutable", MUTABLE_ACCOUNT_SETTINGS),
+    ]:
+        with override_settings(ALLAUTH_CACHE_SETTINGS=True):
+            cached = measure(names, number)
+        with override_settings(ALLAUTH_CACHE_SETTINGS=False):
+            uncached = measure(names, number)
+        print(f"{label:<12} {cached * 1e6:>8.2f}us {uncached * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
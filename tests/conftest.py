@@ -13,6 +13,7 @@ from unittest.mock import Mock, PropertyMock, patch
 from django.contrib.auth import get_user_model
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.signals import setting_changed
 from django.urls import clear_url_caches, set_urlconf
 
 import pytest
@@ -430,11 +431,39 @@ def settings_impacting_urls(settings):
                 setattr(settings, k, old_values[k])
             else:
                 delattr(settings, k)
+                # Deleting a setting does not emit `setting_changed`.
+                setting_changed.send(
+                    sender=settings.__class__, setting=k, value=None, enter=False
+                )
         reload_urlconf()
 
     return f
 
 
+@pytest.fixture(autouse=True)
+def clear_jwt_keys():
+    from allauth.socialaccount.internal import jwtkit
+
+    jwtkit.clear_keys()
+
+
+@pytest.fixture(autouse=True)
+def clear_app_registries():
+    from allauth import app_settings
+
+    if app_settings.SOCIALACCOUNT_ENABLED:
+        from allauth.socialaccount.internal import appkit
+
+        appkit.clear_registries()
+
+
+@pytest.fixture(autouse=True)
+def clear_openid_configurations():
+    from allauth.socialaccount.internal import discoverykit
+
+    discoverykit.clear_documents()
+
+
 @pytest.fixture(autouse=True)
 def clear_phone_stub():
     from tests.projects.common import phone_stub